@@ -0,0 +1,92 @@
+# benchmarks/_common.py
+"""
+Shared helpers for the benchmark scripts: percentile reporting, RSS, and stored baselines.
+
+Baselines live in benchmarks/baselines/<name>.json. Run a script with --save-baseline to
+record the current numbers; later runs compare against them and exit non-zero when a
+metric regresses by more than the tolerance (DWORSHAK_BENCH_TOLERANCE, default 0.5 = +50%).
+Small absolute differences (below DWORSHAK_BENCH_FLOOR_MS, default 2 ms) never count as regressions.
+"""
+import json
+import os
+import platform
+import statistics
+import sys
+from pathlib import Path
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+TOLERANCE = float(os.environ.get("DWORSHAK_BENCH_TOLERANCE", "0.5"))
+FLOOR_MS = float(os.environ.get("DWORSHAK_BENCH_FLOOR_MS", "2"))
+
+
+def summarize(ms: list) -> dict:
+    ms = sorted(ms)
+    return {
+        "p50_ms": round(statistics.median(ms), 3),
+        "p99_ms": round(ms[min(len(ms) - 1, int(len(ms) * 0.99))], 3),
+        "n": len(ms),
+    }
+
+
+def report(label: str, ms: list) -> dict:
+    stats = summarize(ms)
+    print(f"{label:<34} p50 {stats['p50_ms']:9.3f} ms   p99 {stats['p99_ms']:9.3f} ms   (n={stats['n']})")
+    return stats
+
+
+def rss_mb() -> dict:
+    """Current and peak resident set size of this process, in MiB (where the platform reports it)."""
+    current = peak = None
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    current = int(line.split()[1]) / 1024
+                elif line.startswith("VmHWM:"):
+                    peak = int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if peak is None:
+        try:
+            import resource
+            maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            # Linux reports KiB, macOS bytes
+            peak = maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+        except (ImportError, OSError):
+            pass
+    return {"rss_mb": round(current, 1) if current else None, "peak_rss_mb": round(peak, 1) if peak else None}
+
+
+def finish(name: str, results: dict, argv: list) -> None:
+    """Saves (--save-baseline) or compares against the stored baseline; exits 1 on regression."""
+    path = BASELINE_DIR / f"{name}.json"
+    if "--save-baseline" in argv:
+        BASELINE_DIR.mkdir(parents=True, exist_ok=True)
+        payload = {"python": platform.python_version(), "platform": platform.platform(), "results": results}
+        path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline saved to {path}")
+        return
+
+    if not path.exists():
+        print(f"No baseline at {path}; run with --save-baseline to record one.")
+        return
+
+    baseline = json.loads(path.read_text(encoding="utf-8"))["results"]
+    regressions = []
+    for label, stats in results.items():
+        old = baseline.get(label)
+        if not isinstance(stats, dict) or not isinstance(old, dict):
+            continue
+        for metric in ("p50_ms", "p99_ms"):
+            new_v, old_v = stats.get(metric), old.get(metric)
+            if new_v is None or old_v is None:
+                continue
+            if new_v > old_v * (1 + TOLERANCE) and new_v - old_v > FLOOR_MS:
+                regressions.append(f"{label} {metric}: {old_v:.3f} -> {new_v:.3f} ms")
+
+    if regressions:
+        print("REGRESSION vs baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"OK: within {TOLERANCE:.0%} of baseline ({path.name})")
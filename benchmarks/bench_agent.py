@@ -0,0 +1,76 @@
+# benchmarks/bench_agent.py
+"""
+Per-lookup latency of `dworshak-prompt obtain config svc item` as a shell loop sees it,
+with and without a running value agent, plus the raw agent round trip from Python.
+
+Uses a throwaway HOME (config file) and runtime directory (agent socket).
+
+    python benchmarks/bench_agent.py [runs] [--save-baseline]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from _common import finish, report
+
+
+def cli_samples(runs: int, env: dict) -> list:
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        out = subprocess.run(
+            [sys.executable, "-m", "dworshak_prompt", "obtain", "config", "svc", "port"],
+            env=env, capture_output=True, text=True, stdin=subprocess.DEVNULL,
+        )
+        samples.append((time.perf_counter() - t0) * 1000)
+        assert out.stdout.strip() == "43080", (out.stdout, out.stderr)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Value agent lookup latency")
+    parser.add_argument("runs", nargs="?", type=int, default=20)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home, tempfile.TemporaryDirectory() as runtime:
+        os.chmod(runtime, 0o700)
+        os.makedirs(os.path.join(home, ".dworshak"))
+        with open(os.path.join(home, ".dworshak", "config.json"), "w") as f:
+            json.dump({"svc": {"port": "43080"}}, f)
+        os.environ.update(HOME=home, DWORSHAK_PROMPT_RUNTIME_DIR=runtime)
+        os.environ.pop("DWORSHAK_PROMPT_AGENT_SOCK", None)
+
+        from dworshak_prompt.agent import ValueAgent, agent_get
+        agent = ValueAgent()
+        agent.start()
+        threading.Thread(target=agent.serve_forever, daemon=True).start()
+        try:
+            with_agent = cli_samples(args.runs, dict(os.environ))
+            without_agent = cli_samples(args.runs, dict(os.environ, DWORSHAK_PROMPT_NO_AGENT="1"))
+
+            config_path = os.path.join(home, ".dworshak", "config.json")
+            agent_get("config", service="svc", item="port", path=config_path)
+            round_trips = []
+            for _ in range(args.runs * 50):
+                t0 = time.perf_counter()
+                agent_get("config", service="svc", item="port", path=config_path)
+                round_trips.append((time.perf_counter() - t0) * 1000)
+        finally:
+            agent.stop()
+
+    results = {
+        "cli with agent": report("CLI obtain config, agent", with_agent),
+        "cli without agent": report("CLI obtain config, no agent", without_agent),
+        "agent round trip": report("agent_get() round trip", round_trips),
+    }
+    finish("agent", results, sys.argv)
+
+
+if __name__ == "__main__":
+    main()
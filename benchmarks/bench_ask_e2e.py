@@ -0,0 +1,194 @@
+# benchmarks/bench_ask_e2e.py
+"""
+End-to-end DworshakPrompt.ask() latency per mode, with scripted input:
+
+  console  a child interpreter on a pseudo-terminal; the parent types each answer
+           as soon as the prompt text appears (POSIX only)
+  web      in-process: the browser launch is replaced by an HTTP client that reads
+           the active prompt, fetches /config_modal and posts the answer to /api/submit
+  gui      only when a display is available; the dialog's OK button is invoked
+           as soon as the window is shown. The first ask (Tk root creation on the GUI
+           thread) is printed separately; the stats cover the repeated prompts.
+
+Each sample is the full ask() call as timed by the caller.
+
+    python benchmarks/bench_ask_e2e.py [runs] [--modes console,web,gui] [--save-baseline]
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import urllib.request
+
+from _common import finish, report
+
+from dworshak_prompt import capabilities
+from dworshak_prompt.capabilities import Capabilities
+from dworshak_prompt.multiplexer import DworshakPrompt, PromptMode
+
+# Runs inside the pty child. Capabilities are pinned so the numbers measure the
+# backend, not pyhabitat's view of the harness.
+CONSOLE_CHILD = r"""
+import json, sys, time
+from dworshak_prompt import capabilities
+from dworshak_prompt.capabilities import Capabilities
+capabilities._snapshot = Capabilities(interactive_terminal=True)
+from dworshak_prompt.multiplexer import DworshakPrompt, PromptMode
+
+runs, out_path = int(sys.argv[1]), sys.argv[2]
+prompt = DworshakPrompt()
+samples = []
+for i in range(runs):
+    t0 = time.perf_counter()
+    value = prompt.ask(f"bench-prompt-{i}", priority=[PromptMode.CONSOLE])
+    samples.append((time.perf_counter() - t0) * 1000)
+    assert value == f"answer-{i}", value
+with open(out_path, "w") as f:
+    json.dump(samples, f)
+"""
+
+
+def bench_console(runs: int) -> list | None:
+    try:
+        import pty  # noqa: F401  (POSIX only)
+    except ImportError:
+        print("console: skipped (no pty on this platform)")
+        return None
+
+    master, slave = os.openpty()
+    with tempfile.TemporaryDirectory() as tmp:
+        out_path = os.path.join(tmp, "samples.json")
+        child = subprocess.Popen(
+            [sys.executable, "-c", CONSOLE_CHILD, str(runs), out_path],
+            stdin=slave, stdout=slave, stderr=slave, close_fds=True,
+        )
+        os.close(slave)
+        buffer = b""
+        try:
+            for i in range(runs):
+                marker = f"bench-prompt-{i}".encode()
+                while marker not in buffer:
+                    chunk = os.read(master, 4096)
+                    if not chunk:
+                        raise RuntimeError("console child exited early:\n" + buffer.decode(errors="replace"))
+                    buffer += chunk
+                buffer = buffer.split(marker, 1)[1]
+                os.write(master, f"answer-{i}\n".encode())
+            # Keep draining so the child never blocks on a full pty buffer
+            while child.poll() is None:
+                try:
+                    os.read(master, 4096)
+                except OSError:
+                    break
+            child.wait(timeout=30)
+        finally:
+            os.close(master)
+            if child.poll() is None:
+                child.kill()
+        if child.returncode != 0:
+            print(f"console: child failed with exit code {child.returncode}")
+            return None
+        with open(out_path) as f:
+            return json.load(f)
+
+
+def _scripted_browser(url: str):
+    """Stands in for launch_browser(): answers the active prompt over HTTP."""
+    base = url.rsplit("/", 1)[0]
+
+    def client():
+        with urllib.request.urlopen(f"{base}/api/get_active_prompt") as r:
+            prompt = json.loads(r.read())
+        query = urllib.parse.urlencode({"request_id": prompt["request_id"]})
+        with urllib.request.urlopen(f"{base}/config_modal?{query}") as r:
+            r.read()
+        body = json.dumps({"request_id": prompt["request_id"], "value": "answer"}).encode()
+        submit = urllib.request.Request(f"{base}/api/submit", data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(submit) as r:
+            assert json.loads(r.read())["ok"]
+
+    threading.Thread(target=client, daemon=True).start()
+
+
+def bench_web(runs: int) -> list:
+    from dworshak_prompt import web_prompt
+    web_prompt.launch_browser = _scripted_browser
+    prompt = DworshakPrompt()
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        value = prompt.ask("bench-web", priority=[PromptMode.WEB], timeout=10)
+        samples.append((time.perf_counter() - t0) * 1000)
+        assert value == "answer", value
+    return samples
+
+
+def bench_gui(runs: int) -> list | None:
+    if not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY") or sys.platform in ("win32", "darwin")):
+        print("gui: skipped (no display)")
+        return None
+    try:
+        import tkinter as tk
+    except ImportError:
+        print("gui: skipped (tkinter not installed)")
+        return None
+
+    original_grab_set = tk.Misc.grab_set
+
+    def grab_set_and_click_ok(self):
+        # Both dialogs grab right after building their window: press OK from the event loop
+        def press_ok(widget):
+            for child in widget.winfo_children():
+                if isinstance(child, tk.Button) and child.cget("text") == "OK":
+                    child.invoke()
+                    return True
+                if press_ok(child):
+                    return True
+            return False
+        self.after(0, lambda: press_ok(self))
+        return original_grab_set(self)
+
+    tk.Misc.grab_set = grab_set_and_click_ok
+    try:
+        prompt = DworshakPrompt()
+        samples = []
+        for _ in range(runs):
+            t0 = time.perf_counter()
+            value = prompt.ask("bench-gui", suggestion="answer", priority=[PromptMode.GUI])
+            samples.append((time.perf_counter() - t0) * 1000)
+            assert value == "answer", value
+        # The first ask creates the GUI thread's Tk root; later ones reuse it
+        print(f"gui: first ask {samples[0]:.1f} ms")
+        return samples[1:] or samples
+    finally:
+        tk.Misc.grab_set = original_grab_set
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end ask() latency per mode")
+    parser.add_argument("runs", nargs="?", type=int, default=30)
+    parser.add_argument("--modes", default="console,web,gui")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+    runs, modes = args.runs, args.modes.split(",")
+
+    # Pin capabilities for the in-process modes (see CONSOLE_CHILD)
+    capabilities._snapshot = Capabilities(interactive_terminal=True, tkinter=True, browser=True)
+
+    benches = {"console": bench_console, "web": bench_web, "gui": bench_gui}
+    results = {}
+    for mode in modes:
+        samples = benches[mode](runs)
+        if samples:
+            results[f"ask {mode}"] = report(f"ask() {mode}", samples)
+    finish("ask_e2e", results, sys.argv)
+
+
+if __name__ == "__main__":
+    main()
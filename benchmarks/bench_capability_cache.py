@@ -0,0 +1,56 @@
+# benchmarks/bench_capability_cache.py
+"""
+Startup benchmark: capability resolution in a fresh interpreter,
+with the on-disk cache cold (miss), warm (hit) and disabled.
+
+    python benchmarks/bench_capability_cache.py [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+SNIPPET = (
+    "import time; t = time.perf_counter(); "
+    "from dworshak_prompt.capabilities import get_capabilities; get_capabilities(); "
+    "print(time.perf_counter() - t)"
+)
+
+
+def run_once(env: dict) -> float:
+    out = subprocess.run([sys.executable, "-c", SNIPPET], env=env, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip())
+
+
+def report(label: str, samples: list):
+    ms = [s * 1000 for s in samples]
+    print(f"{label:<10} median {statistics.median(ms):8.2f} ms   min {min(ms):8.2f} ms   (n={len(ms)})")
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(os.environ, DWORSHAK_PROMPT_CACHE_DIR=cache_dir)
+        env.pop("DWORSHAK_PROMPT_NO_CAPABILITY_CACHE", None)
+
+        cache_file = os.path.join(cache_dir, "capabilities.json")
+        miss = []
+        for _ in range(runs):
+            if os.path.exists(cache_file):
+                os.remove(cache_file)
+            miss.append(run_once(env))
+
+        run_once(env)  # prime
+        hit = [run_once(env) for _ in range(runs)]
+
+        disabled_env = dict(env, DWORSHAK_PROMPT_NO_CAPABILITY_CACHE="1")
+        disabled = [run_once(disabled_env) for _ in range(runs)]
+
+    report("miss", miss)
+    report("hit", hit)
+    report("disabled", disabled)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# benchmarks/bench_deadlines.py
+"""
+Cost of arming and cancelling ask(timeout=...) deadlines with many asks in flight.
+
+  scheduler   deadlines.DeadlineScheduler: one shared thread, heap of deadlines
+  timer       one threading.Timer per ask (the previous implementation), for comparison
+
+Reports schedule+cancel cost per deadline, peak thread count, and how late expiring
+deadlines fire.
+
+    python benchmarks/bench_deadlines.py [asks] [--save-baseline]
+"""
+import argparse
+import sys
+import threading
+import time
+
+from _common import finish, report
+
+from dworshak_prompt.deadlines import DeadlineScheduler
+
+
+def bench_scheduler(asks: int) -> dict:
+    scheduler = DeadlineScheduler()
+    base_threads = threading.active_count()
+
+    # Asks that finish first: arm, then cancel
+    costs = []
+    handles = []
+    for _ in range(asks):
+        t0 = time.perf_counter()
+        handles.append(scheduler.schedule(60, lambda: None))
+        costs.append((time.perf_counter() - t0) * 1000)
+    peak = threading.active_count() - base_threads
+    for i, handle in enumerate(handles):
+        t0 = time.perf_counter()
+        handle.cancel()
+        costs[i] += (time.perf_counter() - t0) * 1000
+
+    # Asks that time out: lateness of each firing
+    lateness = []
+    done = threading.Event()
+    expiring = min(asks, 2000)
+
+    def fired(when):
+        lateness.append((time.monotonic() - when) * 1000)
+        if len(lateness) == expiring:
+            done.set()
+
+    for i in range(expiring):
+        when = time.monotonic() + 0.2 + i * 0.0001
+        scheduler.schedule(when - time.monotonic(), lambda when=when: fired(when))
+    done.wait(30)
+    return {"costs": costs, "lateness": lateness, "threads": peak}
+
+
+def bench_timer(asks: int) -> dict:
+    base_threads = threading.active_count()
+    costs = []
+    timers = []
+    for _ in range(asks):
+        t0 = time.perf_counter()
+        timer = threading.Timer(60, lambda: None)
+        timer.daemon = True
+        timer.start()
+        timers.append(timer)
+        costs.append((time.perf_counter() - t0) * 1000)
+    peak = threading.active_count() - base_threads
+    for i, timer in enumerate(timers):
+        t0 = time.perf_counter()
+        timer.cancel()
+        costs[i] += (time.perf_counter() - t0) * 1000
+    for timer in timers:
+        timer.join()
+    return {"costs": costs, "threads": peak}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ask(timeout=...) deadline cost")
+    parser.add_argument("asks", nargs="?", type=int, default=5000)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    scheduler = bench_scheduler(args.asks)
+    timer = bench_timer(args.asks)
+
+    results = {
+        "scheduler arm+cancel": report("scheduler arm+cancel", scheduler["costs"]),
+        "scheduler lateness": report("scheduler firing lateness", scheduler["lateness"]),
+        "timer arm+cancel": report("threading.Timer arm+cancel", timer["costs"]),
+    }
+    print(f"extra threads with {args.asks} asks in flight: scheduler {scheduler['threads']}, "
+          f"threading.Timer {timer['threads']}")
+    results["resources"] = {"scheduler_threads": scheduler["threads"], "timer_threads": timer["threads"]}
+    finish("deadlines", results, sys.argv)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# benchmarks/bench_html_pages.py
+"""
+HTML serving cost of the prompt server.
+
+  render   PageTemplate.render() of the single-value and multi-field pages, in-process
+  http     sequential GETs against a live server: the dashboard (identity, gzip, and a
+           revalidation answered 304), /config_modal and /form_modal. Each sample is one
+           request on a fresh connection, except the keep-alive run, which reuses one
+           HTTP/1.1 connection; throughput is requests per second over the run.
+  submit   answering a prompt on a keep-alive connection: the urlencoded form post
+           (/api/submit_config, HTML success page) vs the JSON API (/api/submit,
+           structured acknowledgement), with request and response sizes.
+
+    python benchmarks/bench_html_pages.py [requests] [--save-baseline]
+"""
+import http.client
+import json
+import sys
+import time
+import urllib.parse
+
+from _common import finish, report
+
+from dworshak_prompt.prompt_manager import PromptManager
+from dworshak_prompt.server import CONFIG_PAGE, FORM_PAGE, FORM_ROW, run_prompt_server_in_thread, stop_prompt_server
+
+FIELDS = [
+    {"key": f"field{i}", "message": f"Value <{i}> & more", "suggestion": f"s\"{i}\"", "is_credential": i % 3 == 0}
+    for i in range(8)
+]
+
+
+def bench_render(runs: int) -> dict:
+    results = {}
+    samples = []
+    for i in range(runs):
+        t0 = time.perf_counter()
+        CONFIG_PAGE.render(
+            request_id="abc", message=f"Enter value {i} <b>", suggestion="x\"y",
+            key="value", input_type="text", toggle=b"",
+        )
+        samples.append((time.perf_counter() - t0) * 1000)
+    results["render config_modal"] = report("render config_modal", samples)
+
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        rows = b"".join(
+            FORM_ROW.render(index=i, key=f["key"], label=f["message"], input_type="text", suggestion=f["suggestion"], autofocus=b"", toggle=b"")
+            for i, f in enumerate(FIELDS)
+        )
+        FORM_PAGE.render(message="Form", request_id="abc", rows=rows)
+        samples.append((time.perf_counter() - t0) * 1000)
+    results["render form_modal (8 fields)"] = report("render form_modal (8 fields)", samples)
+    return results
+
+
+def bench_http(host: str, port: int, label: str, path: str, runs: int, headers: dict, expect: int, keep_alive: bool = False) -> dict:
+    samples = []
+    conn = http.client.HTTPConnection(host, port, timeout=5)
+    start = time.perf_counter()
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        if not keep_alive:
+            conn = http.client.HTTPConnection(host, port, timeout=5)
+        conn.request("GET", path, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        if not keep_alive:
+            conn.close()
+        samples.append((time.perf_counter() - t0) * 1000)
+        assert response.status == expect, (label, response.status)
+    elapsed = time.perf_counter() - start
+    conn.close()
+    stats = report(label, samples)
+    print(f"{'':<34} {runs / elapsed:9.0f} req/s")
+    return stats
+
+
+def bench_submit(manager, host: str, port: int, label: str, runs: int, as_json: bool) -> dict:
+    samples = []
+    sent = received = 0
+    conn = http.client.HTTPConnection(host, port, timeout=5)
+    for i in range(runs):
+        req_id = manager.register_prompt("value", "Enter value", False)
+        if as_json:
+            path, content_type = "/api/submit", "application/json"
+            body = json.dumps({"request_id": req_id, "value": f"answer-{i}"}).encode()
+        else:
+            path, content_type = "/api/submit_config", "application/x-www-form-urlencoded"
+            body = urllib.parse.urlencode({"request_id": req_id, "input_value": f"answer-{i}"}).encode()
+        t0 = time.perf_counter()
+        conn.request("POST", path, body=body, headers={"Content-Type": content_type})
+        response = conn.getresponse()
+        payload = response.read()
+        samples.append((time.perf_counter() - t0) * 1000)
+        assert response.status == 200, (label, response.status)
+        assert manager.get_and_clear_result(req_id) == f"answer-{i}"
+        sent += len(body)
+        received += len(payload)
+    conn.close()
+    stats = report(label, samples)
+    print(f"{'':<34} body {sent / runs:.0f} B sent, {received / runs:.0f} B received per submission")
+    return stats
+
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    runs = int(args[0]) if args else 2000
+
+    results = bench_render(runs * 5)
+
+    manager = PromptManager()
+    run_prompt_server_in_thread(manager)
+    host, port = manager.get_server_url().removeprefix("http://").split(":")
+    port = int(port)
+    try:
+        conn = http.client.HTTPConnection(host, port)
+        conn.request("GET", "/dashboard")
+        response = conn.getresponse()
+        response.read()
+        etag = response.getheader("ETag")
+        conn.close()
+
+        prompt_id = manager.register_prompt("value", "Enter <value>", False, suggestion="x\"y")
+        query = urllib.parse.urlencode({"request_id": prompt_id})
+        form_id = manager.register_form(FIELDS, message="Bench form")
+        gzip = {"Accept-Encoding": "gzip"}
+        for label, path, headers, expect, keep_alive in (
+            ("GET /dashboard", "/dashboard", {}, 200, False),
+            ("GET /dashboard gzip", "/dashboard", gzip, 200, False),
+            ("GET /dashboard revalidate (304)", "/dashboard", {"If-None-Match": etag}, 304, False),
+            ("GET /config_modal", f"/config_modal?{query}", {}, 200, False),
+            ("GET /config_modal keep-alive", f"/config_modal?{query}", {}, 200, True),
+            ("GET /form_modal gzip (8 fields)", f"/form_modal?request_id={form_id}", gzip, 200, False),
+        ):
+            results[label] = bench_http(host, port, label, path, runs, headers, expect, keep_alive)
+        results["POST /api/submit_config (form)"] = bench_submit(manager, host, port, "POST /api/submit_config (form)", runs, False)
+        results["POST /api/submit (JSON)"] = bench_submit(manager, host, port, "POST /api/submit (JSON)", runs, True)
+    finally:
+        stop_prompt_server()
+
+    finish("html_pages", results, sys.argv)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# benchmarks/bench_result_handoff.py
+"""
+Submit-to-return latency of PromptManager.wait_for_result, plus stop_event cancel latency.
+Exits non-zero if the median submit-to-return latency exceeds the budget.
+
+    python benchmarks/bench_result_handoff.py [runs]
+"""
+import statistics
+import sys
+import threading
+import time
+
+from dworshak_prompt.prompt_manager import PromptManager
+from dworshak_prompt.keyboard_interrupt import InterruptEvent
+
+BUDGET_MS = 10.0
+
+
+def measure(runs: int, use_stop_event: bool) -> list:
+    manager = PromptManager()
+    samples = []
+    for _ in range(runs):
+        req_id = manager.register_prompt("k", "m", False)
+        stop = threading.Event() if use_stop_event else None
+        returned = {}
+
+        def waiter():
+            manager.wait_for_result(req_id, timeout=5, stop_event=stop)
+            returned["t"] = time.perf_counter()
+
+        t = threading.Thread(target=waiter)
+        t.start()
+        time.sleep(0.002)  # let the waiter block
+        submitted = time.perf_counter()
+        manager.submit_result(req_id, "value")
+        t.join()
+        samples.append((returned["t"] - submitted) * 1000)
+    return samples
+
+
+def measure_cancel(runs: int, event_type=threading.Event) -> list:
+    manager = PromptManager()
+    samples = []
+    for _ in range(runs):
+        req_id = manager.register_prompt("k", "m", False)
+        stop = event_type()
+        returned = {}
+
+        def waiter():
+            manager.wait_for_result(req_id, stop_event=stop)
+            returned["t"] = time.perf_counter()
+
+        t = threading.Thread(target=waiter)
+        t.start()
+        time.sleep(0.002)
+        fired = time.perf_counter()
+        stop.set()
+        t.join()
+        samples.append((returned["t"] - fired) * 1000)
+    return samples
+
+
+def report(label: str, ms: list):
+    ms = sorted(ms)
+    p99 = ms[min(len(ms) - 1, int(len(ms) * 0.99))]
+    print(f"{label:<28} p50 {statistics.median(ms):7.3f} ms   p99 {p99:7.3f} ms   (n={len(ms)})")
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    plain = measure(runs, use_stop_event=False)
+    linked = measure(runs, use_stop_event=True)
+    cancel_linked = measure_cancel(max(10, runs // 10), InterruptEvent)
+    cancel_plain = measure_cancel(max(10, runs // 10), threading.Event)
+    report("submit -> return", plain)
+    report("submit -> return (stop_evt)", linked)
+    report("InterruptEvent -> return", cancel_linked)
+    report("plain Event -> return", cancel_plain)
+
+    worst = max(statistics.median(plain), statistics.median(linked))
+    if worst > BUDGET_MS:
+        print(f"FAIL: median submit-to-return {worst:.3f} ms exceeds {BUDGET_MS} ms budget")
+        sys.exit(1)
+    print(f"OK: within {BUDGET_MS} ms budget")
+
+
+if __name__ == "__main__":
+    main()
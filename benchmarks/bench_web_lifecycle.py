@@ -0,0 +1,47 @@
+# benchmarks/bench_web_lifecycle.py
+"""
+Cold start (bind + first HTTP response) and teardown time of the web backend's prompt server.
+
+    python benchmarks/bench_web_lifecycle.py [runs]
+"""
+import statistics
+import sys
+import time
+import urllib.request
+
+from dworshak_prompt.prompt_manager import PromptManager
+from dworshak_prompt.server import run_prompt_server_in_thread, stop_prompt_server
+
+
+def report(label: str, ms: list):
+    ms = sorted(ms)
+    p99 = ms[min(len(ms) - 1, int(len(ms) * 0.99))]
+    print(f"{label:<22} p50 {statistics.median(ms):8.3f} ms   p99 {p99:8.3f} ms   (n={len(ms)})")
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    start, first_response, teardown = [], [], []
+    for _ in range(runs):
+        manager = PromptManager()
+
+        t0 = time.perf_counter()
+        run_prompt_server_in_thread(manager)
+        t1 = time.perf_counter()
+        with urllib.request.urlopen(manager.get_server_url() + "/api/get_active_prompt") as r:
+            r.read()
+        t2 = time.perf_counter()
+        stop_prompt_server()
+        t3 = time.perf_counter()
+
+        start.append((t1 - t0) * 1000)
+        first_response.append((t2 - t0) * 1000)
+        teardown.append((t3 - t2) * 1000)
+
+    report("start (bind, listen)", start)
+    report("start -> 1st response", first_response)
+    report("teardown", teardown)
+
+
+if __name__ == "__main__":
+    main()
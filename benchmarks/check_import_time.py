@@ -0,0 +1,68 @@
+# benchmarks/check_import_time.py
+"""
+Import-time budget check. Exits non-zero if any measurement exceeds its budget,
+so it can gate CI the same way a test would.
+
+Measures (median of several fresh interpreters):
+  - cumulative `python -X importtime` cost of the top-level module
+  - wall time of `python -m dworshak_prompt --version`
+
+    python benchmarks/check_import_time.py [runs]
+
+Budgets can be overridden for slow machines, e.g. DWORSHAK_IMPORT_BUDGET_SCALE=2.
+"""
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+SCALE = float(os.environ.get("DWORSHAK_IMPORT_BUDGET_SCALE", "1"))
+
+# Module -> budget in milliseconds (cumulative self+children as reported by -X importtime)
+IMPORT_BUDGETS_MS = {
+    "dworshak_prompt": 15,
+    "dworshak_prompt.multiplexer": 120,
+}
+VERSION_BUDGET_MS = 150
+
+_LINE = re.compile(r"^import time:\s+\d+\s+\|\s+(\d+)\s+\|\s?(\s*)(\S+)\s*$")
+
+
+def cumulative_import_ms(module: str) -> float:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m and not m.group(2) and m.group(3) == module:
+            return int(m.group(1)) / 1000
+    raise RuntimeError(f"No importtime line for {module}")
+
+
+def version_wall_ms() -> float:
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, "-m", "dworshak_prompt", "--version"], capture_output=True, check=True)
+    return (time.perf_counter() - t0) * 1000
+
+
+def check(label: str, samples: list, budget: float) -> bool:
+    median = statistics.median(samples)
+    ok = median <= budget
+    print(f"{label:<38} median {median:8.1f} ms   budget {budget:6.0f} ms   {'ok' if ok else 'OVER BUDGET'}")
+    return ok
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    ok = True
+    for module, budget in IMPORT_BUDGETS_MS.items():
+        ok &= check(f"import {module}", [cumulative_import_ms(module) for _ in range(runs)], budget * SCALE)
+    ok &= check("dworshak-prompt --version (wall)", [version_wall_ms() for _ in range(runs)], VERSION_BUDGET_MS * SCALE)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
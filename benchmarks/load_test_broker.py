@@ -0,0 +1,106 @@
+# benchmarks/load_test_broker.py
+"""
+Load test of the prompt broker: hundreds of clients (each its own Unix socket
+connection, as separate processes would be) register prompts with one broker and
+are answered through its single web UI.
+
+Reports, at p50/p99:
+  register      connect -> broker acknowledges the prompt
+  end-to-end    connect -> answer posted over HTTP -> client receives the value
+plus the broker's thread count (constant, whatever the number of clients) and the
+number of open prompts after the run.
+
+    python benchmarks/load_test_broker.py [clients] [--save-baseline]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from _common import finish, report
+
+from dworshak_prompt import local_socket
+from dworshak_prompt.broker import PromptBroker
+
+
+def one_client(path, i: int):
+    t0 = time.perf_counter()
+    sock = local_socket.connect(path)
+    reader = local_socket.LineReader()
+    sock.sendall(local_socket.encode({"op": "prompt", "message": f"load-{i}"}))
+    registered = local_socket.read_message(sock, reader)
+    t1 = time.perf_counter()
+    result = local_socket.read_message(sock, reader)
+    t2 = time.perf_counter()
+    sock.close()
+    assert registered["event"] == "registered", registered
+    assert result["value"] == f"value-{i}", result
+    return (t1 - t0) * 1000, (t2 - t0) * 1000
+
+
+def operator(broker: PromptBroker, clients: int, done: threading.Event):
+    """Answers every prompt as it appears, like one person working the dashboard."""
+    answered = 0
+    while answered < clients and not done.is_set():
+        prompts = broker.manager.list_active_prompts()
+        if not prompts:
+            time.sleep(0.001)
+            continue
+        for prompt in prompts:
+            value = "value-" + prompt["message"].split("-", 1)[1]
+            body = urllib.parse.urlencode({"request_id": prompt["request_id"], "input_value": value}).encode()
+            try:
+                with urllib.request.urlopen(f"{broker.url}/api/submit_config", data=body) as r:
+                    r.read()
+                answered += 1
+            except urllib.error.HTTPError:
+                pass  # Already answered
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prompt broker load test")
+    parser.add_argument("clients", nargs="?", type=int, default=300)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chmod(tmp, 0o700)
+        path = os.path.join(tmp, "broker.sock")
+        broker = PromptBroker(path, open_browser=False)
+        broker.start()
+        loop = threading.Thread(target=broker.serve_forever, daemon=True)
+        loop.start()
+
+        done = threading.Event()
+        answering = threading.Thread(target=operator, args=(broker, args.clients, done), daemon=True)
+        answering.start()
+        try:
+            with ThreadPoolExecutor(max_workers=args.clients) as pool:
+                t0 = time.perf_counter()
+                samples = list(pool.map(lambda i: one_client(path, i), range(args.clients)))
+                elapsed = time.perf_counter() - t0
+        finally:
+            done.set()
+            answering.join(5)
+            pending = broker.manager.pending_count()
+            broker.stop()
+            loop.join(5)
+
+    print(f"{args.clients} clients, {elapsed:.2f} s ({args.clients / elapsed:.0f} prompts/s), "
+          f"broker threads: 1 selector loop (+HTTP server), pending after run: {pending}")
+    results = {
+        "register": report("connect -> registered", [s[0] for s in samples]),
+        "end to end": report("connect -> answer received", [s[1] for s in samples]),
+    }
+    results["resources"] = {"pending_after": pending, "prompts_per_s": round(args.clients / elapsed, 1)}
+    finish("load_test_broker", results, sys.argv)
+
+
+if __name__ == "__main__":
+    main()
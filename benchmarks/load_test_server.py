@@ -0,0 +1,162 @@
+# benchmarks/load_test_server.py
+"""
+Load test of the prompt server: hundreds of prompts registered concurrently, each
+answered by its own HTTP client posting /api/submit_config.
+
+Reports, at p50/p99:
+  submit HTTP   round trip of the POST /api/submit_config request
+  end-to-end    register -> client fetches /api/get_active_prompt and posts -> waiter wakes
+plus throughput, peak thread count (whole process, and excluding the client pool) and RSS.
+--streams opens that many dashboard event streams (/api/events) that stay connected,
+and receive every prompt change, for the whole run.
+
+    python benchmarks/load_test_server.py [prompts] [--concurrency N] [--streams N] [--save-baseline]
+"""
+import argparse
+import json
+import selectors
+import socket
+import sys
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from _common import finish, report, rss_mb
+
+from dworshak_prompt.prompt_manager import PromptManager
+from dworshak_prompt.server import run_prompt_server_in_thread, stop_prompt_server
+
+
+CLIENT_THREAD_PREFIX = "load-client"
+
+
+def _non_client_threads() -> int:
+    return sum(1 for t in threading.enumerate() if not t.name.startswith(CLIENT_THREAD_PREFIX))
+
+
+class ThreadSampler:
+    """Samples threading.active_count() in the background to catch the peak."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak = threading.active_count()
+        # Server side: everything but the client pool (includes this sampler and the stream reader)
+        self.peak_server = _non_client_threads()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, threading.active_count())
+            self.peak_server = max(self.peak_server, _non_client_threads())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+class EventStreams:
+    """n open /api/events connections, drained by one reader thread."""
+
+    def __init__(self, base: str, n: int):
+        host, port = base.removeprefix("http://").split(":")
+        self.socks = []
+        for _ in range(n):
+            sock = socket.create_connection((host, int(port)))
+            sock.sendall(b"GET /api/events HTTP/1.1\r\nHost: x\r\n\r\n")
+            self.socks.append(sock)
+        self.received = {sock: 0 for sock in self.socks}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        with selectors.DefaultSelector() as selector:
+            for sock in self.socks:
+                selector.register(sock, selectors.EVENT_READ)
+            while not self._stop.is_set():
+                for key, _ in selector.select(0.05):
+                    data = key.fileobj.recv(65536)
+                    if not data:
+                        selector.unregister(key.fileobj)
+                    self.received[key.fileobj] += data.count(b"data: ")
+
+    def close(self) -> int:
+        """Closes the streams; returns how many received at least one prompt push."""
+        self._stop.set()
+        self._thread.join()
+        for sock in self.socks:
+            sock.close()
+        return sum(1 for count in self.received.values() if count > 1)
+
+
+def one_prompt(manager: PromptManager, base: str, i: int):
+    t0 = time.perf_counter()
+    req_id = manager.register_prompt("load", f"load-{i}", False)
+
+    # The head of the queue is usually someone else's prompt; the poll still exercises the route
+    with urllib.request.urlopen(f"{base}/api/get_active_prompt") as r:
+        json.loads(r.read())
+
+    body = urllib.parse.urlencode({"request_id": req_id, "input_value": f"value-{i}"}).encode()
+    t1 = time.perf_counter()
+    with urllib.request.urlopen(f"{base}/api/submit_config", data=body) as r:
+        r.read()
+    t2 = time.perf_counter()
+
+    value = manager.wait_for_result(req_id, timeout=30)
+    t3 = time.perf_counter()
+    assert value == f"value-{i}", value
+    return (t2 - t1) * 1000, (t3 - t0) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prompt server load test")
+    parser.add_argument("prompts", nargs="?", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--streams", type=int, default=50)
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args()
+
+    manager = PromptManager()
+    run_prompt_server_in_thread(manager)
+    base = manager.get_server_url()
+    rss_before = rss_mb()
+
+    streams = EventStreams(base, args.streams)
+    try:
+        with ThreadSampler() as threads, ThreadPoolExecutor(max_workers=args.concurrency, thread_name_prefix=CLIENT_THREAD_PREFIX) as pool:
+            t0 = time.perf_counter()
+            samples = list(pool.map(lambda i: one_prompt(manager, base, i), range(args.prompts)))
+            elapsed = time.perf_counter() - t0
+    finally:
+        live_streams = streams.close()
+        stop_prompt_server()
+
+    rss_after = rss_mb()
+    print(f"{args.prompts} prompts, {args.concurrency} concurrent clients, "
+          f"{live_streams}/{args.streams} dashboard streams updated, {elapsed:.2f} s "
+          f"({args.prompts / elapsed:.0f} prompts/s)")
+    results = {
+        "submit http": report("submit HTTP round trip", [s[0] for s in samples]),
+        "end to end": report("register -> result", [s[1] for s in samples]),
+    }
+    print(f"peak threads {threads.peak} ({threads.peak_server} excluding clients)   RSS {rss_before['rss_mb']} -> {rss_after['rss_mb']} MiB "
+          f"(peak {rss_after['peak_rss_mb']} MiB)   pending after run: {manager.pending_count()}")
+    results["resources"] = {
+        "peak_threads": threads.peak,
+        "peak_server_threads": threads.peak_server,
+        "peak_rss_mb": rss_after["peak_rss_mb"],
+        "prompts_per_s": round(args.prompts / elapsed, 1),
+    }
+    finish("load_test_server", results, sys.argv)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,20 @@
 __all__ = [
     "DworshakPrompt", 
-    "dworshak_ask"
-    "PromptMode"
-    "DworshakObtain"
-    "dworshak_obtain"
-    "StoreMode"
+    "dworshak_ask",
+    "PromptMode",
+    "DworshakObtain",
+    "dworshak_obtain",
+    "StoreMode",
+    "PromptField",
+    "InterruptEvent",
+    "get_capabilities",
+    "invalidate_capabilities",
+    "clear_store_cache",
+    "enable_secret_cache",
+    "disable_secret_cache",
+    "add_timing_hook",
+    "remove_timing_hook",
+    "log_timing_spans",
     ]
 
 def __getattr__(name):
@@ -32,6 +42,37 @@ def __getattr__(name):
         from .obtain import StoreMode
         return StoreMode
     
+    if name == "PromptField":
+        from .prompt_field import PromptField
+        return PromptField
+
+    if name == "InterruptEvent":
+        from .keyboard_interrupt import InterruptEvent
+        return InterruptEvent
+
+    if name == "get_capabilities":
+        from .capabilities import get_capabilities
+        return get_capabilities
+    
+    if name == "invalidate_capabilities":
+        from .capabilities import invalidate_capabilities
+        return invalidate_capabilities
+
+    if name == "clear_store_cache":
+        from .store_cache import clear_store_cache
+        return clear_store_cache
+
+    if name == "enable_secret_cache":
+        from .secret_cache import enable_secret_cache
+        return enable_secret_cache
+
+    if name == "disable_secret_cache":
+        from .secret_cache import disable_secret_cache
+        return disable_secret_cache
+
+    if name in ("add_timing_hook", "remove_timing_hook", "log_timing_spans"):
+        from . import timing
+        return getattr(timing, name)
 
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
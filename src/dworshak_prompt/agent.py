@@ -0,0 +1,358 @@
+# src/dworshak_prompt/agent.py
+"""
+Value agent: keeps loaded stores and decrypted secrets in one long-lived process,
+like ssh-agent does for keys.
+
+    eval "$(dworshak-prompt agent --daemon)"     # exports DWORSHAK_PROMPT_AGENT_SOCK
+    dworshak-prompt obtain config svc item       # answered by the agent, no store load or decrypt
+
+When its socket exists, the `obtain` CLI asks the agent first for config, env and
+secret values, and DworshakObtain asks it first for secrets. In-process config/.env
+lookups stay on the cached local stores (store_cache), which answer faster than a
+socket round trip. A miss, or no agent, falls back to the local stores and the prompt
+as before. Values the agent does not know are never prompted for by the agent itself.
+
+The socket is 0600 inside a 0700 directory, and on Linux each connection's peer uid
+is checked against the agent's own.
+
+Protocol: JSON lines on a persistent connection (see local_socket).
+    {"op": "get", "store": "config", "service", "item", "path"}  -> {"ok": true, "value"}
+    {"op": "get", "store": "env", "key", "path"}                 -> {"ok": true, "value"}
+    {"op": "get", "store": "secret", "service", "item"}          -> {"ok": true, "value"}
+    {"op": "forget", "service", "item"}                          -> {"ok": true}   (secret changed)
+    {"op": "ping"} -> {"ok": true, "pid"}      {"op": "stop"} -> {"ok": true}
+Errors: {"ok": false, "error"}.
+
+    DWORSHAK_PROMPT_AGENT_SOCK=<path>   Socket path (default <runtime dir>/agent.sock)
+    DWORSHAK_PROMPT_NO_AGENT=1          Never consult the agent
+"""
+from __future__ import annotations
+import os
+import socket
+import sys
+import threading
+
+from . import local_socket
+
+# The client half is imported by the `obtain` CLI fast path on every call, so logging,
+# socketserver and the stores are only imported where they are used.
+
+AGENT_SOCKET_ENV = "DWORSHAK_PROMPT_AGENT_SOCK"
+NO_AGENT_ENV = "DWORSHAK_PROMPT_NO_AGENT"
+# Decrypted secrets stay in the agent this long after being decrypted (then are wiped)
+DEFAULT_SECRET_TTL = 900.0
+AGENT_MAX_SECRETS = 1024
+# A secret decrypt can be slow the first time; plain lookups are sub-millisecond
+AGENT_REQUEST_TIMEOUT = 10.0
+AGENT_CONNECT_TIMEOUT = 1.0
+
+
+def agent_socket_path() -> str:
+    return local_socket.socket_path(AGENT_SOCKET_ENV, "agent.sock")
+
+
+def agent_enabled() -> bool:
+    """Cheap pre-check for clients: sockets supported, not opted out, socket file present."""
+    if not local_socket.supported():
+        return False
+    if os.getenv(NO_AGENT_ENV, "").lower() in ("1", "true", "yes"):
+        return False
+    try:
+        return os.path.exists(agent_socket_path())
+    except OSError:
+        return False
+
+
+def store_path(path) -> str:
+    # The agent's working directory differs from the caller's: always send absolute paths
+    return os.path.abspath(os.path.expanduser(str(path)))
+
+
+# --- server ---
+
+def _debug(message: str):
+    import logging
+    logging.getLogger("dworshak_prompt").debug(message)
+
+
+def _peer_uid(sock: socket.socket) -> int | None:
+    """Uid of the connecting process where the platform reports it (Linux SO_PEERCRED)."""
+    import struct
+    peercred = getattr(socket, "SO_PEERCRED", None)
+    if peercred is None:
+        return None
+    try:
+        _, uid, _ = struct.unpack("3i", sock.getsockopt(socket.SOL_SOCKET, peercred, struct.calcsize("3i")))
+    except OSError:
+        return None
+    return uid
+
+
+def _make_server(listener: socket.socket, agent: "ValueAgent"):
+    """Threaded socketserver around an already bound listener (see local_socket.listen)."""
+    import socketserver
+
+    class AgentHandler(socketserver.BaseRequestHandler):
+        def handle(self):
+            uid = _peer_uid(self.request)
+            if uid is not None and uid != os.getuid():
+                _debug(f"[DIAGNOSTIC] Agent refused a connection from uid {uid}")
+                return
+            reader = local_socket.LineReader()
+            while True:
+                try:
+                    message = local_socket.read_message(self.request, reader)
+                except (OSError, ValueError):
+                    return
+                if message is None:
+                    return
+                try:
+                    reply = agent.dispatch(message)
+                except Exception as e:
+                    reply = {"ok": False, "error": repr(e)}
+                try:
+                    self.request.sendall(local_socket.encode(reply))
+                except OSError:
+                    return
+                if isinstance(message, dict) and message.get("op") == "stop" and reply.get("ok"):
+                    # Only after the reply is out (the process exits once serve_forever returns);
+                    # closing this connection afterwards tells the client the socket is gone
+                    agent.stop()
+                    return
+
+    class AgentServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    server = AgentServer(agent.path, AgentHandler, bind_and_activate=False)
+    server.socket.close()
+    server.socket = listener
+    return server
+
+
+class ValueAgent:
+    def __init__(self, path: str | None = None, secret_ttl: float = DEFAULT_SECRET_TTL):
+        from .secret_cache import SecretCache
+        self.path = str(path) if path else agent_socket_path()
+        self.secrets = SecretCache(secret_ttl, AGENT_MAX_SECRETS)
+        self._server = None
+        self._close_lock = threading.Lock()
+        self._closed = False
+
+    def dispatch(self, message: dict) -> dict:
+        op = message.get("op") if isinstance(message, dict) else None
+        if op == "get":
+            return {"ok": True, "value": self._get(message)}
+        if op == "forget":
+            self.secrets.pop((message["service"], message["item"]))
+            return {"ok": True}
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid()}
+        if op == "stop":
+            # The connection handler stops the server once this reply is sent
+            return {"ok": True}
+        return {"ok": False, "error": f"Unknown op {op!r}"}
+
+    def _get(self, message: dict) -> object:
+        from .store_cache import get_config_store, get_env_store
+        store = message.get("store")
+        if store == "config":
+            return get_config_store(message.get("path")).get(message["service"], message["item"])
+        if store == "env":
+            # Only the file and defaults: the caller's own os.environ was checked on its side
+            env_mgr = get_env_store(message.get("path"))
+            return env_mgr.load().get(message["key"], env_mgr.defaults.get(message["key"]))
+        if store == "secret":
+            return self._secret(message["service"], message["item"])
+        raise ValueError(f"Unknown store {store!r}")
+
+    def _secret(self, service: str, item: str) -> str | None:
+        value = self.secrets.get((service, item))
+        if value is not None:
+            return value
+        from .obtain import _import_secret_backend
+        try:
+            get_secret, _ = _import_secret_backend()
+        except SystemExit:
+            raise RuntimeError("Secret backend unavailable in the agent (install the [crypto] extra)")
+        value = get_secret(service, item)
+        if value is not None:
+            self.secrets.put((service, item), value)
+        return value
+
+    def start(self):
+        self._server = _make_server(local_socket.listen(self.path), self)
+
+    def serve_forever(self):
+        try:
+            self._server.serve_forever()
+        finally:
+            self._close()
+
+    def stop(self):
+        """Stops serve_forever; the socket is closed and removed when this returns."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._close()
+
+    def _close(self):
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._server.server_close()
+            self.secrets.clear()
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+
+def _export_line(path: str) -> str:
+    return f"{AGENT_SOCKET_ENV}={path}; export {AGENT_SOCKET_ENV};"
+
+
+def run_agent(path: str | None = None, secret_ttl: float = DEFAULT_SECRET_TTL, daemon: bool = False):
+    """
+    Runs the agent until `dworshak-prompt agent --stop`, Ctrl-C or SIGTERM. With daemon=True
+    it detaches (POSIX) and the parent prints the shell export line, as ssh-agent does.
+    """
+    import signal
+    agent = ValueAgent(path, secret_ttl=secret_ttl)
+    agent.start()
+
+    if daemon:
+        if os.fork() > 0:
+            print(_export_line(agent.path), flush=True)
+            os._exit(0)
+        os.setsid()
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        os.close(devnull)
+    else:
+        print(_export_line(agent.path), flush=True)
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=agent.stop, daemon=True).start())
+    try:
+        agent.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+# --- client side ---
+
+class _Connection:
+    """One persistent connection per process, reopened after failures."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sock: socket.socket | None = None
+        self.reader = local_socket.LineReader()
+
+    def request(self, message: dict) -> dict | None:
+        with self.lock:
+            for attempt in (1, 2):
+                if self.sock is None:
+                    self.sock = local_socket.connect(agent_socket_path(), timeout=AGENT_CONNECT_TIMEOUT)
+                    if self.sock is None:
+                        return None
+                    self.sock.settimeout(AGENT_REQUEST_TIMEOUT)
+                    self.reader = local_socket.LineReader()
+                try:
+                    self.sock.sendall(local_socket.encode(message))
+                    reply = local_socket.read_message(self.sock, self.reader)
+                except (OSError, ValueError):
+                    reply = None
+                if reply is not None:
+                    return reply
+                # Agent restarted or connection went stale: retry once on a fresh socket
+                self.close()
+            return None
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+
+_connection = _Connection()
+
+
+def agent_request(message: dict) -> dict | None:
+    """The agent's reply, or None when no agent is reachable."""
+    if not agent_enabled():
+        return None
+    return _connection.request(message)
+
+
+def agent_get(store: str, **fields) -> tuple[bool, object]:
+    """
+    (True, value) when the agent answered (value None: it doesn't have one either);
+    (False, None) when there is no agent or it failed.
+    """
+    reply = agent_request({"op": "get", "store": store, **fields})
+    if not reply or not reply.get("ok"):
+        if reply:
+            _debug(f"[DIAGNOSTIC] Agent error: {reply.get('error')}")
+        return False, None
+    return True, reply.get("value")
+
+
+def agent_forget_secret(service: str, item: str):
+    """Tells a running agent that a secret changed, so it doesn't serve the old value."""
+    agent_request({"op": "forget", "service": service, "item": item})
+
+
+def stop_agent(path: str | None = None) -> bool:
+    """
+    Stops the agent listening at path (default agent_socket_path()). Returns once it has
+    closed its socket, so a new agent can start on the same path right away.
+    """
+    sock = local_socket.connect(str(path) if path else agent_socket_path(), timeout=AGENT_CONNECT_TIMEOUT)
+    if sock is None:
+        return False
+    try:
+        sock.settimeout(AGENT_REQUEST_TIMEOUT)
+        sock.sendall(local_socket.encode({"op": "stop"}))
+        reply = local_socket.read_message(sock, local_socket.LineReader())
+        if reply and reply.get("ok"):
+            # The agent hangs up after removing its socket
+            while sock.recv(4096):
+                pass
+    except (OSError, ValueError):
+        return False
+    finally:
+        sock.close()
+    return bool(reply and reply.get("ok"))
+
+
+def cli_fast_path(argv: list) -> int | None:
+    """
+    `dworshak-prompt obtain config|env|secret ...` with no options, answered by the agent
+    without importing typer/rich or any store. Returns the exit code, or None to run the
+    full CLI (no agent, option flags, or the agent has no value so a prompt is needed).
+    Output matches the full CLI.
+    """
+    if len(argv) < 3 or argv[0] != "obtain" or any(a.startswith("-") for a in argv):
+        return None
+    command, args = argv[1], argv[2:]
+    if command == "config" and len(args) == 2:
+        found, value = agent_get("config", service=args[0], item=args[1], path=None)
+    elif command == "env" and len(args) == 1:
+        value = os.getenv(args[0])
+        found = value is not None
+        if not found:
+            # DworshakEnv's default file
+            found, value = agent_get("env", key=args[0], path=store_path(".env"))
+    elif command == "secret" and len(args) == 2:
+        found, value = agent_get("secret", service=args[0], item=args[1])
+    else:
+        return None
+    if not found or value is None:
+        return None
+    if command == "secret":
+        print("Secret known.")
+    elif value:
+        print(value)
+    sys.stdout.flush()
+    return 0
@@ -0,0 +1,391 @@
+# src/dworshak_prompt/broker.py
+"""
+Multi-process prompt broker: one web UI for every local process.
+
+`dworshak-prompt broker` runs one prompt server and listens on a Unix socket. Web
+prompts from any process of the same user are registered there instead of each
+process starting its own server and browser tab, so a single dashboard tab serves
+them all, queued by priority.
+
+Protocol: one connection per prompt, JSON lines (see local_socket).
+    client -> {"op": "prompt", "message", "hide", "suggestion", "priority"}
+              {"op": "form", "fields", "message", "priority"}
+              {"op": "ping"}
+    broker -> {"event": "registered", "request_id", "url"}
+              {"event": "result", "value"}        value None: withdrawn or expired
+              {"event": "pong", "url", "pending"}
+              {"event": "error", "error"}
+Closing the connection withdraws the prompt, so a client that dies or is interrupted
+never leaves a stale prompt on the dashboard.
+
+The broker serves every client from one selector thread (plus the HTTP server).
+
+    DWORSHAK_PROMPT_BROKER_SOCKET=<path>   Socket path (default <runtime dir>/broker.sock)
+    DWORSHAK_PROMPT_NO_BROKER=1            Clients ignore a running broker
+"""
+from __future__ import annotations
+import logging
+import os
+import selectors
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from . import local_socket
+from .keyboard_interrupt import InterruptEvent
+from .prompt_manager import PromptManager
+
+logger = logging.getLogger("dworshak_prompt")
+
+BROKER_SOCKET_ENV = "DWORSHAK_PROMPT_BROKER_SOCKET"
+NO_BROKER_ENV = "DWORSHAK_PROMPT_NO_BROKER"
+# How long registration may take before a client gives up on the broker and serves the prompt itself
+BROKER_REGISTER_TIMEOUT = 5.0
+# After launching a browser on the dashboard, give the tab this long to connect before launching another
+BROWSER_LAUNCH_GRACE = 10.0
+# How often a client re-checks a plain threading.Event stop_event
+STOP_EVENT_CHECK_INTERVAL = 0.05
+
+
+def broker_socket_path() -> Path:
+    return Path(local_socket.socket_path(BROKER_SOCKET_ENV, "broker.sock"))
+
+
+def broker_enabled() -> bool:
+    """Cheap pre-check for clients: sockets supported, not opted out, socket file present."""
+    if not local_socket.supported():
+        return False
+    if os.getenv(NO_BROKER_ENV, "").lower() in ("1", "true", "yes"):
+        return False
+    try:
+        return broker_socket_path().exists()
+    except OSError:
+        return False
+
+
+def broker_running() -> bool:
+    sock = local_socket.connect(broker_socket_path(), timeout=1.0) if broker_enabled() else None
+    if sock is None:
+        return False
+    sock.close()
+    return True
+
+
+class _Client:
+    __slots__ = ("sock", "reader", "request_id", "on_result")
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.reader = local_socket.LineReader()
+        self.request_id: Optional[str] = None
+        self.on_result = None
+
+
+class PromptBroker:
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        port: int = 0,
+        open_browser: bool = True,
+        manager: PromptManager | None = None,
+    ):
+        self.path = Path(path) if path else broker_socket_path()
+        self.port = port
+        self.open_browser = open_browser
+        self.manager = manager or PromptManager()
+        self.url = ""
+        self._selector = selectors.DefaultSelector()
+        self._listener: Optional[socket.socket] = None
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._finished: list = []
+        self._finished_lock = threading.Lock()
+        self._by_request: Dict[str, _Client] = {}
+        self._stopping = False
+        self._last_launch = 0.0
+
+    # --- lifecycle ---
+
+    def start(self):
+        """Binds the socket and starts the prompt server; call serve_forever() next."""
+        from .server import run_prompt_server_in_thread
+        self._listener = local_socket.listen(self.path)
+        self._listener.setblocking(False)
+        run_prompt_server_in_thread(self.manager, port=self.port)
+        self.url = self.manager.get_server_url()
+        self._selector.register(self._listener, selectors.EVENT_READ, "listen")
+        self._wake_r.setblocking(False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, "wake")
+
+    def stop(self):
+        self._stopping = True
+        self._poke()
+
+    def serve_forever(self):
+        from .server import stop_prompt_server
+        try:
+            while not self._stopping:
+                for key, _ in self._selector.select():
+                    if key.data == "listen":
+                        self._accept()
+                    elif key.data == "wake":
+                        self._drain_wake()
+                    else:
+                        self._read(key.data)
+        finally:
+            for client in list(self._by_request.values()):
+                self._drop(client)
+            for key in list(self._selector.get_map().values()):
+                if isinstance(key.data, _Client):
+                    key.data.sock.close()
+            self._selector.close()
+            self._listener.close()
+            self._wake_r.close()
+            self._wake_w.close()
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
+            stop_prompt_server()
+
+    # --- selector callbacks ---
+
+    def _accept(self):
+        while True:
+            try:
+                sock, _ = self._listener.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            sock.setblocking(False)
+            self._selector.register(sock, selectors.EVENT_READ, _Client(sock))
+
+    def _read(self, client: _Client):
+        try:
+            data = client.sock.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._drop(client)
+            return
+        try:
+            client.reader.feed(data)
+            while True:
+                message = client.reader.next_message()
+                if message is None:
+                    break
+                self._handle(client, message)
+        except ValueError as e:
+            self._send(client, {"event": "error", "error": f"Bad message: {e}"})
+            self._drop(client)
+
+    def _handle(self, client: _Client, message: dict):
+        op = message.get("op") if isinstance(message, dict) else None
+        if op == "ping":
+            self._send(client, {"event": "pong", "url": self.url, "pending": self.manager.pending_count()})
+            return
+        if op not in ("prompt", "form") or client.request_id is not None:
+            self._send(client, {"event": "error", "error": f"Unexpected op {op!r}"})
+            return
+
+        priority = int(message.get("priority") or 0)
+        if op == "prompt":
+            request_id = self.manager.register_prompt(
+                "input_key",
+                message.get("message") or "",
+                bool(message.get("hide")),
+                suggestion=message.get("suggestion"),
+                priority=priority,
+            )
+        else:
+            request_id = self.manager.register_form(
+                message.get("fields") or [], message=message.get("message"), priority=priority,
+            )
+        client.request_id = request_id
+        self._by_request[request_id] = client
+        client.on_result = lambda: self._finish(request_id)
+        self.manager.add_result_callback(request_id, client.on_result)
+        logger.debug(f"[DIAGNOSTIC] Broker registered {request_id} ({self.manager.pending_count()} pending)")
+        self._send(client, {"event": "registered", "request_id": request_id, "url": self.url})
+        self._present()
+
+    def _finish(self, request_id: str):
+        # Runs on the HTTP server thread (submit) or ours (cancel); hand over to the loop
+        with self._finished_lock:
+            self._finished.append(request_id)
+        self._poke()
+
+    def _drain_wake(self):
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+        with self._finished_lock:
+            finished, self._finished = self._finished, []
+        for request_id in finished:
+            client = self._by_request.pop(request_id, None)
+            value = self.manager.get_and_clear_result(request_id)
+            if client is None:
+                continue
+            self.manager.remove_result_callback(request_id, client.on_result)
+            self._send(client, {"event": "result", "value": value})
+            self._close(client)
+
+    def _drop(self, client: _Client):
+        """Client went away: withdraw its prompt."""
+        if client.request_id is not None and self._by_request.pop(client.request_id, None) is not None:
+            self.manager.remove_result_callback(client.request_id, client.on_result)
+            self.manager.cancel(client.request_id)
+            self.manager.get_and_clear_result(client.request_id)
+        self._close(client)
+
+    def _close(self, client: _Client):
+        try:
+            self._selector.unregister(client.sock)
+        except (KeyError, ValueError):
+            pass
+        client.sock.close()
+
+    def _send(self, client: _Client, message: dict):
+        # Replies are small; a client too slow to take one is dropped
+        try:
+            client.sock.setblocking(True)
+            client.sock.settimeout(1.0)
+            client.sock.sendall(local_socket.encode(message))
+            client.sock.setblocking(False)
+        except OSError:
+            pass
+
+    def _present(self):
+        """Opens the dashboard unless a tab is connected or was just launched."""
+        if not self.open_browser or self.manager.dashboard_connected():
+            return
+        now = time.monotonic()
+        if now - self._last_launch < BROWSER_LAUNCH_GRACE:
+            return
+        self._last_launch = now
+        from .browser_utils import launch_browser
+        threading.Thread(target=launch_browser, args=(f"{self.url}/dashboard",), daemon=True).start()
+
+    def _poke(self):
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            pass
+
+
+def run_broker(path: Path | str | None = None, port: int = 0, open_browser: bool = True):
+    """Runs a broker in the foreground until Ctrl-C or SIGTERM."""
+    import signal
+    broker = PromptBroker(path, port=port, open_browser=open_browser)
+    broker.start()
+    # Service managers stop daemons with SIGTERM; shut down cleanly (socket file removed)
+    signal.signal(signal.SIGTERM, lambda signum, frame: broker.stop())
+    print(f"dworshak-prompt broker: {broker.url}/dashboard (socket {broker.path})", flush=True)
+    try:
+        broker.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+# --- client side (used by web_prompt) ---
+
+def ask_broker(request: dict, stop_event: threading.Event | None = None) -> Tuple[bool, Any]:
+    """
+    Sends one prompt/form request to the broker and waits for its answer.
+    Returns (False, None) when no broker accepted it (serve the prompt locally),
+    (True, value) otherwise; value is None when withdrawn (stop_event) or expired.
+    Raises ConnectionError if the broker goes away mid-prompt.
+    """
+    sock = local_socket.connect(broker_socket_path(), timeout=BROKER_REGISTER_TIMEOUT)
+    if sock is None:
+        return False, None
+    reader = local_socket.LineReader()
+    try:
+        try:
+            sock.sendall(local_socket.encode(request))
+            reply = local_socket.read_message(sock, reader)
+        except (OSError, ValueError) as e:
+            logger.debug(f"[DIAGNOSTIC] Broker registration failed: {e!r}")
+            return False, None
+        if not reply or reply.get("event") != "registered":
+            logger.debug(f"[DIAGNOSTIC] Broker refused the prompt: {reply!r}")
+            return False, None
+
+        wake_r, wake_w = socket.socketpair()
+        wake = lambda: _send_quietly(wake_w)
+        linked = isinstance(stop_event, InterruptEvent)
+        if linked:
+            stop_event.add_callback(wake)
+        try:
+            with selectors.DefaultSelector() as selector:
+                sock.setblocking(False)
+                selector.register(sock, selectors.EVENT_READ)
+                selector.register(wake_r, selectors.EVENT_READ)
+                poll = None if (stop_event is None or linked) else STOP_EVENT_CHECK_INTERVAL
+                while True:
+                    message = reader.next_message()
+                    if message is not None:
+                        if message.get("event") == "result":
+                            return True, message.get("value")
+                        continue
+                    if stop_event is not None and stop_event.is_set():
+                        # Closing the connection withdraws the prompt
+                        return True, None
+                    for key, _ in selector.select(poll):
+                        if key.fileobj is wake_r:
+                            continue
+                        try:
+                            data = sock.recv(65536)
+                        except (BlockingIOError, InterruptedError):
+                            continue
+                        if not data:
+                            raise ConnectionError("Prompt broker closed the connection")
+                        reader.feed(data)
+        finally:
+            if linked:
+                stop_event.remove_callback(wake)
+            wake_r.close()
+            wake_w.close()
+    finally:
+        sock.close()
+
+
+async def ask_broker_async(request: dict) -> Tuple[bool, Any]:
+    """ask_broker() for asyncio; cancelling the awaiting task withdraws the prompt."""
+    import asyncio
+    path = str(broker_socket_path())
+    if not local_socket.trusted(path):
+        return False, None
+    try:
+        reader, writer = await asyncio.open_unix_connection(path)
+    except OSError:
+        return False, None
+    try:
+        import json
+        writer.write(local_socket.encode(request))
+        try:
+            line = await asyncio.wait_for(reader.readline(), BROKER_REGISTER_TIMEOUT)
+        except (asyncio.TimeoutError, OSError):
+            return False, None
+        if not line or json.loads(line).get("event") != "registered":
+            return False, None
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("Prompt broker closed the connection")
+            message = json.loads(line)
+            if message.get("event") == "result":
+                return True, message.get("value")
+    finally:
+        writer.close()
+
+
+def _send_quietly(sock: socket.socket):
+    try:
+        sock.send(b"\0")
+    except OSError:
+        pass
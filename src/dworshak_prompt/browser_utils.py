@@ -6,20 +6,40 @@ import subprocess
 import time
 import socket
 import webbrowser
-import urllib.request
-import urllib.error
+
+
+# Resolved once per process (three PATH searches): ("termux" | "edge" | "xdg", path) or ("webbrowser", None)
+_launcher: tuple | None = None
+
+
+def resolve_browser_launcher(refresh: bool = False) -> tuple:
+    """
+    Which launcher launch_browser() will use, found on first call and cached.
+    Pass refresh=True after PATH changes.
+    """
+    global _launcher
+    if _launcher is None or refresh:
+        for kind, name in (("termux", "termux-open-url"), ("edge", "microsoft-edge"), ("xdg", "xdg-open")):
+            path = shutil.which(name)
+            if path:
+                _launcher = (kind, path)
+                break
+        else:
+            _launcher = ("webbrowser", None)
+    return _launcher
 
 
 def launch_browser(url: str):
     """Refined, silent WSLg-aware launcher."""
+    kind, path = resolve_browser_launcher()
+
     # 1. Termux
-    if shutil.which("termux-open-url"):
-        subprocess.Popen(["termux-open-url", url], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if kind == "termux":
+        subprocess.Popen([path, url], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         return
 
     # 2. WSLg / Edge (The 'Muzzle' logic)
-    edge_bin = shutil.which("microsoft-edge")
-    if edge_bin:
+    if kind == "edge":
         env = os.environ.copy()
         # Force basic (non-keyring) storage to prevent the keyring password popup
         env["PYTHON_KEYRING_BACKEND"] = "keyring.backends.null.Keyring" 
@@ -34,13 +54,13 @@ def launch_browser(url: str):
 
         with open(os.devnull, 'w') as fnull:
             subprocess.Popen(
-                [edge_bin, url, "--no-first-run", "--quiet", "--disable-gpu", 
+                [path, url, "--no-first-run", "--quiet", "--disable-gpu", 
                  "--disable-dev-shm-usage", "--remote-debugging-port=0"],
                 stdout=fnull, stderr=fnull, env=env, start_new_session=True
             )
         return
     # Try general Linux desktop launcher
-    if shutil.which("xdg-open"):
+    if kind == "xdg":
         env = os.environ.copy()
         # Force basic (non-keyring) storage to prevent the keyring password popup
         env["PYTHON_KEYRING_BACKEND"] = "keyring.backends.null.Keyring" 
@@ -48,15 +68,15 @@ def launch_browser(url: str):
         try:
             print("[WEBPROMPT] Attempting launch using 'xdg-open'...")
             subprocess.Popen(
-                ["xdg-open", url],
+                [path, url],
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
                 env = env
             )
-            launched = True
             return
         except FileNotFoundError:
-            pass # shutil.which should prevent this, so we silently fall through
+            # Removed since it was resolved; look again next time
+            resolve_browser_launcher(refresh=True)
         except Exception as e:
             print(f"[WEBPROMPT WARNING] 'xdg-open' failed: {e}. Falling back...")
 
@@ -64,14 +84,21 @@ def launch_browser(url: str):
     webbrowser.open_new_tab(url)
 
 def find_open_port(start: int = 8082, end: int = 8100) -> int:
+    """
+    First port in [start, end] that nothing is listening on.
+    The prompt server binds port 0 instead; this remains for callers that need a fixed range.
+    """
     for port in range(start, end + 1):
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
             if s.connect_ex(("127.0.0.1", port)) != 0:
                 return port
-    return start
+    raise OSError(f"No open port in range {start}-{end}")
 
 def is_server_running(url: str) -> bool:
     """Check if server is up using stdlib only."""
+    # Only legacy callers use this; keep urllib out of the launch path
+    import urllib.request
+    import urllib.error
     try:
         # We use a short timeout because it's localhost
         with urllib.request.urlopen(url, timeout=0.5) as response:
@@ -0,0 +1,133 @@
+# src/dworshak_prompt/capabilities.py
+from __future__ import annotations
+import threading
+from dataclasses import dataclass, fields, asdict
+import logging
+
+# pyhabitat and concurrent.futures are imported on first probe only, so a warm
+# on-disk cache (see capability_cache.py) never pays for them.
+from .capability_cache import environment_fingerprint, load_cached, store_cached, discard_cached
+
+logger = logging.getLogger("dworshak_prompt")
+
+
+@dataclass(frozen=True)
+class Capabilities:
+    """
+    Snapshot of the pyhabitat environment probes that drive mode selection.
+    Taken once per process and shared by every DworshakPrompt.ask() call.
+    """
+    non_interactive: bool = False
+    interactive_terminal: bool = False
+    tkinter: bool = False
+    browser: bool = False
+    wsl: bool = False
+
+    @property
+    def any_interactive(self) -> bool:
+        """True if at least one backend (console, GUI, web) could be reachable."""
+        return self.interactive_terminal or self.tkinter or self.browser
+
+
+def _browser_is_available() -> bool:
+    import pyhabitat as ph
+    # pyhabitat has exposed this check under more than one name
+    probe = getattr(ph, "is_browser_available", None) or getattr(ph, "web_browser_is_available", None)
+    if probe is None:
+        return False
+    return probe()
+
+# Field name -> pyhabitat function name (or callable). The probes are independent of each other,
+# so they can run concurrently.
+_PROBES = {
+    "non_interactive": "is_likely_ci_or_non_interactive",
+    "interactive_terminal": "interactive_terminal_is_available",
+    "tkinter": "tkinter_is_available",
+    "browser": _browser_is_available,
+    "wsl": "on_wsl",
+}
+
+_snapshot: Capabilities | None = None
+_snapshot_lock = threading.Lock()
+
+
+def _run_probe(name: str) -> bool:
+    try:
+        probe = _PROBES[name]
+        if isinstance(probe, str):
+            import pyhabitat as ph
+            probe = getattr(ph, probe)
+        return bool(probe())
+    except Exception as e:
+        # A broken probe must not take down the prompt; treat the capability as absent.
+        logger.debug(f"[DIAGNOSTIC] Capability probe '{name}' failed: {e!r}")
+        return False
+
+
+# Creates a tk.Tk(): must stay on the calling thread (on macOS Tk aborts the process off the main thread)
+_CALLING_THREAD_PROBES = ("tkinter",)
+
+
+def probe_capabilities() -> Capabilities:
+    """
+    Runs the probes concurrently and returns a fresh snapshot (uncached). The tkinter
+    probe runs on the calling thread while the others run on the pool.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    import pyhabitat  # Import once here rather than racing the import in every worker
+    names = [f.name for f in fields(Capabilities)]
+    threaded = [name for name in names if name not in _CALLING_THREAD_PROBES]
+    with ThreadPoolExecutor(max_workers=len(threaded), thread_name_prefix="dworshak-probe") as pool:
+        pending = dict(zip(threaded, (pool.submit(_run_probe, name) for name in threaded)))
+        results = {name: _run_probe(name) for name in _CALLING_THREAD_PROBES}
+        results.update({name: future.result() for name, future in pending.items()})
+    return Capabilities(**results)
+
+
+def _from_disk(fingerprint: str) -> Capabilities | None:
+    cached = load_cached(fingerprint)
+    if cached is None:
+        return None
+    names = {f.name for f in fields(Capabilities)}
+    if set(cached) != names:
+        return None  # Written by a version with different probes
+    return Capabilities(**{k: bool(v) for k, v in cached.items()})
+
+
+def get_capabilities(refresh: bool = False) -> Capabilities:
+    """
+    Returns the process-wide capability snapshot.
+    Order: in-memory snapshot -> on-disk cache (same environment fingerprint) -> fresh probe.
+    Pass refresh=True to skip both caches and probe again.
+    """
+    global _snapshot
+    snapshot = _snapshot
+    if snapshot is not None and not refresh:
+        return snapshot
+
+    with _snapshot_lock:
+        if _snapshot is not None and not refresh:
+            return _snapshot
+
+        fingerprint = environment_fingerprint()
+        snapshot = None if refresh else _from_disk(fingerprint)
+        if snapshot is not None:
+            logger.debug(f"[DIAGNOSTIC] Capabilities loaded from disk cache: {snapshot}")
+        else:
+            snapshot = probe_capabilities()
+            store_cached(fingerprint, asdict(snapshot))
+            logger.debug(f"[DIAGNOSTIC] Capabilities probed: {snapshot}")
+        _snapshot = snapshot
+        return _snapshot
+
+
+def invalidate_capabilities() -> None:
+    """
+    Drops the cached snapshot (in memory and on disk for the current environment)
+    so the next ask() probes again.
+    Call this after changing the environment in-process (e.g. DISPLAY, TERM).
+    """
+    global _snapshot
+    with _snapshot_lock:
+        _snapshot = None
+        discard_cached(environment_fingerprint())
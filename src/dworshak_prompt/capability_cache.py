@@ -0,0 +1,142 @@
+# src/dworshak_prompt/capability_cache.py
+"""
+On-disk cache of capability probe results, shared across short-lived processes.
+
+Entries are keyed by a fingerprint of the environment variables and tty state
+that the probes depend on, so a new SSH session or a changed DISPLAY misses
+the cache instead of reusing stale answers.
+
+Environment variables:
+    DWORSHAK_PROMPT_NO_CAPABILITY_CACHE=1   Disable the on-disk cache entirely.
+    DWORSHAK_PROMPT_CAPABILITY_TTL=<secs>   Entry lifetime (default 3600).
+    DWORSHAK_PROMPT_CACHE_DIR=<dir>         Cache location (default ~/.cache/dworshak-prompt).
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+DEFAULT_TTL_SECONDS = 3600.0
+MAX_ENTRIES = 16
+CACHE_FILENAME = "capabilities.json"
+
+# Anything the pyhabitat probes read from the environment belongs here
+_FINGERPRINT_ENV_VARS = (
+    "TERM",
+    "DISPLAY",
+    "WAYLAND_DISPLAY",
+    "WSL_DISTRO_NAME",
+    "WSL_INTEROP",
+    "SSH_CONNECTION",
+    "SSH_TTY",
+    "CI",
+    "GITHUB_ACTIONS",
+    "GITLAB_CI",
+    "JENKINS_URL",
+    "TF_BUILD",
+    "BROWSER",
+)
+
+
+def cache_enabled() -> bool:
+    raw = os.getenv("DWORSHAK_PROMPT_NO_CAPABILITY_CACHE", "false").lower()
+    return raw not in ("true", "1", "yes", "on")
+
+
+def cache_ttl() -> float:
+    try:
+        return float(os.getenv("DWORSHAK_PROMPT_CAPABILITY_TTL", DEFAULT_TTL_SECONDS))
+    except ValueError:
+        return DEFAULT_TTL_SECONDS
+
+
+def cache_path() -> Path:
+    base = os.getenv("DWORSHAK_PROMPT_CACHE_DIR")
+    directory = Path(base) if base else Path.home() / ".cache" / "dworshak-prompt"
+    return directory / CACHE_FILENAME
+
+
+def _isatty(fd: int) -> bool:
+    try:
+        return os.isatty(fd)
+    except OSError:
+        return False
+
+
+def environment_fingerprint() -> str:
+    """Stable hash of the environment that the capability probes depend on."""
+    parts = {name: os.environ.get(name) for name in _FINGERPRINT_ENV_VARS}
+    parts["tty"] = [_isatty(fd) for fd in (0, 1, 2)]
+    parts["python"] = sys.executable
+    parts["platform"] = sys.platform
+    blob = json.dumps(parts, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+def _load_all(path: Path) -> Dict[str, dict]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_all(path: Path, entries: Dict[str, dict]):
+    """Atomic write (temp file + replace) so concurrent CLIs never read a torn file."""
+    import tempfile  # Only the write path needs it; keep it off the cache-hit import path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        mode="w", dir=path.parent, delete=False, encoding="utf-8", suffix=".tmp"
+    ) as tf:
+        json.dump(entries, tf)
+        temp_path = Path(tf.name)
+    try:
+        temp_path.replace(path)
+    except OSError:
+        temp_path.unlink(missing_ok=True)
+
+
+def load_cached(fingerprint: str) -> Optional[Dict[str, bool]]:
+    """Returns the cached probe results for this fingerprint, or None on miss/expiry."""
+    if not cache_enabled():
+        return None
+    entry = _load_all(cache_path()).get(fingerprint)
+    if not isinstance(entry, dict):
+        return None
+    age = time.time() - entry.get("ts", 0)
+    if age < 0 or age > cache_ttl():
+        return None
+    results = entry.get("results")
+    return results if isinstance(results, dict) else None
+
+
+def store_cached(fingerprint: str, results: Dict[str, bool]):
+    if not cache_enabled():
+        return
+    path = cache_path()
+    entries = _load_all(path)
+    entries[fingerprint] = {"ts": time.time(), "results": results}
+    if len(entries) > MAX_ENTRIES:
+        # Keep the most recently written environments
+        newest = sorted(entries.items(), key=lambda kv: kv[1].get("ts", 0), reverse=True)
+        entries = dict(newest[:MAX_ENTRIES])
+    try:
+        _save_all(path, entries)
+    except OSError:
+        pass  # A read-only home must never break prompting
+
+
+def discard_cached(fingerprint: str):
+    if not cache_enabled():
+        return
+    path = cache_path()
+    entries = _load_all(path)
+    if entries.pop(fingerprint, None) is not None:
+        try:
+            _save_all(path, entries)
+        except OSError:
+            pass
@@ -93,6 +93,39 @@ def ask(
         print(val)
 
 
+@app.command()
+def broker(
+    socket_path: Optional[Path] = typer.Option(
+        None, "--socket",
+        help="Unix socket path (default: $DWORSHAK_PROMPT_BROKER_SOCKET or the per-user runtime dir)."),
+    port: int = typer.Option(0, "--port", "-p", help="Web UI port (0: any free port)."),
+    no_browser: bool = typer.Option(False, "--no-browser", help="Never launch a browser; open the printed URL yourself."),
+    debug: bool = typer.Option(False, "--debug", help="Enable diagnostic logging."),
+):
+    """Serve one web UI for the web prompts of every local process."""
+    from .broker import run_broker
+    if debug:
+        import logging
+        logging.getLogger("dworshak_prompt").setLevel(logging.DEBUG)
+    run_broker(socket_path, port=port, open_browser=not no_browser)
+
+
+@app.command()
+def agent(
+    socket_path: Optional[Path] = typer.Option(
+        None, "--socket",
+        help="Unix socket path (default: $DWORSHAK_PROMPT_AGENT_SOCK or the per-user runtime dir)."),
+    ttl: float = typer.Option(900.0, "--ttl", help="Seconds a decrypted secret is kept in memory."),
+    daemon: bool = typer.Option(False, "--daemon", "-d", help="Detach and print the shell export line (eval it)."),
+    stop: bool = typer.Option(False, "--stop", help="Stop the agent listening on --socket (or the default path)."),
+):
+    """Hold loaded stores and decrypted secrets in memory for fast `obtain` lookups (like ssh-agent)."""
+    from .agent import run_agent, stop_agent
+    if stop:
+        raise typer.Exit(code=0 if stop_agent(socket_path) else 1)
+    run_agent(socket_path, secret_ttl=ttl, daemon=daemon)
+
+
 # Create the 'obtain' sub-app
 obtain_app = typer.Typer(help="If a value cannot be retrieved, it will be prompted for and set. For secrets, configs, and env values.")
 app.add_typer(obtain_app, name="obtain")
@@ -127,6 +127,30 @@ def main():
         help="Enable debug logging",
     )
 
+    # broker subcommand – stdlib only, same flags as the Typer version
+    broker_parser = subparsers.add_parser(
+        "broker",
+        help="Serve one web UI for the web prompts of every local process",
+        add_help=False,
+    )
+    broker_parser.add_argument("--socket", default=None, help="Unix socket path")
+    broker_parser.add_argument("--port", "-p", type=int, default=0, help="Web UI port (0: any free port)")
+    broker_parser.add_argument("--no-browser", action="store_true", help="Never launch a browser")
+    broker_parser.add_argument("--debug", action="store_true", help="Enable debug logging")
+    broker_parser.add_argument("-h", "--help", action="help", help="Show this help message and exit")
+
+    # agent subcommand – stdlib only, same flags as the Typer version
+    agent_parser = subparsers.add_parser(
+        "agent",
+        help="Hold loaded stores and decrypted secrets in memory for fast lookups",
+        add_help=False,
+    )
+    agent_parser.add_argument("--socket", default=None, help="Unix socket path")
+    agent_parser.add_argument("--ttl", type=float, default=900.0, help="Seconds a decrypted secret is kept in memory")
+    agent_parser.add_argument("--daemon", "-d", action="store_true", help="Detach and print the shell export line")
+    agent_parser.add_argument("--stop", action="store_true", help="Stop the agent listening on --socket (or the default path)")
+    agent_parser.add_argument("-h", "--help", action="help", help="Show this help message and exit")
+
     # Help flags at both levels
     parser.add_argument(
         "-h", "--help",
@@ -170,6 +194,21 @@ def main():
         )
         sys.exit(exit_code)
 
+    if args.command == "broker":
+        from .broker import run_broker
+        if args.debug:
+            import logging
+            logging.getLogger("dworshak_prompt").setLevel(logging.DEBUG)
+        run_broker(args.socket, port=args.port, open_browser=not args.no_browser)
+        sys.exit(0)
+
+    if args.command == "agent":
+        from .agent import run_agent, stop_agent
+        if args.stop:
+            sys.exit(0 if stop_agent(args.socket) else 1)
+        run_agent(args.socket, secret_ttl=args.ttl, daemon=args.daemon)
+        sys.exit(0)
+
     # No subcommand → show root help (exact Typer behavior)
     parser.print_help()
     sys.exit(0)
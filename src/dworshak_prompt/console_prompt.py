@@ -1,18 +1,60 @@
 # src/dworshak_prompt/console_prompt.py
+from __future__ import annotations
 import typer # keep at the top to enable failure, to hit the std lib fallback
+try:
+    # Resolved once when the console backend loads, not on every hidden prompt
+    from rich.prompt import Prompt
+except ImportError:
+    Prompt = None
+
+import threading
+import time
 
 from .keyboard_interrupt import PromptCancelled
+from . import console_reader
+
+def _rich_prompt_writer(message: str):
+    """Renders the prompt exactly as Prompt.ask(message, password=True) would."""
+    prompt = Prompt(message, password=True)
+    text = prompt.make_prompt(...)
+    return lambda: prompt.console.print(text, end="")
+
+def _read(message: str, suggestion: str | None, hide_input: bool, stop_event, timeout: float | None) -> str:
+    """
+    The Typer/Rich prompts' look and answers, read through console_reader: Rich renders
+    the hidden prompt, and an empty answer with no suggestion is asked again as
+    typer.prompt does (Rich's password prompt accepts it).
+    """
+    write_prompt = _rich_prompt_writer(f"{message} (input hidden)") if hide_input and Prompt is not None else None
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        value = console_reader.read_line(message, suggestion, hide_input, stop_event, remaining, write_prompt=write_prompt)
+        if value or write_prompt is not None or (suggestion and not hide_input):
+            return value
+
+def console_get_input(
+    message: str,
+    suggestion: str | None = None,
+    hide_input: bool = False,
+    stop_event: threading.Event | None = None,
+    timeout: float | None = None,
+) -> str:
+    """
+    Reads through console_reader (interruptible by stop_event / timeout) where stdin is
+    selectable, keeping the Typer/Rich prompt rendering; Typer/Rich prompts otherwise
+    (e.g. Windows consoles), which block until Enter.
+    """
+    try:
+        if console_reader.supported():
+            return _read(message, suggestion, hide_input, stop_event, timeout)
 
-def console_get_input(message: str, suggestion: str | None = None, hide_input: bool = False) -> str:
-    try:        
         if hide_input:
             # Explicitly add the hint so the user isn't confused by lack of feedback
             hidden_msg = f"{message} (input hidden)"
-            try:
-                from rich.prompt import Prompt
+            if Prompt is not None:
                 return Prompt.ask(hidden_msg, password=True)
-            except ImportError:
-                return typer.prompt(hidden_msg, hide_input=True)
+            return typer.prompt(hidden_msg, hide_input=True)
         
         # Standard credential case
         if suggestion: # and not hide_input
@@ -1,18 +1,30 @@
 # src/dworshak_prompt/console_prompt_stdlib.py
+from __future__ import annotations
 import sys
 import getpass
+import threading
 from .keyboard_interrupt import PromptCancelled
+from . import console_reader
 
 def console_get_input_stdlib(
     message: str, 
     suggestion: str | None = None, 
-    hide_input: bool = False
+    hide_input: bool = False,
+    stop_event: threading.Event | None = None,
+    timeout: float | None = None,
 ) -> str:
     """
     A pure standard-library fallback for user input.
     Ensures zero dependencies while maintaining a professional CLI feel.
     If a suggestion is provided while hide is True, the suggestion is ignored.
+    Interruptible by stop_event / timeout where stdin is selectable (see console_reader);
+    elsewhere input()/getpass() block until Enter.
     """
+    if console_reader.supported():
+        try:
+            return console_reader.read_line(message, suggestion, hide_input, stop_event, timeout)
+        except (KeyboardInterrupt, EOFError):
+            raise PromptCancelled()
     
     # Construct the prompt string
     # e.g., "Enter username [admin]: "
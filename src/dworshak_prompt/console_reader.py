@@ -0,0 +1,214 @@
+# src/dworshak_prompt/console_reader.py
+"""
+Interruptible, deadline-aware console line reader.
+
+input()/getpass() block inside the C read and cannot be woken from another thread,
+so a console prompt that was withdrawn (lost a race, hit its timeout, worker shutdown)
+would keep the thread, and the stdin buffer lock, until the user pressed Enter.
+read_line() instead waits with selectors on the stdin fd plus a wake socket, and raises
+PromptCancelled as soon as stop_event is set or the deadline passes.
+
+Visible input keeps the terminal's own line editing (canonical mode). Hidden input
+switches the tty to raw mode and handles Backspace, Ctrl-U, Ctrl-C and Ctrl-D itself.
+The terminal settings are restored, and unread typed-ahead input discarded, on every
+exit path.
+"""
+from __future__ import annotations
+import os
+import selectors
+import socket
+import sys
+import threading
+import time
+from typing import Callable
+
+from .keyboard_interrupt import PromptCancelled, InterruptEvent
+
+# How often a plain threading.Event (no wake callback) is re-checked
+STOP_EVENT_CHECK_INTERVAL = 0.05
+
+# Bytes read past the end of the last line (pipes can deliver several lines at once)
+_pending = bytearray()
+_pending_lock = threading.Lock()
+
+# Raw-mode control bytes
+_CTRL_C, _CTRL_D, _CTRL_U = b"\x03", b"\x04", b"\x15"
+_BACKSPACE = (b"\x7f", b"\x08")
+_LINE_END = (b"\r", b"\n")
+
+
+def supported(stream=None) -> bool:
+    """True if stdin is a selectable file descriptor (not on Windows consoles)."""
+    stream = stream or sys.stdin
+    if os.name == "nt" or stream is None:
+        return False
+    try:
+        stream.fileno()
+    except (AttributeError, OSError, ValueError):
+        return False
+    return True
+
+
+def format_prompt(message: str, suggestion: str | None = None, hide_input: bool = False) -> str:
+    # Same layout as console_get_input_stdlib
+    if hide_input:
+        return f"{message} (input hidden): "
+    if suggestion:
+        return f"{message} [{suggestion}]: ".replace("::", ":")
+    return f"{message}: ".replace("::", ":")
+
+
+class _TerminalMode:
+    """
+    Raw mode for hidden input; restores the saved settings on exit and, when the
+    read was abandoned, drops half-typed input so it doesn't leak into the shell.
+    A no-op when stdin isn't a tty.
+    """
+
+    def __init__(self, fd: int, raw: bool):
+        self.fd = fd
+        self.tty = os.isatty(fd)
+        self.raw = raw and self.tty
+        self.saved = None
+
+    def __enter__(self):
+        if self.raw:
+            import termios
+            self.saved = termios.tcgetattr(self.fd)
+            mode = termios.tcgetattr(self.fd)
+            # No echo, byte-at-a-time, and Ctrl-C/Ctrl-D arrive as bytes; output processing stays on
+            mode[3] &= ~(termios.ECHO | termios.ICANON | termios.ISIG | termios.IEXTEN)
+            mode[0] &= ~(termios.IXON | termios.ICRNL)
+            mode[6][termios.VMIN] = 1
+            mode[6][termios.VTIME] = 0
+            termios.tcsetattr(self.fd, termios.TCSADRAIN, mode)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.tty and exc_type is not None:
+            import termios
+            try:
+                termios.tcflush(self.fd, termios.TCIFLUSH)
+            except termios.error:
+                pass
+        if self.saved is not None:
+            import termios
+            termios.tcsetattr(self.fd, termios.TCSADRAIN, self.saved)
+        return False
+
+
+def read_line(
+    message: str,
+    suggestion: str | None = None,
+    hide_input: bool = False,
+    stop_event: threading.Event | None = None,
+    timeout: float | None = None,
+    write_prompt: Callable[[], None] | None = None,
+) -> str:
+    """
+    Prints the prompt and reads one line from stdin. write_prompt, if given, renders
+    the prompt instead of format_prompt() (e.g. through Rich).
+    Returns the suggestion on an empty line (visible input only). Raises PromptCancelled
+    when stop_event is set or `timeout` seconds pass before a full line arrives,
+    KeyboardInterrupt on Ctrl-C during hidden input, EOFError when stdin is closed.
+    """
+    fd = sys.stdin.fileno()
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    wake_r, wake_w = socket.socketpair()
+    wake = lambda: _poke(wake_w)
+    linked = isinstance(stop_event, InterruptEvent)
+    if linked:
+        stop_event.add_callback(wake)
+
+    finished = False
+    try:
+        with _TerminalMode(fd, hide_input) as terminal, selectors.DefaultSelector() as selector:
+            # Prompt only once raw mode is on, so nothing typed in reply is echoed
+            if write_prompt is not None:
+                write_prompt()
+            else:
+                sys.stdout.write(format_prompt(message, suggestion, hide_input))
+            sys.stdout.flush()
+            selector.register(fd, selectors.EVENT_READ)
+            selector.register(wake_r, selectors.EVENT_READ)
+            poll = None if (stop_event is None or linked) else STOP_EVENT_CHECK_INTERVAL
+            typed = bytearray()
+            while True:
+                line = _take_line(typed, terminal.raw)
+                if line is not None:
+                    finished = True
+                    response = line.decode(sys.stdin.encoding or "utf-8", errors="replace").rstrip("\r")
+                    if not response and suggestion and not hide_input:
+                        return suggestion
+                    return response
+                if stop_event is not None and stop_event.is_set():
+                    raise PromptCancelled()
+                wait = poll
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PromptCancelled()
+                    wait = remaining if wait is None else min(wait, remaining)
+                for key, _ in selector.select(wait):
+                    if key.fileobj is wake_r:
+                        continue
+                    data = os.read(fd, 4096)
+                    if not data:
+                        raise EOFError()
+                    with _pending_lock:
+                        _pending.extend(data)
+    finally:
+        if hide_input or not finished:
+            # Hidden input never echoed the Enter; an abandoned prompt leaves the cursor mid-line
+            sys.stdout.write("\n")
+            sys.stdout.flush()
+        if linked:
+            stop_event.remove_callback(wake)
+        wake_r.close()
+        wake_w.close()
+
+
+def _take_line(typed: bytearray, raw: bool) -> bytes | None:
+    """Next complete line from the pending bytes, or None; raw mode edits `typed` in place."""
+    with _pending_lock:
+        if not raw:
+            end = _pending.find(b"\n")
+            if end < 0:
+                return None
+            line = bytes(_pending[:end])
+            del _pending[:end + 1]
+            return line
+
+        while _pending:
+            byte = bytes(_pending[:1])
+            del _pending[:1]
+            if byte in _LINE_END:
+                line = bytes(typed)
+                typed.clear()
+                return line
+            if byte == _CTRL_C:
+                raise KeyboardInterrupt()
+            if byte == _CTRL_D:
+                if not typed:
+                    raise EOFError()
+                continue
+            if byte in _BACKSPACE:
+                # Drop a whole UTF-8 character, not just its last byte
+                while typed and (typed[-1] & 0xC0) == 0x80:
+                    typed.pop()
+                if typed:
+                    typed.pop()
+                continue
+            if byte == _CTRL_U:
+                typed.clear()
+                continue
+            typed.extend(byte)
+        return None
+
+
+def _poke(sock: socket.socket):
+    try:
+        sock.send(b"\0")
+    except OSError:
+        pass
@@ -0,0 +1,119 @@
+# src/dworshak_prompt/deadlines.py
+"""
+Process-wide deadline scheduler for ask(timeout=...).
+
+One daemon thread sleeps until the earliest deadline in a heap, so any number of
+concurrent asks share a single thread instead of one threading.Timer each.
+Cancelling a deadline (the ask finished first) only marks it; the heap is compacted
+once cancelled entries make up more than half of it.
+"""
+from __future__ import annotations
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger("dworshak_prompt")
+
+
+class Deadline:
+    """Handle returned by DeadlineScheduler.schedule()."""
+    __slots__ = ("when", "callback", "cancelled", "expired", "_scheduler")
+
+    def __init__(self, when: float, callback: Callable[[], None], scheduler: "DeadlineScheduler"):
+        self.when = when
+        self.callback = callback
+        self.cancelled = False
+        self.expired = False
+        self._scheduler = scheduler
+
+    def cancel(self) -> bool:
+        """Withdraws the deadline; False if it already fired."""
+        return self._scheduler.cancel(self)
+
+    def remaining(self) -> float:
+        return max(0.0, self.when - time.monotonic())
+
+
+class DeadlineScheduler:
+    def __init__(self):
+        self._heap: list = []
+        self._seq = itertools.count()
+        self._cancelled = 0
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, delay: float, callback: Callable[[], None]) -> Deadline:
+        """Runs callback on the scheduler thread after `delay` seconds unless cancelled first."""
+        deadline = Deadline(time.monotonic() + delay, callback, self)
+        with self._cond:
+            heapq.heappush(self._heap, (deadline.when, next(self._seq), deadline))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="dworshak-deadlines", daemon=True)
+                self._thread.start()
+            elif self._heap[0][2] is deadline:
+                # New earliest deadline: the thread is sleeping for a later one
+                self._cond.notify()
+        return deadline
+
+    def cancel(self, deadline: Deadline) -> bool:
+        with self._cond:
+            if deadline.expired or deadline.cancelled:
+                return False
+            deadline.cancelled = True
+            deadline.callback = None
+            self._cancelled += 1
+            if self._cancelled * 2 > len(self._heap):
+                self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+                heapq.heapify(self._heap)
+                self._cancelled = 0
+            return True
+
+    def pending(self) -> int:
+        """Number of live (not cancelled, not fired) deadlines."""
+        with self._cond:
+            return len(self._heap) - self._cancelled
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    while self._heap and self._heap[0][2].cancelled:
+                        heapq.heappop(self._heap)
+                        self._cancelled -= 1
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    wait = self._heap[0][0] - time.monotonic()
+                    if wait <= 0:
+                        break
+                    self._cond.wait(wait)
+                _, _, deadline = heapq.heappop(self._heap)
+                deadline.expired = True
+                callback, deadline.callback = deadline.callback, None
+
+            # Outside the lock: callbacks may schedule or cancel other deadlines
+            try:
+                callback()
+            except Exception as e:
+                logger.debug(f"[DIAGNOSTIC] Deadline callback {callback!r} failed: {e!r}")
+
+
+_scheduler: Optional[DeadlineScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_deadline_scheduler() -> DeadlineScheduler:
+    """The shared scheduler; its thread starts with the first deadline."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = DeadlineScheduler()
+    return _scheduler
+
+
+def schedule_deadline(delay: float, callback: Callable[[], None]) -> Deadline:
+    return get_deadline_scheduler().schedule(delay, callback)
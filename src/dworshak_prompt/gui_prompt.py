@@ -1,15 +1,47 @@
 # src/dworshak_prompt/gui_prompt.py
+"""
+Tkinter dialogs. One daemon thread ("dworshak-gui") owns a hidden, long-lived Tk root
+and shows the dialogs it is handed through a queue, one at a time; each caller blocks
+on a Future for its result. Only the first GUI prompt of a process pays for the Tcl/Tk
+interpreter and the display connection, and every Tk call stays on that one thread
+whichever thread called ask(). If the root cannot be created (no display), the request
+fails with the TclError and the next one tries again.
+
+On macOS Tk must run on the main thread, so there each dialog gets its own root on the
+calling thread, as before, and a call from any other thread (race workers, ask_async's
+executor) raises RuntimeError: GUI falls through to the next mode instead of crashing.
+"""
 from __future__ import annotations
 try:
     import tkinter as tk
 except ImportError:
     pass
-from typing import Optional
+import atexit
+import contextvars
+import logging
+import queue
+import socket
+import sys
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Callable, Optional, Dict, List
+
+from .keyboard_interrupt import InterruptEvent
+from .prompt_field import PromptField
+from .timing import span
+
+logger = logging.getLogger("dworshak_prompt")
 
 class CustomPromptDialog:
-    def __init__(self, parent, title, message, suggestion="", hide_input=False):
+    """
+    With on_done, the dialog returns at once and on_done(result) runs when it closes;
+    without, the constructor waits for the window (parent.wait_window).
+    """
+    def __init__(self, parent, title, message, suggestion="", hide_input=False, on_done: Callable | None = None):
         self.result = None
         self.hide_input = hide_input
+        self.on_done = on_done
+        self.closed = False
         
         self.top = tk.Toplevel(parent)
         self.top.title(title)
@@ -56,7 +88,8 @@ class CustomPromptDialog:
 
         self.top.protocol("WM_DELETE_WINDOW", self.on_cancel)
         self.top.grab_set()  # Make it modal
-        parent.wait_window(self.top)
+        if on_done is None:
+            parent.wait_window(self.top)
 
     def toggle_visibility(self):
         if self.entry.cget("show") == "*":
@@ -68,23 +101,392 @@ class CustomPromptDialog:
 
     def on_ok(self):
         self.result = self.entry.get()
+        self.close()
+
+    def on_cancel(self):
+        self.close()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
         self.top.destroy()
+        if self.on_done is not None:
+            self.on_done(self.result)
+
+class CustomMultiPromptDialog:
+    """
+    Multi-entry variant of CustomPromptDialog: one modal window, one row per field.
+    Hidden fields get their own Show/Hide toggle. on_done as for CustomPromptDialog.
+    """
+    def __init__(self, parent, title, fields: List[PromptField], message: str | None = None, on_done: Callable | None = None):
+        self.result: Dict[str, str] | None = None
+        self.fields = fields
+        self.on_done = on_done
+        self.closed = False
+        self.entries: Dict[str, tk.Entry] = {}
+
+        self.top = tk.Toplevel(parent)
+        self.top.title(title)
+        self.top.attributes("-topmost", True)
+        self.top.resizable(False, False)
+
+        if message:
+            tk.Label(self.top, text=message, wraplength=400, justify="left", padx=10, pady=10).pack(fill="x")
+
+        grid = tk.Frame(self.top, padx=10, pady=5)
+        grid.pack(fill="x")
+        grid.columnconfigure(1, weight=1)
+
+        for row, field in enumerate(fields):
+            tk.Label(grid, text=field.label, anchor="w", justify="left").grid(row=row, column=0, sticky="w", pady=3)
+            entry = tk.Entry(grid, font=("sans-serif", 10), width=32)
+            if field.hide_input:
+                entry.config(show="*")
+            entry.insert(0, field.suggestion or "")
+            entry.grid(row=row, column=1, sticky="ew", padx=(8, 0), pady=3)
+            entry.bind("<Return>", lambda e: self.on_ok())
+            if field.hide_input:
+                btn = tk.Button(grid, text="Show", width=5)
+                btn.config(command=lambda en=entry, b=btn: self.toggle_visibility(en, b))
+                btn.grid(row=row, column=2, padx=(5, 0))
+            self.entries[field.key] = entry
+
+        if fields:
+            self.entries[fields[0].key].focus_set()
+
+        # Action Buttons
+        btn_frame = tk.Frame(self.top, pady=10)
+        btn_frame.pack()
+        tk.Button(btn_frame, text="OK", command=self.on_ok, width=10).pack(side="left", padx=5)
+        tk.Button(btn_frame, text="Cancel", command=self.on_cancel, width=10).pack(side="left", padx=5)
+
+        # Center once the rows are laid out
+        self.top.update_idletasks()
+        w, h = max(self.top.winfo_reqwidth(), 400), self.top.winfo_reqheight()
+        x = (parent.winfo_screenwidth() // 2) - (w // 2)
+        y = (parent.winfo_screenheight() // 2) - (h // 2)
+        self.top.geometry(f"{w}x{h}+{x}+{y}")
+
+        self.top.protocol("WM_DELETE_WINDOW", self.on_cancel)
+        self.top.grab_set()  # Make it modal
+        if on_done is None:
+            parent.wait_window(self.top)
+
+    def toggle_visibility(self, entry, button):
+        if entry.cget("show") == "*":
+            entry.config(show="")
+            button.config(text="Hide")
+        else:
+            entry.config(show="*")
+            button.config(text="Show")
+
+    def on_ok(self):
+        self.result = {key: entry.get() for key, entry in self.entries.items()}
+        self.close()
 
     def on_cancel(self):
+        self.close()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
         self.top.destroy()
+        if self.on_done is not None:
+            self.on_done(self.result)
+
+# How often an open dialog checks its stop_event
+STOP_EVENT_CHECK_MS = 50
+# Where Tk has no file handlers (Windows), how often the GUI thread checks its queue
+QUEUE_POLL_MS = 20
+# How long a caller waits for the GUI thread to close its cancelled dialog
+CANCEL_TIMEOUT = 2.0
+# How long interpreter exit waits for the GUI thread to destroy its root
+SHUTDOWN_TIMEOUT = 2.0
+
 
-def gui_get_input(message: str, suggestion: str | None = None, hide_input: bool = False) -> Optional[str]:
+class _DialogRequest:
+    """One queued dialog; build(root, on_done) creates it on the GUI thread."""
+    __slots__ = ("build", "future", "cancelled", "dialog")
+
+    def __init__(self, build: Callable):
+        self.build = build
+        self.future: Future = Future()
+        self.cancelled = False
+        self.dialog = None
+
+
+class GuiService:
     """
-    Displays a custom modal GUI popup with an optional Show/Hide toggle.
+    The GUI thread and its request queue. The thread starts with the first request and
+    sleeps in root.mainloop() between dialogs; submit() and cancel() wake it through a
+    socketpair registered as a Tk file handler (polled every QUEUE_POLL_MS without one).
+    """
+
+    def __init__(self):
+        self._queue: "queue.Queue[_DialogRequest]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+        self._wake_r, self._wake_w = socket.socketpair()
+        for sock in (self._wake_r, self._wake_w):
+            sock.setblocking(False)
+        # GUI thread only
+        self._root = None
+        self._current: _DialogRequest | None = None
+        self._quit = False
+        atexit.register(self.shutdown)
+
+    def submit(self, build: Callable) -> _DialogRequest:
+        request = _DialogRequest(build)
+        with self._lock:
+            self._queue.put(request)
+            if self._thread is None:
+                self._start()
+        self._wake()
+        return request
+
+    def cancel(self, request: _DialogRequest):
+        """Closes the dialog (or drops it from the queue); its future resolves to None."""
+        request.cancelled = True
+        self._wake()
+
+    def shutdown(self):
+        with self._lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._stopping = True
+        self._wake()
+        thread.join(SHUTDOWN_TIMEOUT)
+
+    def _start(self):
+        # Called with _lock held. Own context copy, so the gui.start span nests under the ask
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=contextvars.copy_context().run, args=(self._run,),
+            name="dworshak-gui", daemon=True,
+        )
+        self._thread.start()
+
+    def _wake(self):
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            # Buffer full: a wakeup is already pending
+            pass
+
+    def _drain_pending(self, exc: BaseException | None):
+        with self._lock:
+            requests = []
+            while True:
+                try:
+                    requests.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+        for request in requests:
+            if exc is None:
+                request.future.set_result(None)
+            else:
+                request.future.set_exception(exc)
+
+    def _run(self):
+        try:
+            with span("gui.start"):
+                root = tk.Tk()
+                root.withdraw()
+        except Exception as e:
+            logger.debug(f"[DIAGNOSTIC] GUI thread could not create its Tk root: {e!r}")
+            with self._lock:
+                self._thread = None
+            self._drain_pending(e)
+            return
+        # The hidden root must not become the implicit parent of the application's own widgets
+        if getattr(tk, "_default_root", None) is root:
+            tk._default_root = None
+        self._root = root
+        if hasattr(root.tk, "createfilehandler"):
+            root.tk.createfilehandler(self._wake_r, tk.READABLE, self._on_wake)
+        else:
+            root.after(QUEUE_POLL_MS, self._poll)
+
+        try:
+            self._quit = False
+            self._pump()
+            # quit() before mainloop() starts would be forgotten
+            if not self._quit:
+                root.mainloop()
+        finally:
+            current, self._current = self._current, None
+            if current is not None and not current.future.done():
+                current.future.set_result(None)
+            if hasattr(root.tk, "deletefilehandler"):
+                root.tk.deletefilehandler(self._wake_r)
+            self._root = None
+            try:
+                root.destroy()
+            except Exception:
+                pass
+            # Tk objects are released here, on the thread that created them
+            del root, current
+            with self._lock:
+                self._thread = None
+                stopping = self._stopping
+                # Left after a failed dialog: a fresh root takes over
+                if not stopping and not self._queue.empty():
+                    self._start()
+            if stopping:
+                self._drain_pending(None)
+
+    def _on_wake(self, fd, mask):
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except OSError:
+            pass
+        self._pump()
+
+    def _poll(self):
+        self._pump()
+        if self._root is not None:
+            self._root.after(QUEUE_POLL_MS, self._poll)
+
+    def _pump(self):
+        """GUI thread: applies cancellations and shows the next queued dialog once the current one closed."""
+        if self._stopping:
+            self._stop_loop()
+            return
+        current = self._current
+        if current is not None:
+            if current.cancelled:
+                current.dialog.on_cancel()
+            return
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if request.cancelled:
+                request.future.set_result(None)
+                continue
+            try:
+                request.dialog = request.build(self._root, lambda result, r=request: self._finished(r, result))
+            except Exception as e:
+                request.future.set_exception(e)
+                # The root may be unusable (display gone): the next request gets a new one
+                self._stop_loop()
+                return
+            self._current = request
+            return
+
+    def _stop_loop(self):
+        self._quit = True
+        self._root.quit()
+
+    def _finished(self, request: _DialogRequest, result):
+        if self._current is request:
+            self._current = None
+        request.dialog = None
+        if not request.future.done():
+            request.future.set_result(result)
+        self._root.after_idle(self._pump)
+
+
+_service: GuiService | None = None
+_service_lock = threading.Lock()
+
+
+def get_gui_service() -> GuiService:
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = GuiService()
+        return _service
+
+
+def _wait(service: GuiService, request: _DialogRequest, stop_event: threading.Event | None):
+    """Blocks on the dialog's future; setting stop_event closes the dialog and returns None."""
+    future = request.future
+    if stop_event is None:
+        return future.result()
+    cancel = lambda: service.cancel(request)
+    linked = isinstance(stop_event, InterruptEvent)
+    if linked:
+        stop_event.add_callback(cancel)
+    try:
+        while True:
+            try:
+                # An InterruptEvent cancels through its callback; a plain Event is polled
+                return future.result(timeout=None if linked else STOP_EVENT_CHECK_MS / 1000)
+            except FutureTimeout:
+                if stop_event.is_set():
+                    service.cancel(request)
+                    break
+    finally:
+        if linked:
+            stop_event.remove_callback(cancel)
+    try:
+        return future.result(timeout=CANCEL_TIMEOUT)
+    except FutureTimeout:
+        return None
+
+
+def _close_on_stop(root, stop_event: threading.Event | None):
+    """
+    Polls stop_event from inside the Tk event loop (Tk calls must stay on the
+    thread that owns root) and closes every open dialog once it is set.
     """
+    if stop_event is None:
+        return
+    def poll():
+        if stop_event.is_set():
+            for window in root.winfo_children():
+                window.destroy()
+        else:
+            root.after(STOP_EVENT_CHECK_MS, poll)
+    root.after(STOP_EVENT_CHECK_MS, poll)
+
+
+def _show_inline(build: Callable, stop_event: threading.Event | None):
+    """A root of its own on the calling thread, destroyed afterwards (macOS)."""
+    if threading.current_thread() is not threading.main_thread():
+        raise RuntimeError("Tk dialogs can only be shown from the main thread on macOS")
+    root = None
     try:
         root = tk.Tk()
         root.withdraw()
+        _close_on_stop(root, stop_event)
+        return build(root, None).result
+    finally:
+        if root is not None:
+            root.destroy()
 
-        # Use our custom dialog instead of simpledialog
-        dialog = CustomPromptDialog(root, "dworshak-prompt", message, suggestion, hide_input)
-        
-        return dialog.result
 
-    finally:
-        root.destroy()
\ No newline at end of file
+def _show(build: Callable, stop_event: threading.Event | None):
+    if sys.platform == "darwin":
+        return _show_inline(build, stop_event)
+    service = get_gui_service()
+    return _wait(service, service.submit(build), stop_event)
+
+
+def gui_get_input(message: str, suggestion: str | None = None, hide_input: bool = False, stop_event: threading.Event | None = None) -> Optional[str]:
+    """
+    Displays a custom modal GUI popup with an optional Show/Hide toggle.
+    Setting stop_event closes the dialog and returns None.
+    """
+    return _show(
+        lambda root, on_done: CustomPromptDialog(root, "dworshak-prompt", message, suggestion, hide_input, on_done=on_done),
+        stop_event,
+    )
+
+
+def gui_get_many_input(fields: List[PromptField], message: str | None = None, stop_event: threading.Event | None = None) -> Optional[Dict[str, str]]:
+    """
+    Displays one modal GUI window collecting every field. Returns None if cancelled
+    or if stop_event is set.
+    """
+    return _show(
+        lambda root, on_done: CustomMultiPromptDialog(root, "dworshak-prompt", fields, message, on_done=on_done),
+        stop_event,
+    )
@@ -1,4 +1,40 @@
 # src/dworshak_prompt/keyboard_interrupt.py
+from __future__ import annotations
+import threading
+from typing import Callable, List
+
 class PromptCancelled(Exception):
     """User explicitly cancelled or interrupted the input."""
-    pass
\ No newline at end of file
+    pass
+
+class InterruptEvent(threading.Event):
+    """
+    threading.Event that also runs registered callbacks when set.
+    Lets blocking waits (e.g. PromptManager.wait_for_result) wake the instant
+    an interrupt fires, without polling the event.
+    """
+    def __init__(self):
+        super().__init__()
+        self._callbacks: List[Callable[[], None]] = []
+        self._callbacks_lock = threading.Lock()
+
+    def set(self):
+        super().set()
+        with self._callbacks_lock:
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            callback()
+
+    def add_callback(self, callback: Callable[[], None]):
+        """Registers callback; runs it immediately if the event is already set."""
+        with self._callbacks_lock:
+            self._callbacks.append(callback)
+        if self.is_set():
+            callback()
+
+    def remove_callback(self, callback: Callable[[], None]):
+        with self._callbacks_lock:
+            try:
+                self._callbacks.remove(callback)
+            except ValueError:
+                pass
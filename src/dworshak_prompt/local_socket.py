@@ -0,0 +1,162 @@
+# src/dworshak_prompt/local_socket.py
+"""
+Unix domain socket plumbing shared by the prompt broker and the value agent.
+
+Sockets live in a per-user runtime directory (mode 0700, created by the listening
+side) and are created 0600, so only the owning user can connect. Clients refuse a
+socket in that directory when the directory is not private to them. Messages are JSON objects, one per line.
+
+    DWORSHAK_PROMPT_RUNTIME_DIR=<dir>   Socket directory (default $XDG_RUNTIME_DIR/dworshak-prompt,
+                                        else <tmp>/dworshak-prompt-<uid>)
+"""
+from __future__ import annotations
+import json
+import os
+import socket
+import stat
+
+# Kept light (no pathlib/tempfile/logging at import): the agent's CLI fast path imports this
+
+# A peer sending a longer line than this is disconnected
+MAX_MESSAGE_BYTES = 1 << 20
+
+
+def supported() -> bool:
+    return hasattr(socket, "AF_UNIX")
+
+
+def runtime_dir_path() -> str:
+    """The per-user socket directory's path; nothing is created or checked."""
+    base = os.getenv("DWORSHAK_PROMPT_RUNTIME_DIR")
+    if base:
+        return os.path.expanduser(base)
+    if os.getenv("XDG_RUNTIME_DIR"):
+        return os.path.join(os.environ["XDG_RUNTIME_DIR"], "dworshak-prompt")
+    import tempfile
+    return os.path.join(tempfile.gettempdir(), f"dworshak-prompt-{os.getuid()}")
+
+
+def _check_private(path: str):
+    info = os.stat(path)
+    if info.st_uid != os.getuid() or info.st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+        raise PermissionError(f"{path} must be owned by the current user and not accessible to others")
+
+
+def runtime_dir() -> str:
+    """The per-user socket directory, created 0700 and checked to belong to this user."""
+    path = runtime_dir_path()
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    _check_private(path)
+    return path
+
+
+def socket_path(env_var: str, filename: str) -> str:
+    """
+    `env_var` if set, otherwise <runtime_dir>/<filename>. Only builds the path: clients
+    call this on every prompt, and the directory is created by listen().
+    """
+    explicit = os.getenv(env_var)
+    if explicit:
+        return os.path.expanduser(explicit)
+    return os.path.join(runtime_dir_path(), filename)
+
+
+def _in_runtime_dir(path: str) -> bool:
+    return os.path.dirname(os.path.abspath(path)) == os.path.abspath(runtime_dir_path())
+
+
+def trusted(path: str) -> bool:
+    """
+    False for a socket in the default runtime directory when that directory is not
+    private to this user (e.g. someone else created it under /tmp first). Explicitly
+    configured paths are the caller's responsibility.
+    """
+    if not _in_runtime_dir(path):
+        return True
+    try:
+        _check_private(os.path.dirname(os.path.abspath(path)))
+    except OSError:
+        return False
+    return True
+
+
+def listen(path: str) -> socket.socket:
+    """
+    Binds a 0600 listening socket at path. A stale socket file (nobody listening) is
+    replaced; a live one raises OSError, so two daemons never share a path.
+    """
+    path = str(path)
+    if _in_runtime_dir(path):
+        runtime_dir()
+    if os.path.exists(path):
+        probe = connect(path, timeout=0.5)
+        if probe is not None:
+            probe.close()
+            raise OSError(f"Something is already listening on {path}")
+        os.unlink(path)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)
+    try:
+        server.bind(path)
+    except BaseException:
+        server.close()
+        raise
+    finally:
+        os.umask(old_umask)
+    os.chmod(path, 0o600)
+    server.listen(socket.SOMAXCONN)
+    return server
+
+
+def connect(path: str, timeout: float | None = 5.0) -> socket.socket | None:
+    """Connected socket, or None when nothing (trusted) listens at path."""
+    if not supported() or not trusted(str(path)):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def encode(message: dict) -> bytes:
+    return json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+class LineReader:
+    """Splits a byte stream into JSON messages."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def feed(self, data: bytes):
+        self.buffer.extend(data)
+        if len(self.buffer) > MAX_MESSAGE_BYTES and b"\n" not in self.buffer:
+            raise ValueError("Message too long")
+
+    def next_message(self) -> object:
+        """The next complete message, or None until more data arrives."""
+        while True:
+            end = self.buffer.find(b"\n")
+            if end < 0:
+                return None
+            line = bytes(self.buffer[:end])
+            del self.buffer[:end + 1]
+            if line.strip():
+                return json.loads(line)
+
+
+def read_message(sock: socket.socket, reader: LineReader) -> object:
+    """Blocking read of the next message on sock; None at EOF."""
+    while True:
+        message = reader.next_message()
+        if message is not None:
+            return message
+        data = sock.recv(65536)
+        if not data:
+            return None
+        reader.feed(data)
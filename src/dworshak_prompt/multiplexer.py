@@ -1,26 +1,21 @@
 # src/dworshak_prompt/multiplexer.py
 from __future__ import annotations
-import pyhabitat as ph
 from enum import Enum
-from typing import Set, Any
+from typing import Set, Any, Callable, Dict, Iterable
+import contextvars
+import functools
+import queue
 import threading
 import traceback
 import sys
 import logging
 
-try:
-    from .console_prompt import console_get_input
-except ImportError:
-    from .console_prompt_stdlib import console_get_input_stdlib as console_get_input
-    
-if ph.tkinter_is_available():
-    from .gui_prompt import gui_get_input
-else:
-    gui_get_input = None
-from .web_prompt import browser_get_input
-from .keyboard_interrupt import PromptCancelled
-from .server import stop_prompt_server
-from .prompt_manager import PromptManager
+# Backends (console, GUI, web/server) and asyncio are imported lazily, when a mode is
+# actually attempted, to keep `import dworshak_prompt.multiplexer` cheap.
+from .keyboard_interrupt import PromptCancelled, InterruptEvent
+from .capabilities import get_capabilities
+from .prompt_field import PromptField, FieldSpec, normalize_fields
+from .timing import span
     
 # Setup logger
 logger = logging.getLogger("dworshak_prompt")
@@ -33,6 +28,21 @@ if not logger.handlers:
     logger.addHandler(_handler)
 
 
+def _console_get_input(*args, **kwargs) -> str:
+    """Typer/rich console backend, or the stdlib one when those extras are missing."""
+    try:
+        from .console_prompt import console_get_input
+    except ImportError:
+        from .console_prompt_stdlib import console_get_input_stdlib as console_get_input
+    return console_get_input(*args, **kwargs)
+
+
+# ask(strategy=...): try modes one after another, or all at once (first answer wins)
+STRATEGIES = ("fallback", "race")
+# How often a race re-checks a plain threading.Event interrupt, and how long it waits for losers to clean up
+STOP_EVENT_CHECK_INTERVAL = 0.05
+RACE_CLEANUP_TIMEOUT = 2.0
+
 class PromptMode(Enum):
     CONSOLE = "console"
     GUI = "gui"
@@ -61,37 +71,427 @@ class DworshakPrompt:
         interrupt_event: threading.Event | None = None,
         debug: bool = False,  # Added a flag to toggle at runtime
         timeout: int | float | None = None,
+        strategy: str = "fallback",
+    ) -> str | None:
+        """
+        Prompts for one value. strategy="fallback" tries the modes one after another;
+        strategy="race" shows the prompt on every available mode at once and returns
+        the first answer (see _race).
+        When `timeout` seconds pass without an answer, every backend withdraws its
+        prompt and `default` is returned.
+        """
+
+        attempt = functools.partial(
+            self._attempt_one,
+            message = message,
+            suggestion = suggestion,
+            hide_input = hide_input,
+        )
+        return self._multiplex(
+            attempt,
+            default = default,
+            priority = priority,
+            avoid = avoid,
+            interrupt_event = interrupt_event,
+            debug = debug,
+            timeout = timeout,
+            strategy = strategy,
+        )
+
+    async def ask_async(
+        self,
+        message: str = "Enter value",
+        suggestion: str | None = None,
+        default: Any | None = None,
+        hide_input: bool = False,
+        priority: list[PromptMode] | None = None,
+        avoid: set[PromptMode] | None = None,
+        debug: bool = False,
+        timeout: int | float | None = None,
     ) -> str | None:
+        """
+        Coroutine version of ask() that never blocks the event loop.
+        WEB awaits a future completed by the prompt server; CONSOLE and GUI run in the
+        default executor. Cancel the awaiting task to abandon the prompt; on `timeout`
+        the prompt is abandoned the same way and `default` is returned.
+        """
+        import asyncio
+        from .web_prompt import browser_get_input_async
+        from .prompt_manager import get_shared_manager
+
+        if timeout:
+            try:
+                return await asyncio.wait_for(
+                    self.ask_async(message, suggestion, default, hide_input, priority, avoid, debug),
+                    timeout,
+                )
+            except asyncio.TimeoutError:
+                return default
+
+        loop = asyncio.get_running_loop()
+        with span("ask", api="async") as total:
+            with span("capabilities"):
+                # The first call may have to probe; keep that off the loop
+                await loop.run_in_executor(None, get_capabilities)
+                modes = self._plan_modes(priority, avoid, debug)
+            if modes is None:
+                total.set(outcome="default")
+                return default
+            total.set(modes=[m.value for m in modes])
+
+            interrupt_event = InterruptEvent()
+            for mode in modes:
+                logger.debug(f"\n[DIAGNOSTIC] === Entering Mode: {mode} ===")
+                with span("mode", mode=mode.value) as attempt_span:
+                    try:
+                        if mode == PromptMode.WEB:
+                            # Holds the prompt server only while the prompt is open
+                            val = await browser_get_input_async(
+                                message,
+                                suggestion,
+                                hide_input,
+                                manager = get_shared_manager(),
+                                )
+                            if val is None:
+                                logger.debug(f"[DIAGNOSTIC] WEB returned None. Raising PromptCancelled.")
+                                raise PromptCancelled()
+                        else:
+                            val = await loop.run_in_executor(None, functools.partial(
+                                self._attempt_one, mode, interrupt_event,
+                                message = message, suggestion = suggestion, hide_input = hide_input,
+                            ))
+                        logger.debug(f"[DIAGNOSTIC] SUCCESS: {mode} returned: {repr(val)}")
+                        attempt_span.set(outcome="answered")
+                        total.set(mode=mode.value, outcome="answered")
+                        return val
+
+                    except asyncio.CancelledError:
+                        interrupt_event.set()
+                        attempt_span.set(outcome="cancelled", reason="CancelledError")
+                        total.set(mode=mode.value, outcome="cancelled")
+                        raise
+                    except BaseException as e:
+                        if self._is_stop_signal(e, interrupt_event):
+                            attempt_span.set(outcome="cancelled", reason=type(e).__name__)
+                            total.set(mode=mode.value, outcome="cancelled")
+                            return None
+                        attempt_span.set(outcome="fell_through", reason=repr(e))
+                        continue
+
+            logger.debug("[DIAGNOSTIC] All modes exhausted.")
+            total.set(outcome="exhausted")
+            raise RuntimeError("No input method succeeded.")
+
+    def _attempt_one(
+        self,
+        mode: PromptMode,
+        interrupt_event: threading.Event,
+        message: str,
+        suggestion: str | None,
+        hide_input: bool,
+    ) -> str:
+        """Runs one backend for a single value (see _multiplex for the contract)."""
+        if mode == PromptMode.CONSOLE:
+            return _console_get_input(message = message, suggestion = suggestion, hide_input = hide_input, stop_event = interrupt_event)
+
+        elif mode == PromptMode.GUI:
+            from .gui_prompt import gui_get_input
+            val = gui_get_input(message = message, suggestion = suggestion, hide_input = hide_input, stop_event = interrupt_event)
+            if val is not None:
+                return val
+            logger.debug(f"[DIAGNOSTIC] GUI cancelled. Raising PromptCancelled.")
+            raise PromptCancelled()
+
+        elif mode == PromptMode.WEB:
+            from .web_prompt import browser_get_input
+            from .prompt_manager import get_shared_manager
+            local_manager = get_shared_manager()
+            # Holds the prompt server only while the prompt is open (see release_prompt_server)
+            val = browser_get_input(
+                message, 
+                suggestion, 
+                hide_input, 
+                manager = local_manager, 
+                stop_event = interrupt_event
+                )
+            if val is not None:
+                return val
+            logger.debug(f"[DIAGNOSTIC] WEB returned None. Raising PromptCancelled.")
+            raise PromptCancelled()
+
+    def ask_many(
+        self,
+        fields: Iterable[FieldSpec],
+        message: str | None = None,
+        priority: list[PromptMode] | None = None,
+        avoid: set[PromptMode] | None = None,
+        interrupt_event: threading.Event | None = None,
+        debug: bool = False,
+        timeout: int | float | None = None,
+        strategy: str = "fallback",
+    ) -> Dict[str, Any] | None:
+        """
+        Collects several values in a single interaction per backend:
+        one GUI window, one web page, or sequential console prompts.
+        strategy works as in ask().
+
+        `fields` accepts PromptField objects, dicts of PromptField kwargs, or bare keys.
+        Returns {key: value}, per-field defaults in CI/non-interactive environments,
+        or None if the user cancelled.
+        """
+        fields = normalize_fields(fields)
+        if not fields:
+            return {}
+
+        def attempt(mode: PromptMode, interrupt_event: threading.Event):
+            if mode == PromptMode.CONSOLE:
+                if message:
+                    print(message)
+                return {
+                    f.key: _console_get_input(message = f.label, suggestion = f.suggestion, hide_input = f.hide_input, stop_event = interrupt_event)
+                    for f in fields
+                }
+
+            elif mode == PromptMode.GUI:
+                from .gui_prompt import gui_get_many_input
+                values = gui_get_many_input(fields, message = message, stop_event = interrupt_event)
+                if values is not None:
+                    return values
+                logger.debug(f"[DIAGNOSTIC] GUI cancelled. Raising PromptCancelled.")
+                raise PromptCancelled()
+
+            elif mode == PromptMode.WEB:
+                from .web_prompt import browser_get_many_input
+                from .prompt_manager import get_shared_manager
+                local_manager = get_shared_manager()
+                values = browser_get_many_input(
+                    fields,
+                    message = message,
+                    manager = local_manager,
+                    stop_event = interrupt_event
+                    )
+                if values is not None:
+                    return values
+                logger.debug(f"[DIAGNOSTIC] WEB returned None. Raising PromptCancelled.")
+                raise PromptCancelled()
+
+        return self._multiplex(
+            attempt,
+            default = {f.key: f.default for f in fields},
+            priority = priority,
+            avoid = avoid,
+            interrupt_event = interrupt_event,
+            debug = debug,
+            timeout = timeout,
+            strategy = strategy,
+            span_name = "ask_many",
+        )
+
+    def _multiplex(
+        self,
+        attempt: Callable[[PromptMode, threading.Event], Any],
+        default: Any | None = None,
+        priority: list[PromptMode] | None = None,
+        avoid: set[PromptMode] | None = None,
+        interrupt_event: threading.Event | None = None,
+        debug: bool = False,
+        timeout: int | float | None = None,
+        strategy: str = "fallback",
+        span_name: str = "ask",
+    ) -> Any:
+        """
+        The fallback engine shared by ask() and ask_many().
+        `attempt(mode, interrupt_event)` runs one backend and returns its value,
+        raises PromptCancelled on a user cancel, or raises anything else to fall through.
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f"strategy must be one of {STRATEGIES}, got {strategy!r}")
+
+        with span(span_name, strategy=strategy) as total:
+            with span("capabilities"):
+                modes = self._plan_modes(priority, avoid, debug)
+            if modes is None:
+                total.set(outcome="default")
+                return default
+            total.set(modes=[m.value for m in modes])
+
+            # Use existing interrupt_event or create a local one for this call
+            # (InterruptEvent wakes blocking waits instantly when set)
+            if interrupt_event is None:
+                interrupt_event = InterruptEvent()
+
+            deadline = None
+            if timeout:
+                # One shared scheduler thread fires the interrupt; cancelled when the ask ends
+                from .deadlines import schedule_deadline
+                deadline = schedule_deadline(timeout, interrupt_event.set)
+
+            try:
+                if strategy == "race" and len(modes) > 1:
+                    return self._race(attempt, modes, interrupt_event, total, default, deadline)
+
+                for mode in modes:
+                    logger.debug(f"\n[DIAGNOSTIC] === Entering Mode: {mode} ===")
+
+                    with span("mode", mode=mode.value) as attempt_span:
+                        try:
+                            val = attempt(mode, interrupt_event)
+                            logger.debug(f"[DIAGNOSTIC] SUCCESS: {mode} returned: {repr(val)}")
+                            attempt_span.set(outcome="answered")
+                            total.set(mode=mode.value, outcome="answered")
+                            return val
+
+                        except BaseException as e:
+                            if self._is_stop_signal(e, interrupt_event):
+                                attempt_span.set(outcome="cancelled", reason=type(e).__name__)
+                                total.set(mode=mode.value)
+                                return self._stopped(total, default, deadline)
+                            attempt_span.set(outcome="fell_through", reason=repr(e))
+                            continue
+
+                logger.debug("[DIAGNOSTIC] All modes exhausted.")
+                total.set(outcome="exhausted")
+                raise RuntimeError("No input method succeeded.")
+
+            finally:
+                if deadline is not None:
+                    deadline.cancel()
+
+    @staticmethod
+    def _stopped(total, default: Any, deadline) -> Any:
+        """Result of a stopped ask: `default` when its deadline expired, None for a user cancel."""
+        if deadline is not None and deadline.expired:
+            logger.debug("[DIAGNOSTIC] Deadline expired. Returning default.")
+            total.set(outcome="timeout")
+            return default
+        total.set(outcome="cancelled")
+        return None
+
+    def _race(
+        self,
+        attempt: Callable[[PromptMode, threading.Event], Any],
+        modes: list[PromptMode],
+        interrupt_event: threading.Event,
+        total,
+        default: Any = None,
+        deadline=None,
+    ) -> Any:
+        """
+        strategy="race": every mode runs at once on its own thread, each with its own
+        InterruptEvent. The first answer wins; the others are interrupted and their
+        threads joined (web withdraws its prompt, GUI closes its dialog).
+        An explicit cancel in any backend (GUI Cancel, Ctrl-C) ends the whole race;
+        a backend that merely fails (no display, stdin closed) drops out of it.
+        The console read is withdrawn too, except where stdin isn't selectable
+        (e.g. Windows consoles; see console_reader).
+        """
+        results: queue.Queue = queue.Queue()
+        mode_events = {mode: InterruptEvent() for mode in modes}
+
+        def run(mode: PromptMode):
+            with span("mode", mode=mode.value) as attempt_span:
+                try:
+                    val = attempt(mode, mode_events[mode])
+                except BaseException as e:
+                    attempt_span.set(outcome="dropped", reason=repr(e))
+                    results.put((mode, e, None))
+                else:
+                    attempt_span.set(outcome="returned")
+                    results.put((mode, None, val))
+
+        # An InterruptEvent wakes the wait below the instant it is set; a plain Event is polled
+        wake = lambda: results.put(None)
+        linked = isinstance(interrupt_event, InterruptEvent)
+        if linked:
+            interrupt_event.add_callback(wake)
+
+        threads = []
+        for mode in modes:
+            # Each thread gets its own context copy so its spans nest under this ask
+            thread = threading.Thread(
+                target=contextvars.copy_context().run, args=(run, mode),
+                name=f"dworshak-race-{mode.value}", daemon=True,
+            )
+            thread.start()
+            threads.append((mode, thread))
+
+        try:
+            pending = len(modes)
+            while pending:
+                try:
+                    item = results.get(timeout=None if linked else STOP_EVENT_CHECK_INTERVAL)
+                except queue.Empty:
+                    item = None
+                if item is None:
+                    if interrupt_event.is_set():
+                        return self._stopped(total, default, deadline)
+                    continue
+
+                pending -= 1
+                mode, error, val = item
+                if error is None:
+                    logger.debug(f"[DIAGNOSTIC] RACE won by {mode}: {repr(val)}")
+                    total.set(mode=mode.value, outcome="answered")
+                    return val
+                if isinstance(error, (PromptCancelled, KeyboardInterrupt)) or type(error).__name__ == "Abort":
+                    logger.debug(f"[DIAGNOSTIC] RACE cancelled in {mode}.")
+                    total.set(mode=mode.value)
+                    return self._stopped(total, default, deadline)
+                logger.debug(f"[DIAGNOSTIC] RACE: {mode} dropped out: {error!r}")
+
+            logger.debug("[DIAGNOSTIC] All modes exhausted.")
+            total.set(outcome="exhausted")
+            raise RuntimeError("No input method succeeded.")
 
+        except KeyboardInterrupt:
+            total.set(outcome="cancelled")
+            return None
+
+        finally:
+            if linked:
+                interrupt_event.remove_callback(wake)
+            for event in mode_events.values():
+                event.set()
+            for mode, thread in threads:
+                thread.join(RACE_CLEANUP_TIMEOUT)
+
+    def _plan_modes(
+        self,
+        priority: list[PromptMode] | None,
+        avoid: set[PromptMode] | None,
+        debug: bool,
+    ) -> list[PromptMode] | None:
+        """
+        Resolves priority/avoid against the capability snapshot.
+        Returns the modes to try in order, or None when the caller should return its default.
+        """
         if priority is None:
             priority = self.default_priority
         if avoid is None:
             avoid = self.default_avoid
 
-        # Use existing interrupt_event or create a local one for this call
-        if interrupt_event is None:
-            interrupt_event = threading.Event()
-
         if debug:
             logger.setLevel(logging.DEBUG)
         else:
             logger.setLevel(logging.WARNING)
 
+        # Probed once per process; see capabilities.invalidate_capabilities()
+        caps = get_capabilities()
+
         # 1. CI/Headless Detection
         # If we aren't in a TTY and aren't on a system that can spawn a GUI/Web window,
         # return the default immediately to avoid the "Time Bomb."
-        if ph.is_likely_ci_or_non_interactive():
+        if caps.non_interactive:
             logger.debug("[DIAGNOSTIC] CI/Non-interactive environment. Returning default.")
-            return default
+            return None
 
-        if not ph.interactive_terminal_is_available() and \
-        not ph.tkinter_is_available() and \
-        not ph.is_browser_available(): # Hypothetical pyhabitat check
+        if not caps.any_interactive:
             logger.debug("[DIAGNOSTIC] Non-interactive environment detected. Using default.")
-            return default
+            return None
 
-        avoid = avoid or set()
-        if ph.on_wsl():
+        # Copy, so the caller's set (or self.default_avoid) isn't mutated
+        avoid = set(avoid or ())
+        if caps.wsl:
             avoid.add(PromptMode.GUI)
 
         default_order = [PromptMode.CONSOLE, PromptMode.GUI, PromptMode.WEB]
@@ -101,89 +501,51 @@ class DworshakPrompt:
         else:
             effective_priority = default_order
 
-        if timeout:
-            # A background timer to fire the interrupt signal
-            timer = threading.Timer(timeout, lambda: interrupt_event.set())
-            timer.start()
-
+        modes = []
         for mode in effective_priority:
             if mode in avoid:
                 logger.debug(f"[DIAGNOSTIC] Skipping {mode} (avoided)")
                 continue
-
-            logger.debug(f"\n[DIAGNOSTIC] === Entering Mode: {mode} ===")
-            
-            try:
-                if mode == PromptMode.CONSOLE:
-                    if not ph.interactive_terminal_is_available():
-                        logger.debug(f"[DIAGNOSTIC] {mode} skipped: No interactive terminal.")
-                        continue
-                    
-                    val = console_get_input(message = message, suggestion = suggestion, hide_input = hide_input)
-                    logger.debug(f"[DIAGNOSTIC] SUCCESS: {mode} returned: {repr(val)}")
-                    return val
-
-                elif mode == PromptMode.GUI:
-                    if not ph.tkinter_is_available():
-                        logger.debug(f"[DIAGNOSTIC] {mode} skipped: Tkinter unavailable.")
-                        continue
-                        
-                    val = gui_get_input(message = message, suggestion = suggestion, hide_input = hide_input)
-                    if val is not None:
-                        logger.debug(f"[DIAGNOSTIC] SUCCESS: {mode} returned: {repr(val)}")
-                        return val
-                    
-                    logger.debug(f"[DIAGNOSTIC] GUI cancelled. Raising PromptCancelled.")
-                    raise PromptCancelled()
-
-                elif mode == PromptMode.WEB:
-                    local_manager = PromptManager()
-                    try:
-                        val = browser_get_input(
-                            message, 
-                            suggestion, 
-                            hide_input, 
-                            manager = local_manager, 
-                            stop_event = interrupt_event
-                            )
-                        if val is not None:
-                            logger.debug(f"[DIAGNOSTIC] SUCCESS: {mode} returned: {repr(val)}")
-                            return val
-                        logger.debug(f"[DIAGNOSTIC] WEB returned None. Raising PromptCancelled.")
-                        raise PromptCancelled()
-                    finally:
-                        stop_prompt_server()
-
-            except BaseException as e:
-                exc_type = type(e)
-                exc_name = exc_type.__name__
-                exc_module = exc_type.__module__
-                
-                logger.debug(f"[DIAGNOSTIC] !!! EXCEPTION TRIGGERED !!!")
-                logger.debug(f"[DIAGNOSTIC] Class Name: {exc_name}")
-                logger.debug(f"[DIAGNOSTIC] Full Path:  {exc_module}.{exc_name}")
-                logger.debug(f"[DIAGNOSTIC] Repr:       {repr(e)}")
-                logger.debug(f"[DIAGNOSTIC] Args:       {e.args}")
-
-                stop_signals = {"KeyboardInterrupt", "Abort", "SystemExit", "EOFError", "PromptCancelled"}
-                
-                if exc_name in stop_signals or isinstance(e, (KeyboardInterrupt, PromptCancelled)):
-                    logger.debug(f"[DIAGNOSTIC] >>> MATCHED STOP SIGNAL: {exc_name}. EXITING FUNCTION.")
-                    if interrupt_event:
-                        interrupt_event.set()
-                    return None
-
-                # For technical failures, we log the traceback at DEBUG level
-                logger.debug(f"[DIAGNOSTIC] >>> TECHNICAL FAILURE detected. Investigating traceback...")
-                if logger.isEnabledFor(logging.DEBUG):
-                    traceback.print_exc(file=sys.stdout)
-                
-                logger.debug(f"[DIAGNOSTIC] Continuing to fallback mode...")
+            if mode == PromptMode.CONSOLE and not caps.interactive_terminal:
+                logger.debug(f"[DIAGNOSTIC] {mode} skipped: No interactive terminal.")
+                continue
+            if mode == PromptMode.GUI and not caps.tkinter:
+                logger.debug(f"[DIAGNOSTIC] {mode} skipped: Tkinter unavailable.")
                 continue
+            modes.append(mode)
+        return modes
+
+    @staticmethod
+    def _is_stop_signal(e: BaseException, interrupt_event: threading.Event | None) -> bool:
+        """
+        Logs a backend exception. Returns True for a user stop (the ask returns None),
+        False for a technical failure (fall through to the next mode).
+        """
+        exc_type = type(e)
+        exc_name = exc_type.__name__
+        exc_module = exc_type.__module__
+        
+        logger.debug(f"[DIAGNOSTIC] !!! EXCEPTION TRIGGERED !!!")
+        logger.debug(f"[DIAGNOSTIC] Class Name: {exc_name}")
+        logger.debug(f"[DIAGNOSTIC] Full Path:  {exc_module}.{exc_name}")
+        logger.debug(f"[DIAGNOSTIC] Repr:       {repr(e)}")
+        logger.debug(f"[DIAGNOSTIC] Args:       {e.args}")
 
+        stop_signals = {"KeyboardInterrupt", "Abort", "SystemExit", "EOFError", "PromptCancelled"}
+        
+        if exc_name in stop_signals or isinstance(e, (KeyboardInterrupt, PromptCancelled)):
+            logger.debug(f"[DIAGNOSTIC] >>> MATCHED STOP SIGNAL: {exc_name}. EXITING FUNCTION.")
+            if interrupt_event:
+                interrupt_event.set()
+            return True
 
-        logger.debug("[DIAGNOSTIC] All modes exhausted.")
-        raise RuntimeError("No input method succeeded.")
+        # For technical failures, we log the traceback at DEBUG level
+        logger.debug(f"[DIAGNOSTIC] >>> TECHNICAL FAILURE detected. Investigating traceback...")
+        if logger.isEnabledFor(logging.DEBUG):
+            traceback.print_exception(exc_type, e, e.__traceback__, file=sys.stdout)
+        
+        logger.debug(f"[DIAGNOSTIC] Continuing to fallback mode...")
+        return False
 
 def dworshak_ask(
     message: str = "Enter value",
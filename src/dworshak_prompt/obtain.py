@@ -2,12 +2,21 @@
 from pathlib import Path
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, Any
+from contextlib import contextmanager
+from typing import Optional, Any, Dict, Iterable, Iterator, List, Tuple
+import functools
+import logging
+import os
 import sys
 
-from dworshak_config import DworshakConfig
-from dworshak_env import DworshakEnv
+from .store_cache import get_config_store, get_env_store
+from .secret_cache import get_secret_cache
+from .write_buffer import WriteBuffer, ON_ERROR_POLICIES
 from .multiplexer import DworshakPrompt
+from .prompt_field import PromptField
+from .timing import span, timed
+
+logger = logging.getLogger("dworshak_prompt")
 
 class StoreMode(Enum):
     CONFIG = "config"
@@ -41,6 +50,98 @@ class DworshakObtain:
         self.config_path = config_path
         self.secret_path = secret_path
         self.env_path = env_path
+        self._buffer: WriteBuffer | None = None  # Set inside session()
+
+    @classmethod
+    @contextmanager
+    def session(
+        cls,
+        config_path: str | Path | None = None,
+        secret_path: str | Path | None = None,
+        env_path: str | Path | None = None,
+        on_error: str = "discard",
+    ) -> Iterator["DworshakObtain"]:
+        """
+        Buffers every new value obtained inside the block and writes each touched
+        store once on exit: `with DworshakObtain.session() as s: s.config(...)`.
+        Config and .env files are replaced atomically (temp file + fsync + rename).
+        If the block raises, on_error="discard" drops the buffered values and
+        on_error="keep" flushes them before the exception propagates.
+        """
+        if on_error not in ON_ERROR_POLICIES:
+            raise ValueError(f"on_error must be one of {ON_ERROR_POLICIES}, got {on_error!r}")
+        obtain = cls(config_path=config_path, secret_path=secret_path, env_path=env_path)
+        obtain._buffer = buffer = WriteBuffer()
+        try:
+            yield obtain
+        except BaseException:
+            if on_error == "keep":
+                with span("session.flush", values=len(buffer), on_error="keep"):
+                    buffer.flush(_write_secret)
+            else:
+                logger.debug(f"[DIAGNOSTIC] Session raised; discarding {len(buffer)} buffered value(s).")
+                buffer.clear()
+            raise
+        else:
+            with span("session.flush", values=len(buffer)):
+                buffer.flush(_write_secret)
+        finally:
+            obtain._buffer = None
+
+    # Store access for the single-value methods goes through these, so a session can buffer
+    # writes and a running value agent (agent.py) can answer secret lookups first.
+    # Config/.env lookups stay local: the cached stores answer faster than a socket round trip.
+
+    def _config_get(self, config_mgr, service: str, item: str):
+        if self._buffer is not None:
+            value = self._buffer.config_get(config_mgr, service, item)
+            if value is not None:
+                return value
+        with span("store.lookup", store="config"):
+            return config_mgr.get(service, item)
+
+    def _config_set(self, config_mgr, service: str, item: str, value, overwrite: bool):
+        if self._buffer is not None:
+            self._buffer.config_set(config_mgr, service, item, value, overwrite)
+        else:
+            with span("store.persist", store="config"):
+                config_mgr.set(service, item, value, overwrite=overwrite)
+
+    def _env_get(self, env_mgr, key: str):
+        if self._buffer is not None:
+            value = self._buffer.env_get(env_mgr, key)
+            if value is not None:
+                return value
+        with span("store.lookup", store="env"):
+            return env_mgr.get(key)
+
+    def _env_set(self, env_mgr, key: str, value: str, overwrite: bool):
+        if self._buffer is not None:
+            self._buffer.env_set(env_mgr, key, value, overwrite)
+        else:
+            with span("store.persist", store="env"):
+                env_mgr.set(key, value, overwrite=overwrite)
+
+    def _secret_get(self, service: str, item: str):
+        # The secret backend is only imported when neither the session nor the agent has the value
+        if self._buffer is not None:
+            value = self._buffer.secret_get(service, item)
+            if value is not None:
+                return value
+        value = _agent_lookup("secret", service=service, item=item)
+        if value is not None:
+            return value
+        get_secret, _ = _import_secret_backend()
+        with span("store.lookup", store="secret"):
+            return _read_secret(get_secret, service, item)
+
+    def _secret_set(self, service: str, item: str, value: str, overwrite: bool):
+        _, store_secret = _import_secret_backend()
+        if self._buffer is not None:
+            self._buffer.secret_set(store_secret, service, item, value, overwrite)
+        else:
+            with span("store.persist", store="secret"):
+                _write_secret(store_secret, service, item, value, overwrite=overwrite)
 
     def ask(self, *args, **kwargs):
         """Proxy to the multiplexer for direct questions."""
@@ -48,7 +149,15 @@ class DworshakObtain:
             config_path=self.config_path, 
             secret_path=self.secret_path
         ).ask(*args, **kwargs)
+
+    async def ask_async(self, *args, **kwargs):
+        """Proxy to DworshakPrompt.ask_async()."""
+        return await DworshakPrompt(
+            config_path=self.config_path, 
+            secret_path=self.secret_path
+        ).ask_async(*args, **kwargs)
     
+    @timed("obtain.config", "service", "item")
     def config(
         self,
         service: str, 
@@ -64,8 +173,8 @@ class DworshakObtain:
         if path is None:
             path = self.config_path
             
-        config_mgr = DworshakConfig(path = path)
-        value = config_mgr.get(service, item)
+        config_mgr = get_config_store(path)
+        value = self._config_get(config_mgr, service, item)
 
         # Logic: If it exists and we aren't forcing a refresh, return it.
         if value is not None and not overwrite:
@@ -81,10 +190,11 @@ class DworshakObtain:
 
         # Persistence logic
         if new_value is not None and not forget:
-            config_mgr.set(service, item, new_value, overwrite=overwrite)
+            self._config_set(config_mgr, service, item, new_value, overwrite)
             
         return new_value if new_value is not None else value
 
+    @timed("obtain.secret", "service", "item")
     def secret(
         self,
         service: str, 
@@ -100,22 +210,9 @@ class DworshakObtain:
 
         if path is None:
             path = self.secret_path
-            
-        try:
-            # Lazy Import dworshak_secret here to avoid top-level crashes
-            import cryptography
-            from dworshak_secret import DworshakSecret, get_secret, store_secret
-        except:
-            # Trigger the "Lifeboat" redirection error
-            from memphisdrip import safe_notify
-            from .messages import notify_missing_function_redirect, MSG_CRYPTO_EXTRA
-            # We pass a specific context so the user knows why it failed
-            full_msg = notify_missing_function_redirect("DworshakObtain.secret()") + MSG_CRYPTO_EXTRA
-            safe_notify(full_msg)
-            raise SystemExit(1)
-        
+
         # Similar logic for secrets, but using dworshak-secret
-        value = get_secret(service, item)
+        value = self._secret_get(service, item)
         if value is not None and not overwrite:
             return SecretData(value = value, is_new = False)
         
@@ -130,9 +227,10 @@ class DworshakObtain:
             return SecretData(value=None, is_new=None)
         
         if not forget:
-            store_secret(service, item, new_value, overwrite=overwrite)
+            self._secret_set(service, item, new_value, overwrite)
         return SecretData(value = new_value, is_new = True)
     
+    @timed("obtain.env", "key")
     def env(
         self, 
         key: str, 
@@ -151,8 +249,8 @@ class DworshakObtain:
         if path is None:
             path = self.env_path # Defaults to None, DworshakEnv handles Path(".env")
 
-        env_mgr = DworshakEnv(path=path)
-        value = env_mgr.get(key)
+        env_mgr = get_env_store(path)
+        value = self._env_get(env_mgr, key)
 
         # Logic: If it exists and we aren't forcing a refresh, return it.
         if value is not None and not overwrite:
@@ -168,11 +266,361 @@ class DworshakObtain:
 
         # Persistence logic: Save to .env file if not forgotten
         if new_value is not None and not forget:
-            env_mgr.set(key, new_value, overwrite=overwrite)
+            self._env_set(env_mgr, key, new_value, overwrite)
+            return new_value
+
+        return new_value if new_value is not None else value
+
+    @timed("obtain.config_many")
+    def config_many(
+        self,
+        items: Iterable[Tuple[str, str]],
+        message: str | None = None,
+        path: str | Path | None = None,
+        overwrite: bool = False,
+        forget: bool = False,
+        **kwargs # Pass-through for priority, avoid, debug, etc.
+    ) -> Dict[Tuple[str, str], str | None]:
+        """
+        Bulk config(): loads the config file once, prompts for every missing
+        (service, item) in a single ask_many() interaction, then re-reads the file and
+        writes the answers in one atomic save. Without overwrite, a value that appeared
+        in the file during the prompt is kept and returned.
+        Returns {(service, item): value}; blank or cancelled answers are None and not stored.
+        """
+        if path is None:
+            path = self.config_path
+        items = list(dict.fromkeys(items))
+
+        config_mgr = get_config_store(path)
+        with span("store.lookup", store="config", count=len(items)):
+            data = config_mgr.load()
+        values = {(service, item): data.get(service, {}).get(item) for service, item in items}
+        if self._buffer is not None:
+            for service, item in items:
+                buffered = self._buffer.config_get(config_mgr, service, item)
+                if buffered is not None:
+                    values[(service, item)] = buffered
+
+        missing = [pair for pair in items if values[pair] is None or overwrite]
+        answers = self._ask_missing(
+            [
+                PromptField(key=_pair_key(service, item), message=f"config [{service}][{item}]", suggestion=values[(service, item)])
+                for service, item in missing
+            ],
+            message=message,
+            **kwargs
+        )
+
+        new_values = {}
+        for service, item in missing:
+            new_value = answers.get(_pair_key(service, item))
+            if new_value is None:
+                continue
+            values[(service, item)] = new_value
+            if forget:
+                continue
+            if self._buffer is not None:
+                self._buffer.config_set(config_mgr, service, item, new_value, overwrite)
+            else:
+                new_values[(service, item)] = new_value
+
+        if new_values:
+            with span("store.persist", store="config"):
+                # Re-read: the prompt may have taken minutes and the file may have changed since
+                data = config_mgr.load()
+                for (service, item), value in new_values.items():
+                    if overwrite or item not in data.get(service, {}):
+                        data.setdefault(service, {})[item] = value
+                    else:
+                        # Set elsewhere while we were prompting: report what is stored
+                        values[(service, item)] = data[service][item]
+                config_mgr.atomic_save(data)
+        return values
+
+    @timed("obtain.secret_many")
+    def secret_many(
+        self,
+        items: Iterable[Tuple[str, str]],
+        message: str | None = None,
+        path: str | Path | None = None,
+        overwrite: bool = False,
+        forget: bool = False,
+        **kwargs
+    ) -> Dict[Tuple[str, str], SecretData]:
+        """
+        Bulk secret(): imports the secret backend once and prompts for every missing
+        (service, item) in a single ask_many() interaction with hidden fields.
+        Returns {(service, item): SecretData}.
+        """
+        if path is None:
+            path = self.secret_path
+        items = list(dict.fromkeys(items))
+
+        results = {}
+        missing = []
+        for service, item in items:
+            value = self._secret_get(service, item)
+            if value is not None and not overwrite:
+                results[(service, item)] = SecretData(value = value, is_new = False)
+            else:
+                missing.append((service, item))
+
+        answers = self._ask_missing(
+            [PromptField(key=_pair_key(service, item), message=f"{service} / {item}", hide_input=True) for service, item in missing],
+            message=message,
+            **kwargs
+        )
+
+        for service, item in missing:
+            new_value = answers.get(_pair_key(service, item))
+            if new_value is None:
+                results[(service, item)] = SecretData(value=None, is_new=None)
+                continue
+            # dworshak-secret has no batch API; each record is its own vault write
+            if not forget:
+                self._secret_set(service, item, new_value, overwrite)
+            results[(service, item)] = SecretData(value = new_value, is_new = True)
+        return results
+
+    @timed("obtain.env_many")
+    def env_many(
+        self,
+        keys: Iterable[str],
+        message: str | None = None,
+        path: str | Path | None = None,
+        overwrite: bool = False,
+        forget: bool = False,
+        **kwargs
+    ) -> Dict[str, str | None]:
+        """
+        Bulk env(): reads os.environ and the .env file once, prompts for every missing
+        key in a single ask_many() interaction, then re-reads the .env file and writes
+        the answers in one atomic save (keeping, without overwrite, keys added meanwhile).
+        Returns {key: value}; blank or cancelled answers are None and not stored.
+        """
+        if path is None:
+            path = self.env_path
+        keys = list(dict.fromkeys(keys))
+
+        env_mgr = get_env_store(path)
+        with span("store.lookup", store="env", count=len(keys)):
+            file_values = env_mgr.load()
+        values = {}
+        for key in keys:
+            value = os.getenv(key)
+            if value is None and self._buffer is not None:
+                value = self._buffer.env_get(env_mgr, key)
+            values[key] = value if value is not None else file_values.get(key, env_mgr.defaults.get(key))
+
+        missing = [key for key in keys if values[key] is None or overwrite]
+        answers = self._ask_missing(
+            [PromptField(key=key, message=f"env [{key}]", suggestion=values[key]) for key in missing],
+            message=message,
+            **kwargs
+        )
+
+        new_values = {}
+        for key in missing:
+            new_value = answers.get(key)
+            if new_value is not None:
+                values[key] = new_values[key] = str(new_value)
+
+        if new_values and not forget and self._buffer is not None:
+            for key, value in new_values.items():
+                self._buffer.env_set(env_mgr, key, value, overwrite)
+        elif new_values and not forget:
+            with span("store.persist", store="env"):
+                # Re-read: the prompt may have taken minutes and the file may have changed since
+                file_values = env_mgr.load()
+                applied = {}
+                for key, value in new_values.items():
+                    if overwrite or key not in file_values:
+                        file_values[key] = applied[key] = value
+                    else:
+                        values[key] = file_values[key]
+                env_mgr.atomic_save(file_values)
+            # Same process-environment sync as DworshakEnv.set()
+            os.environ.update(applied)
+        return values
+
+    def _ask_missing(self, fields: List[PromptField], message: str | None = None, **kwargs) -> Dict[str, Any]:
+        """One ask_many() round for the *_many methods; drops blank answers, {} on cancel."""
+        if not fields:
+            return {}
+        answers = DworshakPrompt().ask_many(fields, message=message, **kwargs) or {}
+        return {k: v for k, v in answers.items() if v not in (None, "")}
+
+    @timed("obtain.config_async", "service", "item")
+    async def config_async(
+        self,
+        service: str, 
+        item: str, 
+        message: str | None = None,
+        suggestion: str | None = None,
+        default: Any | None = None,
+        path: str | Path | None = None,
+        overwrite: bool = False,
+        forget: bool = False,
+        **kwargs
+    ) -> str | None:
+        """Coroutine version of config(): store I/O in the default executor, prompt via ask_async()."""
+        if path is None:
+            path = self.config_path
+        import asyncio
+        loop = asyncio.get_running_loop()
+
+        config_mgr = get_config_store(path)
+        value = await loop.run_in_executor(None, self._config_get, config_mgr, service, item)
+        if value is not None and not overwrite:
+            return value
+
+        new_value = await DworshakPrompt().ask_async(
+            message=message or f"config [{service}][{item}]",
+            suggestion=suggestion or value,
+            hide_input=False,
+            **kwargs
+        )
+
+        if new_value is not None and not forget:
+            await loop.run_in_executor(
+                None, functools.partial(self._config_set, config_mgr, service, item, new_value, overwrite)
+            )
+        return new_value if new_value is not None else value
+
+    @timed("obtain.secret_async", "service", "item")
+    async def secret_async(
+        self,
+        service: str, 
+        item: str, 
+        message: str | None = None,
+        suggestion: str | None = None,
+        default: Any | None = None,
+        path: str | Path | None = None,
+        overwrite: bool = False,
+        forget: bool = False,
+        **kwargs 
+        ) -> SecretData:
+        """Coroutine version of secret(): import, decrypt and store in the default executor."""
+        if path is None:
+            path = self.secret_path
+        import asyncio
+        loop = asyncio.get_running_loop()
+
+        value = await loop.run_in_executor(None, self._secret_get, service, item)
+        if value is not None and not overwrite:
+            return SecretData(value = value, is_new = False)
+
+        new_value = await DworshakPrompt().ask_async(
+            message=message or f"{service} / {item}",
+            hide_input=True,
+            **kwargs 
+        )
+        if new_value is None:
+            return SecretData(value=None, is_new=None)
+
+        if not forget:
+            await loop.run_in_executor(
+                None, functools.partial(self._secret_set, service, item, new_value, overwrite)
+            )
+        return SecretData(value = new_value, is_new = True)
+
+    @timed("obtain.env_async", "key")
+    async def env_async(
+        self, 
+        key: str, 
+        message: str | None = None,
+        suggestion: str | None = None,
+        default: Any | None = None,
+        path: str | Path | None = None,
+        overwrite: bool = False,
+        forget: bool = False,
+        **kwargs
+    ) -> str | None:
+        """Coroutine version of env(): store I/O in the default executor, prompt via ask_async()."""
+        if path is None:
+            path = self.env_path
+        import asyncio
+        loop = asyncio.get_running_loop()
+
+        env_mgr = get_env_store(path)
+        value = await loop.run_in_executor(None, self._env_get, env_mgr, key)
+        if value is not None and not overwrite:
+            return value
+
+        new_value = await DworshakPrompt().ask_async(
+            message=message or f"env [{key}]",
+            suggestion=value or default,
+            hide_input=False,
+            **kwargs
+        )
+
+        if new_value is not None and not forget:
+            await loop.run_in_executor(
+                None, functools.partial(self._env_set, env_mgr, key, new_value, overwrite)
+            )
             return new_value
 
         return new_value if new_value is not None else value
 
+def _pair_key(service: str, item: str) -> str:
+    # ask_many() keys are strings; join with a control character no service or item name uses
+    return f"{service}\x1f{item}"
+
+_secret_backend = None  # (get_secret, store_secret) after the first successful import
+
+def _import_secret_backend():
+    """Lazy import of dworshak_secret, so a missing [crypto] extra doesn't crash at import."""
+    global _secret_backend
+    if _secret_backend is not None:
+        return _secret_backend
+    try:
+        import cryptography
+        from dworshak_secret import DworshakSecret, get_secret, store_secret
+    except:
+        # Trigger the "Lifeboat" redirection error
+        from memphisdrip import safe_notify
+        from .messages import notify_missing_function_redirect, MSG_CRYPTO_EXTRA
+        # We pass a specific context so the user knows why it failed
+        full_msg = notify_missing_function_redirect("DworshakObtain.secret()") + MSG_CRYPTO_EXTRA
+        safe_notify(full_msg)
+        raise SystemExit(1)
+    _secret_backend = (get_secret, store_secret)
+    return _secret_backend
+
+def _read_secret(get_secret, service: str, item: str) -> str | None:
+    """get_secret() behind the opt-in secret cache; a hit skips the decrypt."""
+    cache = get_secret_cache()
+    if cache is None:
+        return get_secret(service, item)
+    value = cache.get((service, item))
+    if value is None:
+        value = get_secret(service, item)
+        if value is not None:
+            cache.put((service, item), value)
+    return value
+
+def _write_secret(store_secret, service: str, item: str, value: str, overwrite: bool = False):
+    store_secret(service, item, value, overwrite=overwrite)
+    cache = get_secret_cache()
+    if cache is not None:
+        cache.put((service, item), value)
+    from .agent import agent_enabled, agent_forget_secret
+    if agent_enabled():
+        # Don't let a running agent keep serving the previous value
+        agent_forget_secret(service, item)
+
+def _agent_lookup(store: str, **fields) -> Any | None:
+    """A running value agent's answer, or None (no agent, or it has no value)."""
+    from .agent import agent_enabled, agent_get
+    if not agent_enabled():
+        return None
+    with span("agent.lookup", store=store) as lookup:
+        _, value = agent_get(store, **fields)
+        lookup.set(hit=value is not None)
+    return value
+
+
 def dworshak_obtain(
     service_or_key: str,
     item: str | None = None,
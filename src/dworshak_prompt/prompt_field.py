@@ -0,0 +1,63 @@
+# src/dworshak_prompt/prompt_field.py
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Mapping, Union
+
+
+@dataclass
+class PromptField:
+    """
+    One field of a multi-value prompt (DworshakPrompt.ask_many).
+    `key` names the value in the returned dict; `message` is what the user sees.
+    """
+    key: str
+    message: str | None = None
+    suggestion: str | None = None
+    hide_input: bool = False
+    default: Any | None = None  # Returned for this field in CI/non-interactive environments
+
+    @property
+    def label(self) -> str:
+        return self.message or self.key
+
+    def __repr__(self):
+        # Don't leak suggestions/defaults for hidden fields
+        if self.hide_input:
+            return f"PromptField(key={self.key!r}, message={self.message!r}, hide_input=True)"
+        return (
+            f"PromptField(key={self.key!r}, message={self.message!r}, "
+            f"suggestion={self.suggestion!r}, hide_input=False, default={self.default!r})"
+        )
+
+    def to_dict(self) -> dict:
+        """JSON-safe description for the web frontend."""
+        return {
+            "key": self.key,
+            "message": self.label,
+            "suggestion": self.suggestion or "",
+            "is_credential": self.hide_input,
+        }
+
+
+FieldSpec = Union[PromptField, Mapping[str, Any], str]
+
+
+def normalize_fields(fields: Iterable[FieldSpec]) -> List[PromptField]:
+    """Accepts PromptField objects, dicts of PromptField kwargs, or bare key strings."""
+    normalized = []
+    for spec in fields:
+        if isinstance(spec, PromptField):
+            field = spec
+        elif isinstance(spec, str):
+            field = PromptField(key=spec)
+        elif isinstance(spec, Mapping):
+            field = PromptField(**spec)
+        else:
+            raise TypeError(f"Unsupported field spec: {spec!r}")
+        normalized.append(field)
+
+    keys = [f.key for f in normalized]
+    duplicates = {k for k in keys if keys.count(k) > 1}
+    if duplicates:
+        raise ValueError(f"Duplicate field keys: {sorted(duplicates)}")
+    return normalized
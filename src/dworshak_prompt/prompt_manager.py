@@ -1,29 +1,79 @@
 # pipeline/prompt_manager.py
 from __future__ import annotations # Delays annotation evaluation, allowing modern 3.10+ type syntax and forward references in older Python versions 3.8 and 3.9
+import heapq
+import itertools
 import threading
+import time
 import uuid
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Callable
+
+from .keyboard_interrupt import InterruptEvent
+
+# For a plain threading.Event stop_event, wait_for_result re-checks it at this interval.
+# An InterruptEvent, submissions and cancel() wake the waiter immediately.
+STOP_EVENT_CHECK_INTERVAL = 0.05
+
+# Abandoned prompts (nobody answered or withdrew them) and unread results are dropped after these.
+DEFAULT_PROMPT_TTL = 3600.0
+DEFAULT_RESULT_TTL = 300.0
+# Expiry sweeps piggyback on normal calls, at most this often
+EVICTION_INTERVAL = 1.0
+# How long the acknowledgement time of a finished prompt is kept for its waiter
+SEEN_TIME_GRACE = 60.0
 
 class PromptManager:
     """
     Manages the state of active configuration prompts and submitted results.
     Designed to be instantiated once and shared across threads.
+
+    Active prompts form a queue: higher `priority` first, FIFO within a priority.
+    Any number can be outstanding and answered in any order. Prompts older than
+    prompt_ttl and results unread after result_ttl are evicted, so state stays
+    bounded in long-running processes.
     """
-    def __init__(self):
+    def __init__(self, prompt_ttl: float | None = DEFAULT_PROMPT_TTL, result_ttl: float | None = DEFAULT_RESULT_TTL):
+        self.prompt_ttl = prompt_ttl
+        self.result_ttl = result_ttl
+
         # Stores active prompt details waiting for frontend detection
         # Key: request_id (str), Value: prompt_data (Dict[str, Any])
         self.active_prompt_request: Dict[str, Any] = {}
         self.active_prompt_lock = threading.Lock()
+        # Queue order: heap of (-priority, seq, request_id); entries for finished prompts are skipped lazily
+        self._prompt_queue: List[tuple] = []
+        self._prompt_seq = itertools.count()
+        # Key: request_id (str), Value: monotonic expiry time
+        self._prompt_expiry: Dict[str, float] = {}
         
         # Stores results submitted by the frontend, waiting to unblock Python thread
-        # Key: request_id (str), Value: submitted_value (str)
-        self.prompt_results: Dict[str, str] = {}
+        # Key: request_id (str), Value: submitted_value (str, or Dict[str, str] for forms)
+        self.prompt_results: Dict[str, Any] = {}
+        self._result_expiry: Dict[str, float] = {}
         self.results_lock = threading.Lock()
+
+        self._next_eviction = 0.0
+
+        # One Event per outstanding request; set by submit_result()/cancel() to wake its waiter
+        # Key: request_id (str), Value: threading.Event
+        self.result_events: Dict[str, threading.Event] = {}
+        # Extra wake-ups for a request (used to complete asyncio futures from the server thread)
+        self.result_callbacks: Dict[str, List[Callable[[], None]]] = {}
         
         # Store the dynamically found server URL
         self.server_host_port: str = ""
 
-    def register_prompt(self, key: str, message: str, is_credential: bool, suggestion: str | None = None) -> str:
+        # Dashboard tabs: bumped on every prompt change so SSE streams can push the new state
+        self.prompt_version: int = 0
+        self.prompt_changed = threading.Condition()
+        self.dashboard_clients: int = 0
+        # Called after every prompt_version bump, on the thread that made the change
+        self.change_listeners: List[Callable[[], None]] = []
+        self.seen_requests: set = set()
+        # request_id -> time.perf_counter() of the first acknowledgement; kept after the prompt
+        # finishes so the waiter can report it (timing spans), dropped by cancel() or eviction
+        self.seen_at: Dict[str, float] = {}
+
+    def register_prompt(self, key: str, message: str, is_credential: bool, suggestion: str | None = None, priority: int = 0) -> str:
         """Stores a new prompt request and returns its ID."""
         request_id = str(uuid.uuid4())
         prompt_data = {
@@ -32,34 +82,304 @@ class PromptManager:
             "message": message,
             "is_credential": is_credential,
             "suggestion": suggestion, 
+            "priority": priority,
+        }
+        self._enqueue(prompt_data, priority)
+        return request_id
+
+    def register_form(self, fields: List[Dict[str, Any]], message: str | None = None, priority: int = 0) -> str:
+        """
+        Stores a multi-field prompt request (see PromptField.to_dict) and returns its ID.
+        The submitted result is a Dict[str, str] keyed by field key.
+        """
+        request_id = str(uuid.uuid4())
+        prompt_data = {
+            "request_id": request_id,
+            "message": message,
+            "fields": fields,
+            "priority": priority,
         }
+        self._enqueue(prompt_data, priority)
+        return request_id
+
+    def _enqueue(self, prompt_data: Dict[str, Any], priority: int):
+        request_id = prompt_data["request_id"]
+        self._evict_expired()
         with self.active_prompt_lock:
-            # When singleton, defunct: Critical: Ensure only one prompt is active at a time for simplicity
-            #if self.active_prompt_request:
-            #     raise RuntimeError("A configuration prompt is already active.")
             self.active_prompt_request[request_id] = prompt_data
-        return request_id
+            heapq.heappush(self._prompt_queue, (-priority, next(self._prompt_seq), request_id))
+            if self.prompt_ttl is not None:
+                self._prompt_expiry[request_id] = time.monotonic() + self.prompt_ttl
+        self.notify_prompt_change()
+
+    def _remove_prompt(self, request_id: str) -> bool:
+        """Drops an active prompt. Caller holds active_prompt_lock. True if it was active."""
+        self._prompt_expiry.pop(request_id, None)
+        removed = self.active_prompt_request.pop(request_id, None) is not None
+        # Keep the heap from accumulating dead entries in long runs
+        if len(self._prompt_queue) > 2 * len(self.active_prompt_request) + 32:
+            self._prompt_queue = [e for e in self._prompt_queue if e[2] in self.active_prompt_request]
+            heapq.heapify(self._prompt_queue)
+        return removed
+
+    def _evict_expired(self, force: bool = False):
+        """Drops prompts past prompt_ttl (waking their waiters) and results past result_ttl."""
+        now = time.monotonic()
+        if not force and now < self._next_eviction:
+            return
+        self._next_eviction = now + EVICTION_INTERVAL
+
+        with self.active_prompt_lock:
+            expired_prompts = [rid for rid, t in self._prompt_expiry.items() if t <= now]
+            for rid in expired_prompts:
+                self._remove_prompt(rid)
+        with self.results_lock:
+            expired_results = [rid for rid, t in self._result_expiry.items() if t <= now]
+            for rid in expired_results:
+                self._result_expiry.pop(rid, None)
+                self.prompt_results.pop(rid, None)
+
+        for rid in expired_prompts:
+            self.notify_prompt_change(rid)
+            self._wake(rid)
+
+        # Acknowledgement times of finished prompts nobody collected (answered outside web_prompt)
+        with self.active_prompt_lock:
+            active = set(self.active_prompt_request)
+        stale_before = time.perf_counter() - SEEN_TIME_GRACE
+        with self.prompt_changed:
+            for rid in [rid for rid, t in self.seen_at.items() if rid not in active and t < stale_before]:
+                del self.seen_at[rid]
+
+    def pending_count(self) -> int:
+        """Number of prompts still waiting for an answer."""
+        with self.active_prompt_lock:
+            return len(self.active_prompt_request)
+
+    def list_active_prompts(self) -> List[Dict[str, Any]]:
+        """All active prompts in queue order."""
+        with self.active_prompt_lock:
+            ordered = sorted(e for e in self._prompt_queue if e[2] in self.active_prompt_request)
+            return [self.active_prompt_request[e[2]] for e in ordered]
+
+    def get_prompt(self, request_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieves a specific active prompt by ID."""
+        with self.active_prompt_lock:
+            return self.active_prompt_request.get(request_id)
 
     def get_active_prompt(self) -> Optional[Dict[str, Any]]:
-        """Retrieves the active prompt data for the frontend."""
+        """Retrieves the head of the prompt queue for the frontend."""
+        self._evict_expired()
         with self.active_prompt_lock:
-            if not self.active_prompt_request:
+            # Discard heap entries of prompts that were answered, cancelled or evicted
+            while self._prompt_queue and self._prompt_queue[0][2] not in self.active_prompt_request:
+                heapq.heappop(self._prompt_queue)
+            if not self._prompt_queue:
                 return None
-            
-            # Retrieve the single active prompt
-            return next(iter(self.active_prompt_request.values()))
+            return self.active_prompt_request[self._prompt_queue[0][2]]
+
+    def submit_result(self, request_id: str, value: Any) -> bool:
+        """
+        Stores a submitted result, clears the active request and wakes its waiter.
+        Returns False (and stores nothing) if the request is no longer active,
+        e.g. it was cancelled, timed out or evicted.
+        """
+        with self.active_prompt_lock:
+            if not self._remove_prompt(request_id):
+                return False
 
-    def submit_result(self, request_id: str, value: str):
-        """Stores a submitted result and clears the active request."""
         with self.results_lock:
             self.prompt_results[request_id] = value
+            if self.result_ttl is not None:
+                self._result_expiry[request_id] = time.monotonic() + self.result_ttl
         
+        self.notify_prompt_change(request_id)
+        self._wake(request_id)
+        self._evict_expired()
+        return True
+
+    def cancel(self, request_id: str):
+        """Withdraws an active request; its waiter returns None immediately."""
         with self.active_prompt_lock:
-            self.active_prompt_request.pop(request_id, None)
+            self._remove_prompt(request_id)
+        with self.prompt_changed:
+            self.seen_at.pop(request_id, None)
+        self.notify_prompt_change(request_id)
+        self._wake(request_id)
+
+    def _wake(self, request_id: str):
+        """Wakes whoever waits on request_id: a blocking waiter and/or async callbacks."""
+        with self.results_lock:
+            waiter = self.result_events.get(request_id)
+            callbacks = list(self.result_callbacks.get(request_id, ()))
+        if waiter is not None:
+            waiter.set()
+        for callback in callbacks:
+            callback()
+
+    # --- Dashboard (persistent tab) support ---
+
+    def notify_prompt_change(self, finished_request_id: str | None = None):
+        """Wakes every dashboard stream so it pushes the current active prompt."""
+        with self.prompt_changed:
+            if finished_request_id is not None:
+                self.seen_requests.discard(finished_request_id)
+            self.prompt_version += 1
+            self.prompt_changed.notify_all()
+            listeners = list(self.change_listeners)
+        for listener in listeners:
+            listener()
+
+    def add_change_listener(self, callback: Callable[[], None]):
+        """
+        callback() runs whenever the active prompt set changes (the event-driven
+        alternative to wait_for_prompt_change). It must not block.
+        """
+        with self.prompt_changed:
+            self.change_listeners.append(callback)
+
+    def remove_change_listener(self, callback: Callable[[], None]):
+        with self.prompt_changed:
+            if callback in self.change_listeners:
+                self.change_listeners.remove(callback)
+
+    def wait_for_prompt_change(self, last_version: int, timeout: float | None = None) -> int:
+        """Blocks until prompt_version moves past last_version (or timeout); returns the current version."""
+        with self.prompt_changed:
+            self.prompt_changed.wait_for(lambda: self.prompt_version != last_version, timeout=timeout)
+            return self.prompt_version
+
+    def attach_dashboard(self):
+        with self.prompt_changed:
+            self.dashboard_clients += 1
+
+    def detach_dashboard(self):
+        with self.prompt_changed:
+            self.dashboard_clients = max(0, self.dashboard_clients - 1)
+
+    def dashboard_connected(self) -> bool:
+        with self.prompt_changed:
+            return self.dashboard_clients > 0
+
+    def mark_prompt_seen(self, request_id: str):
+        """Called when a dashboard tab acknowledges that it rendered request_id."""
+        if self.get_prompt(request_id) is None:
+            return  # Stale or unknown; don't let it accumulate
+        with self.prompt_changed:
+            self.seen_requests.add(request_id)
+            self.seen_at.setdefault(request_id, time.perf_counter())
+            self.prompt_changed.notify_all()
+
+    def seen_time(self, request_id: str) -> float | None:
+        """time.perf_counter() when a dashboard first acknowledged request_id, if it did."""
+        with self.prompt_changed:
+            return self.seen_at.get(request_id)
+
+    def wait_until_seen(self, request_id: str, timeout: float) -> bool:
+        """True once a dashboard has acknowledged request_id, False on timeout."""
+        with self.prompt_changed:
+            return self.prompt_changed.wait_for(lambda: request_id in self.seen_requests, timeout=timeout)
+
+    def wait_for_result(
+        self,
+        request_id: str,
+        timeout: float | None = None,
+        stop_event: threading.Event | None = None,
+    ) -> Optional[Any]:
+        """
+        Blocks until a result is submitted for request_id and returns it.
+        Returns None on timeout, cancel(), or when stop_event is set.
+        """
+        with self.results_lock:
+            waiter = self.result_events.setdefault(request_id, threading.Event())
+
+        # An InterruptEvent can wake us directly; a plain Event has to be re-checked
+        linked = isinstance(stop_event, InterruptEvent)
+        if linked:
+            stop_event.add_callback(waiter.set)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while True:
+                if stop_event is not None and stop_event.is_set():
+                    return None
 
-    def get_and_clear_result(self, request_id: str) -> Optional[str]:
+                # Covers results submitted before we started waiting
+                val = self.get_and_clear_result(request_id)
+                if val is not None:
+                    return val
+
+                wait_for = STOP_EVENT_CHECK_INTERVAL if (stop_event is not None and not linked) else None
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return None
+                    wait_for = remaining if wait_for is None else min(wait_for, remaining)
+
+                if waiter.wait(wait_for):
+                    # Woken by submit_result(), cancel() or the linked stop_event
+                    if stop_event is not None and stop_event.is_set():
+                        return None
+                    return self.get_and_clear_result(request_id)
+        finally:
+            if linked:
+                stop_event.remove_callback(waiter.set)
+            with self.results_lock:
+                self.result_events.pop(request_id, None)
+
+    async def wait_for_result_async(self, request_id: str, timeout: float | None = None) -> Optional[Any]:
+        """
+        Awaitable counterpart of wait_for_result(): an asyncio future completed by the
+        server thread on submit_result()/cancel(). Cancel the awaiting task to stop waiting.
+        """
+        import asyncio
+        loop = asyncio.get_running_loop()
+        woken = loop.create_future()
+
+        def resolve():
+            if not woken.done():
+                woken.set_result(None)
+
+        def wake():
+            try:
+                loop.call_soon_threadsafe(resolve)
+            except RuntimeError:
+                pass  # Loop already closed
+
+        self.add_result_callback(request_id, wake)
+        try:
+            # Covers results submitted before we started waiting
+            val = self.get_and_clear_result(request_id)
+            if val is not None:
+                return val
+            try:
+                await asyncio.wait_for(woken, timeout)
+            except asyncio.TimeoutError:
+                return None
+            return self.get_and_clear_result(request_id)
+        finally:
+            self.remove_result_callback(request_id, wake)
+
+    def add_result_callback(self, request_id: str, callback: Callable[[], None]):
+        """
+        callback() runs (on the submitting thread) when request_id is answered, cancelled
+        or evicted. It must not block; collect the value with get_and_clear_result().
+        """
+        with self.results_lock:
+            self.result_callbacks.setdefault(request_id, []).append(callback)
+
+    def remove_result_callback(self, request_id: str, callback: Callable[[], None]):
+        with self.results_lock:
+            callbacks = self.result_callbacks.get(request_id, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+            if not callbacks:
+                self.result_callbacks.pop(request_id, None)
+
+    def get_and_clear_result(self, request_id: str) -> Optional[Any]:
         """Retrieves a result and removes it to unblock the waiting thread."""
         with self.results_lock:
+            self._result_expiry.pop(request_id, None)
             return self.prompt_results.pop(request_id, None)
             
     def set_server_host_port(self, host_port_str: str):
@@ -73,3 +393,18 @@ class PromptManager:
         return f"http://{self.server_host_port}"
 
 
+_shared_manager: PromptManager | None = None
+_shared_manager_lock = threading.Lock()
+
+def get_shared_manager() -> PromptManager:
+    """
+    The process-wide manager used by the web backend.
+    Sharing it lets one dashboard tab serve every prompt the process issues.
+    """
+    global _shared_manager
+    with _shared_manager_lock:
+        if _shared_manager is None:
+            _shared_manager = PromptManager()
+        return _shared_manager
+
+
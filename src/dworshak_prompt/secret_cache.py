@@ -0,0 +1,124 @@
+# src/dworshak_prompt/secret_cache.py
+"""
+Opt-in, process-wide in-memory cache of decrypted secrets for DworshakObtain.secret().
+
+Off by default. Enable it in code with enable_secret_cache(ttl, max_entries), or with
+environment variables read on first use:
+    DWORSHAK_PROMPT_SECRET_CACHE_TTL=<secs>   Entry lifetime; enables the cache when > 0.
+    DWORSHAK_PROMPT_SECRET_CACHE_MAX=<n>      Maximum entries, least recently used evicted first (default 64).
+
+Values are held in bytearrays and overwritten with zeros on eviction, on
+disable_secret_cache()/clear(), and at interpreter exit. The str handed back to the
+caller is an ordinary Python string and cannot be wiped; the cache only ensures it
+does not keep its own copies alive longer than the TTL.
+"""
+from __future__ import annotations
+import atexit
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+import logging
+
+logger = logging.getLogger("dworshak_prompt")
+
+DEFAULT_MAX_ENTRIES = 64
+
+
+def _wipe(buf: bytearray):
+    buf[:] = bytes(len(buf))
+
+
+class SecretCache:
+    """TTL + LRU bounded map of key -> secret, stored as wipeable bytearrays."""
+
+    def __init__(self, ttl: float, max_entries: int = DEFAULT_MAX_ENTRIES):
+        if ttl <= 0 or max_entries <= 0:
+            raise ValueError("ttl and max_entries must be positive")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[bytearray, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            buf, expires_at = entry
+            if time.monotonic() >= expires_at:
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return buf.decode("utf-8")
+
+    def put(self, key: Hashable, value: str):
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (bytearray(value.encode("utf-8")), time.monotonic() + self.ttl)
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+
+    def pop(self, key: Hashable):
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._entries):
+                self._discard(key)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _discard(self, key: Hashable):
+        # Caller holds the lock
+        buf, _ = self._entries.pop(key)
+        _wipe(buf)
+
+
+_cache: SecretCache | None = None
+_configured = False
+_lock = threading.Lock()
+_atexit_registered = False
+
+
+def _install(cache: SecretCache | None):
+    global _cache, _configured, _atexit_registered
+    old, _cache, _configured = _cache, cache, True
+    if old is not None:
+        old.clear()
+    if cache is not None and not _atexit_registered:
+        atexit.register(disable_secret_cache)
+        _atexit_registered = True
+
+
+def enable_secret_cache(ttl: float = 300, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+    """Turns on the process-wide secret cache (replacing and wiping any existing one)."""
+    with _lock:
+        _install(SecretCache(ttl, max_entries))
+
+
+def disable_secret_cache() -> None:
+    """Wipes every cached secret and turns the cache off."""
+    with _lock:
+        _install(None)
+
+
+def get_secret_cache() -> SecretCache | None:
+    """The active cache, or None when caching is off. Applies the env vars on first call."""
+    if _configured:
+        return _cache
+    with _lock:
+        if not _configured:
+            try:
+                ttl = float(os.environ.get("DWORSHAK_PROMPT_SECRET_CACHE_TTL", "0"))
+                max_entries = int(os.environ.get("DWORSHAK_PROMPT_SECRET_CACHE_MAX", DEFAULT_MAX_ENTRIES))
+                _install(SecretCache(ttl, max_entries) if ttl > 0 else None)
+            except ValueError as e:
+                logger.debug(f"[DIAGNOSTIC] Ignoring invalid secret cache settings: {e}")
+                _install(None)
+        return _cache
@@ -1,15 +1,477 @@
 # src/dworshak_prompt/server.py
 from __future__ import annotations
-import http.server
-import socketserver
+import html as html_lib
 import json
+import logging
+import re
 import urllib.parse
+import selectors
+import socket
 import threading
-from .browser_utils import find_open_port
+import time
+from http import HTTPStatus
 
-class PromptHandler(http.server.BaseHTTPRequestHandler):
-    def log_message(self, format, *args):
-        pass  # Silence the console noise
+logger = logging.getLogger("dworshak_prompt")
+
+# SSE comment line sent while idle; also how a closed tab gets noticed
+SSE_HEARTBEAT_SECONDS = 10.0
+# Open sockets, event streams included; past this the oldest idle keep-alive connection is closed
+MAX_CONNECTIONS = 256
+# Dashboard streams are never idle, so they get their own cap and can't starve submissions
+MAX_EVENT_STREAMS = 64
+# Keep-alive connections with no request in flight are closed after this
+KEEPALIVE_TIMEOUT = 15.0
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 1 << 20
+# A client that stops reading (e.g. a frozen tab) is dropped once this much output is queued
+MAX_BUFFERED_OUTPUT = 1 << 20
+
+# Persistent page: stays open and renders each prompt pushed over /api/events (Server-Sent Events).
+# Static, so it is a plain string; prompt text is inserted with textContent/value, never as HTML.
+DASHBOARD_HTML = """<!DOCTYPE html>
+<html>
+<head>
+    <title>Dworshak Prompt</title>
+    <style>
+        body { font-family: sans-serif; display: flex; justify-content: center; align-items: center; min-height: 100vh; margin: 0; background: #f0f2f5; }
+        .card { background: white; padding: 30px; border-radius: 12px; box-shadow: 0 4px 12px rgba(0,0,0,0.15); width: 100%; max-width: 480px; }
+        h2 { margin-top: 0; color: #1c1e21; font-size: 1.2rem; }
+        label { display: block; margin-top: 14px; color: #444; font-size: 0.9rem; }
+        .input-group { display: flex; margin: 6px 0; }
+        input { flex-grow: 1; padding: 10px; border: 1px solid #ddd; border-radius: 6px; font-size: 1rem; }
+        button { background: #007bff; color: white; border: none; padding: 12px 20px; border-radius: 6px; cursor: pointer; font-weight: bold; }
+        button.toggle { background: #6c757d; margin-left: 5px; }
+        button:hover { opacity: 0.9; }
+        .actions { display: flex; justify-content: flex-end; margin-top: 20px; }
+        .status { color: #666; }
+        .error { color: #c0392b; font-size: 0.85rem; margin: 2px 0; }
+    </style>
+</head>
+<body>
+    <div class="card" id="card"><p class="status">Connecting&hellip;</p></div>
+    <script>
+        var card = document.getElementById("card");
+        var current = null;
+        var acknowledged = false;  // keep the "received" message until the next prompt
+
+        function status(text) {
+            current = null;
+            card.innerHTML = "";
+            var p = document.createElement("p");
+            p.className = "status";
+            p.textContent = text;
+            card.appendChild(p);
+        }
+
+        function addInput(form, id, key, label, suggestion, hidden, focus) {
+            if (label !== null) {
+                var l = document.createElement("label");
+                l.htmlFor = id;
+                l.textContent = label;
+                form.appendChild(l);
+            }
+            var group = document.createElement("div");
+            group.className = "input-group";
+            var input = document.createElement("input");
+            input.id = id;
+            input.dataset.key = key;
+            input.type = hidden ? "password" : "text";
+            input.value = suggestion || "";
+            input.autocomplete = "off";
+            input.spellcheck = false;
+            input.onfocus = function () { this.select(); };
+            group.appendChild(input);
+            if (hidden) {
+                var btn = document.createElement("button");
+                btn.type = "button";
+                btn.className = "toggle";
+                btn.textContent = "Show";
+                btn.onclick = function () {
+                    var show = input.type === "password";
+                    input.type = show ? "text" : "password";
+                    btn.textContent = show ? "Hide" : "Show";
+                };
+                group.appendChild(btn);
+            }
+            form.appendChild(group);
+            form.appendChild(errorLine("error_" + id));
+            if (focus) { setTimeout(function () { input.focus(); }, 0); }
+        }
+
+        function errorLine(id) {
+            var p = document.createElement("p");
+            p.className = "error";
+            p.id = id;
+            return p;
+        }
+
+        function render(prompt) {
+            current = prompt.request_id;
+            acknowledged = false;
+            card.innerHTML = "";
+            var h = document.createElement("h2");
+            h.textContent = prompt.message || "Input Required";
+            card.appendChild(h);
+            if (prompt.queued > 0) {
+                var q = document.createElement("p");
+                q.className = "status";
+                q.textContent = prompt.queued + " more waiting";
+                card.appendChild(q);
+            }
+
+            var form = document.createElement("form");
+            var multi = Array.isArray(prompt.fields);
+            if (multi) {
+                prompt.fields.forEach(function (f, i) {
+                    addInput(form, "field_" + i, f.key, f.message || f.key, f.suggestion, f.is_credential, i === 0);
+                });
+            } else {
+                addInput(form, "input_field", prompt.key, null, prompt.suggestion, prompt.is_credential, true);
+            }
+            form.appendChild(errorLine("form_error"));
+            var actions = document.createElement("div");
+            actions.className = "actions";
+            var submit = document.createElement("button");
+            submit.type = "submit";
+            submit.textContent = "Submit";
+            actions.appendChild(submit);
+            form.appendChild(actions);
+
+            form.onsubmit = function (e) {
+                e.preventDefault();
+                var inputs = form.querySelectorAll("input[data-key]");
+                var body = { request_id: prompt.request_id };
+                if (multi) {
+                    body.values = {};
+                    inputs.forEach(function (input) { body.values[input.dataset.key] = input.value; });
+                } else {
+                    body.value = inputs[0].value;
+                }
+                form.querySelectorAll(".error").forEach(function (p) { p.textContent = ""; });
+                fetch("/api/submit", { method: "POST", headers: { "Content-Type": "application/json" }, body: JSON.stringify(body) })
+                    .then(function (r) { return r.json(); })
+                    .then(function (ack) {
+                        if (ack.ok) {
+                            acknowledged = true;
+                            status("Input received. Waiting for the next prompt\u2026");
+                            return;
+                        }
+                        // Validation errors stay on the form so the user can correct them
+                        var errors = ack.field_errors || {};
+                        inputs.forEach(function (input) {
+                            if (errors[input.dataset.key]) { document.getElementById("error_" + input.id).textContent = errors[input.dataset.key]; }
+                        });
+                        document.getElementById("form_error").textContent = ack.error || "";
+                    })
+                    .catch(function () { status("Submission failed."); });
+            };
+            card.appendChild(form);
+
+            fetch("/api/seen", { method: "POST", body: new URLSearchParams({ request_id: prompt.request_id }) });
+        }
+
+        var events = new EventSource("/api/events");
+        events.onmessage = function (e) {
+            var prompt = JSON.parse(e.data);
+            if (!prompt.request_id) {
+                if (!acknowledged) { status("Waiting for prompts\u2026"); }
+                return;
+            }
+            if (prompt.request_id !== current) { render(prompt); }
+        };
+        events.onerror = function () {
+            acknowledged = false;
+            status("Disconnected. Waiting for the prompt server\u2026");
+        };
+    </script>
+</body></html>"""
+
+# --- precompiled pages ---
+
+# Responses smaller than this aren't worth compressing
+GZIP_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+# The dashboard is static: browsers revalidate it (cheap 304) instead of refetching
+DASHBOARD_CACHE = "no-cache"
+# Prompt pages carry a request_id and suggestions; never shared, never stored when a field is secret
+PROMPT_PAGE_CACHE = "private, no-cache"
+PROMPT_PAGE_CACHE_SECRET = "no-store"
+
+_SLOT = re.compile(r"\{\{(\w+)\}\}")
+
+
+class PageTemplate:
+    """
+    HTML split once, at import, into UTF-8 byte chunks around {{slot}} markers.
+    render() HTML-escapes each value and joins it with the chunks, so a request does no
+    formatting of the static shell. bytes values are trusted markup (other precompiled
+    fragments) and are spliced in unescaped.
+    """
+    __slots__ = ("chunks", "slots")
+
+    def __init__(self, source: str):
+        parts = _SLOT.split(source)
+        self.chunks = [part.encode("utf-8") for part in parts[0::2]]
+        self.slots = parts[1::2]
+
+    def render(self, **values) -> bytes:
+        out = [self.chunks[0]]
+        for slot, chunk in zip(self.slots, self.chunks[1:]):
+            value = values[slot]
+            out.append(value if isinstance(value, bytes) else html_lib.escape(str(value)).encode("utf-8"))
+            out.append(chunk)
+        return b"".join(out)
+
+
+class StaticPage:
+    """A fixed body with its ETag and gzip encoding, computed once."""
+    __slots__ = ("body", "etag", "gzipped")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = page_etag(body)
+        self.gzipped = gzip_bytes(body)
+
+
+def page_etag(body: bytes) -> str:
+    import hashlib
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def gzip_bytes(body: bytes) -> bytes:
+    import gzip
+    # mtime=0: identical bodies compress to identical bytes
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    for entry in accept_encoding.split(","):
+        name, _, params = entry.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            q = params.strip()
+            return not (q.startswith("q=") and _qvalue(q[2:]) == 0)
+    return False
+
+
+def _qvalue(text: str) -> float:
+    try:
+        return float(text)
+    except ValueError:
+        return 1.0
+
+
+def _parse_etags(if_none_match: str) -> set:
+    return {tag.strip().removeprefix("W/") for tag in if_none_match.split(",") if tag.strip()}
+
+
+_dashboard: StaticPage | None = None
+
+
+def dashboard_page() -> StaticPage:
+    # Built on first request, so importing the server doesn't pay for hashing or gzip
+    global _dashboard
+    if _dashboard is None:
+        _dashboard = StaticPage(DASHBOARD_HTML.encode("utf-8"))
+    return _dashboard
+
+
+_PAGE_STYLE = """
+    <style>
+        body { font-family: sans-serif; display: flex; justify-content: center; align-items: center; min-height: 100vh; margin: 0; background: #f0f2f5; }
+        .card { background: white; padding: 30px; border-radius: 12px; box-shadow: 0 4px 12px rgba(0,0,0,0.15); width: 100%; max-width: 480px; }
+        h2 { margin-top: 0; color: #1c1e21; font-size: 1.2rem; }
+        label { display: block; margin-top: 14px; color: #444; font-size: 0.9rem; }
+        .input-group { display: flex; margin: 6px 0; }
+        input { flex-grow: 1; padding: 10px; border: 1px solid #ddd; border-radius: 6px; font-size: 1rem; }
+        button { background: #007bff; color: white; border: none; padding: 12px 20px; border-radius: 6px; cursor: pointer; font-weight: bold; }
+        button.toggle { background: #6c757d; margin-left: 5px; }
+        button:hover { opacity: 0.9; }
+        .actions { display: flex; justify-content: flex-end; margin-top: 20px; }
+        .error { color: #c0392b; font-size: 0.85rem; margin: 2px 0; min-height: 0; }
+    </style>"""
+
+# Submits the page's form to /api/submit as JSON and shows the acknowledgement, or the
+# validation errors next to their fields, without leaving the page. Without JavaScript
+# the form still posts to its urlencoded action.
+_SUBMIT_SCRIPT = """
+    <script>
+        function toggleSecret(btn, id) {
+            var x = document.getElementById(id);
+            var hidden = x.type === "password";
+            x.type = hidden ? "text" : "password";
+            btn.innerText = hidden ? "Hide" : "Show";
+        }
+        document.getElementById("prompt_form").onsubmit = function (e) {
+            e.preventDefault();
+            var form = e.target;
+            var inputs = form.querySelectorAll("input[data-key]");
+            var body = { request_id: form.dataset.requestId };
+            if (form.dataset.single) {
+                body.value = inputs[0].value;
+            } else {
+                body.values = {};
+                inputs.forEach(function (input) { body.values[input.dataset.key] = input.value; });
+            }
+            form.querySelectorAll(".error").forEach(function (p) { p.textContent = ""; });
+            fetch("/api/submit", { method: "POST", headers: { "Content-Type": "application/json" }, body: JSON.stringify(body) })
+                .then(function (r) { return r.json(); })
+                .then(function (ack) {
+                    if (ack.ok) {
+                        document.getElementById("card").innerHTML = "<h2>Input received</h2><p>You may now close this tab.</p>";
+                        return;
+                    }
+                    var errors = ack.field_errors || {};
+                    inputs.forEach(function (input) {
+                        if (errors[input.dataset.key]) { document.getElementById("error_" + input.id).textContent = errors[input.dataset.key]; }
+                    });
+                    document.getElementById("form_error").textContent = ack.error || "";
+                })
+                .catch(function () { document.getElementById("form_error").textContent = "Submission failed."; });
+        };
+    </script>"""
+
+# Single-value page (/config_modal?request_id=...)
+CONFIG_PAGE = PageTemplate("""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>Dworshak Prompt</title>""" + _PAGE_STYLE + """
+</head>
+<body>
+    <div class="card" id="card">
+        <h2>{{message}}</h2>
+        <form id="prompt_form" action="/api/submit_config" method="post" data-request-id="{{request_id}}" data-single="1">
+            <input type="hidden" name="request_id" value="{{request_id}}">
+            <div class="input-group">
+                <input id="input_field" type="{{input_type}}" name="input_value" value="{{suggestion}}" data-key="{{key}}"
+                       autofocus onfocus="this.select()" autocomplete="off" spellcheck="false">
+                {{toggle}}
+            </div>
+            <p class="error" id="error_input_field"></p>
+            <p class="error" id="form_error"></p>
+            <div class="actions">
+                <button type="submit">Submit</button>
+            </div>
+        </form>
+    </div>""" + _SUBMIT_SCRIPT + """
+</body></html>""")
+
+# Multi-field page (/form_modal?request_id=...); one FORM_ROW per field
+FORM_PAGE = PageTemplate("""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>Dworshak Prompt</title>""" + _PAGE_STYLE + """
+</head>
+<body>
+    <div class="card" id="card">
+        <h2>{{message}}</h2>
+        <form id="prompt_form" action="/api/submit_form" method="post" data-request-id="{{request_id}}">
+            <input type="hidden" name="request_id" value="{{request_id}}">
+            {{rows}}
+            <p class="error" id="form_error"></p>
+            <div class="actions">
+                <button type="submit">Submit</button>
+            </div>
+        </form>
+    </div>""" + _SUBMIT_SCRIPT + """
+</body></html>""")
+
+FORM_ROW = PageTemplate("""
+            <label for="field_{{index}}">{{label}}</label>
+            <div class="input-group">
+                <input id="field_{{index}}" type="{{input_type}}" name="field_{{index}}" value="{{suggestion}}" data-key="{{key}}"
+                       {{autofocus}} onfocus="this.select()" autocomplete="off" spellcheck="false">
+                {{toggle}}
+            </div>
+            <p class="error" id="error_field_{{index}}"></p>""")
+
+TOGGLE_BUTTON = PageTemplate(
+    """<button type="button" class="toggle" onclick="toggleSecret(this, '{{input_id}}')">Show</button>"""
+)
+
+
+class _Headers(dict):
+    """Request headers; keys are stored lower-cased and looked up case-insensitively."""
+
+    def get(self, name: str, default=None):
+        return dict.get(self, name.lower(), default)
+
+
+class _Connection:
+    """One client socket on the server loop."""
+    __slots__ = ("sock", "inbuf", "outbuf", "events", "last_active", "keep_alive",
+                 "continued", "served", "stream_manager", "sent_version", "closed")
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.inbuf = bytearray()
+        self.outbuf = bytearray()
+        self.events = selectors.EVENT_READ
+        self.last_active = time.monotonic()
+        self.keep_alive = True
+        # 100 Continue already sent for the request being read
+        self.continued = False
+        # At least one response completed (only such connections count as idle)
+        self.served = False
+        # Set while the connection is a dashboard event stream
+        self.stream_manager = None
+        self.sent_version = None
+        self.closed = False
+
+
+def validate_submission(prompt: dict, payload: dict) -> tuple:
+    """
+    Checks a /api/submit payload against the registered prompt.
+    Returns (value, field_errors); value is what submit_result() stores (a str, or a
+    dict keyed by field key for forms) and field_errors is empty when it is valid.
+    """
+    if "fields" not in prompt:
+        value = payload.get("value")
+        if not isinstance(value, str):
+            return None, {prompt.get("key") or "value": "A text value is required"}
+        return value, {}
+
+    values = payload.get("values")
+    if not isinstance(values, dict):
+        return None, {"values": "An object of field values is required"}
+    keys = [field["key"] for field in prompt["fields"]]
+    errors = {}
+    for key in keys:
+        if key not in values:
+            errors[key] = "Missing value"
+        elif not isinstance(values[key], str):
+            errors[key] = "A text value is required"
+    for key in values:
+        if key not in keys:
+            errors[key] = "Unknown field"
+    if errors:
+        return None, errors
+    return {key: values[key] for key in keys}, {}
+
+
+class PromptHandler:
+    """
+    One parsed HTTP request. Routes mirror http.server's do_GET/do_POST; the response
+    is collected in self.response and written by the server loop.
+    """
+
+    def __init__(self, server: "PromptServer", conn: _Connection, method: str, path: str, headers: _Headers, body: bytes):
+        self.server = server
+        self.conn = conn
+        self.command = method
+        self.path = path
+        self.headers = headers
+        self.body = body
+        self.response = bytearray()
+
+    def handle(self):
+        if self.command == "GET":
+            self.do_GET()
+        elif self.command == "POST":
+            self.do_POST()
+        else:
+            self.send_error(501, f"Unsupported method ({self.command!r})")
 
     def do_GET(self):
         parsed_url = urllib.parse.urlparse(self.path)
@@ -18,146 +480,612 @@ class PromptHandler(http.server.BaseHTTPRequestHandler):
         # USE LOCAL MANAGER FROM SERVER
         manager = self.server.manager
 
-        if parsed_url.path == "/config_modal":
+        if parsed_url.path in ("/", "/dashboard"):
+            page = dashboard_page()
+            self._send_page(page.body, DASHBOARD_CACHE, etag=page.etag, gzipped=page.gzipped)
+        elif parsed_url.path == "/api/events":
+            self._serve_events()
+        elif parsed_url.path == "/config_modal":
             self._serve_html(params)
+        elif parsed_url.path == "/form_modal":
+            self._serve_form_html(params)
         elif parsed_url.path == "/api/get_active_prompt":
             self._serve_json(manager.get_active_prompt())
         else:
             self.send_error(404)
 
     def do_POST(self):
-        if self.path == "/api/submit_config":
-            # 1. Determine how much data to read
-            content_length = int(self.headers.get('Content-Length', 0))
-            if content_length == 0:
+        if self.path == "/api/seen":
+            posted = urllib.parse.parse_qs(self.body.decode('utf-8'))
+            req_id = posted.get('request_id', [None])[0]
+            if req_id:
+                self.server.manager.mark_prompt_seen(req_id)
+            self._serve_json({"ok": bool(req_id)})
+        elif self.path == "/api/submit":
+            self._submit_json()
+        elif self.path == "/api/submit_config":
+            if not self.body:
                 self.send_error(400, "Empty submission")
                 return
 
-            # 2. Read and parse the URL-encoded form data
-            post_data = self.rfile.read(content_length).decode('utf-8')
-            fields = urllib.parse.parse_qs(post_data)
-            
-            # 3. Extract our specific fields
+            # Parse the URL-encoded form data and extract our specific fields
+            fields = urllib.parse.parse_qs(self.body.decode('utf-8'))
             req_id = fields.get('request_id', [None])[0]
             val = fields.get('input_value', [None])[0]
 
             if req_id and val is not None:
                 # --- THE HANDOFF VIA ATTACHED MANAGER ---
-                self.server.manager.submit_result(req_id, val) 
+                if not self.server.manager.submit_result(req_id, val):
+                    self.send_error(410, "Prompt is no longer active")
+                    return
                 self._send_response("<h1>Success</h1><p>Input received. You may now close this tab.</p>")
             else:
                 self.send_error(400, "Missing request_id or input_value")
+        elif self.path == "/api/submit_form":
+            if not self.body:
+                self.send_error(400, "Empty submission")
+                return
+
+            posted = urllib.parse.parse_qs(self.body.decode('utf-8'), keep_blank_values=True)
+            req_id = posted.get('request_id', [None])[0]
+
+            prompt = self.server.manager.get_prompt(req_id) if req_id else None
+            if not prompt or "fields" not in prompt:
+                self.send_error(400, "Unknown or expired request_id")
+                return
+
+            # Inputs are named by position; map them back to the registered keys
+            values = {}
+            for i, field in enumerate(prompt["fields"]):
+                values[field["key"]] = posted.get(f"field_{i}", [""])[0]
+
+            if not self.server.manager.submit_result(req_id, values):
+                self.send_error(410, "Prompt is no longer active")
+                return
+            self._send_response("<h1>Success</h1><p>Input received. You may now close this tab.</p>")
         else:
             self.send_error(404)
 
     def _serve_html(self, params):
+        """Single-value page; the prompt text comes from the manager, not the URL."""
         req_id = params.get('request_id', [''])[0]
-        msg = params.get('message', ['Input Required'])[0]
-        suggestion = params.get('suggestion', [''])[0] 
-        hide = params.get('hide_input', ['false'])[0].lower() == 'true'
-        input_type = "password" if hide else "text"
-        
-        # Only add the Toggle Button and Script if we are in hide mode
-        toggle_html = ""
-        toggle_script = ""
-        if hide:
-            toggle_html = '<button type="button" id="toggleBtn" onclick="toggleSecret()" style="background:#6c757d; margin-left: 5px;">Show</button>'
-            toggle_script = """
-            <script>
-                function toggleSecret() {
-                    var x = document.getElementById("input_field");
-                    var btn = document.getElementById("toggleBtn");
-                    if (x.type === "password") {
-                        x.type = "text";
-                        btn.innerText = "Hide";
-                    } else {
-                        x.type = "password";
-                        btn.innerText = "Show";
-                    }
-                }
-            </script>
-            """
-
-        html = f"""<!DOCTYPE html>
-        <html>
-        <head>
-            <title>Dworshak Prompt</title>
-            <style>
-                body {{ font-family: sans-serif; display: flex; justify-content: center; align-items: center; height: 100vh; margin: 0; background: #f0f2f5; }}
-                .card {{ background: white; padding: 30px; border-radius: 12px; box-shadow: 0 4px 12px rgba(0,0,0,0.15); width: 100%; max-width: 400px; }}
-                h2 {{ margin-top: 0; color: #1c1e21; font-size: 1.2rem; }}
-                .input-group {{ display: flex; margin: 20px 0; }}
-                input {{ flex-grow: 1; padding: 12px; border: 1px solid #ddd; border-radius: 6px; font-size: 1rem; }}
-                button {{ background: #007bff; color: white; border: none; padding: 12px 20px; border-radius: 6px; cursor: pointer; font-weight: bold; }}
-                button:hover {{ opacity: 0.9; }}
-                .actions {{ display: flex; justify-content: flex-end; }}
-            </style>
-        </head>
-        <body>
-            <div class="card">
-                <h2>{msg}</h2>
-                <form action="/api/submit_config" method="post">
-                    <input type="hidden" name="request_id" value="{req_id}">
-                    <div class="input-group">
-                        <input id="input_field" 
-                               type="{input_type}" 
-                               name="input_value" 
-                               value="{suggestion}" 
-                               autofocus 
-                               onfocus="this.select()" 
-                               autocomplete="off" 
-                               spellcheck="false"
-                               required>
-                        {toggle_html}
-                    </div>
-                    <div class="actions">
-                        <button type="submit">Submit</button>
-                    </div>
-                </form>
-            </div>
-            {toggle_script}
-        </body></html>"""
-
-        # Inlined HTML to keep it zero-dep and avoid resource-loading drama
-        html_ = f"""<!DOCTYPE html>
-        <html>
-        <head><title>Prompt</title><style>
-            body {{ font-family: sans-serif; padding: 20px; background: #f0f2f5; }}
-            .card {{ background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
-            input {{ width: 100%; padding: 10px; margin: 10px 0; box-sizing: border-box; }}
-            button {{ background: #007bff; color: white; border: none; padding: 10px 20px; border-radius: 4px; cursor: pointer; }}
-        </style></head>
-        <body>
-            <div class="card">
-                <h2>{msg}</h2>
-                <form action="/api/submit_config" method="post">
-                    <input type="hidden" name="request_id" value="{req_id}">
-                    <input type="{input_type}" name="input_value" value="{suggestion}" autofocus onfocus="this.select()" required>
-                    <button type="submit">Submit</button>
-                </form>
-            </div>
-        </body></html>"""
-        self._send_response(html, "text/html")
+        prompt = self.server.manager.get_prompt(req_id)
+        if not prompt or "fields" in prompt:
+            self.send_error(404, "Unknown or expired request_id")
+            return
 
-    def _send_response(self, content, content_type="text/html"):
+        hide = prompt.get("is_credential", False)
+        body = CONFIG_PAGE.render(
+            request_id=req_id,
+            message=prompt.get("message") or "Input Required",
+            suggestion=prompt.get("suggestion") or "",
+            key=prompt.get("key") or "",
+            input_type="password" if hide else "text",
+            toggle=TOGGLE_BUTTON.render(input_id="input_field") if hide else b"",
+        )
+        self._send_page(body, cache_control=PROMPT_PAGE_CACHE_SECRET if hide else PROMPT_PAGE_CACHE)
+
+    def _serve_form_html(self, params):
+        """Multi-field page for ask_many(); field data comes from the manager, not the URL."""
+        req_id = params.get('request_id', [''])[0]
+        prompt = self.server.manager.get_prompt(req_id)
+        if not prompt or "fields" not in prompt:
+            self.send_error(404, "Unknown or expired request_id")
+            return
+
+        rows = []
+        any_hidden = False
+        for i, field in enumerate(prompt["fields"]):
+            hide = field.get("is_credential", False)
+            any_hidden = any_hidden or hide
+            rows.append(FORM_ROW.render(
+                index=i,
+                key=field["key"],
+                label=field.get("message") or field["key"],
+                input_type="password" if hide else "text",
+                suggestion=field.get("suggestion") or "",
+                autofocus=b"autofocus" if i == 0 else b"",
+                toggle=TOGGLE_BUTTON.render(input_id=f"field_{i}") if hide else b"",
+            ))
+        body = FORM_PAGE.render(
+            message=prompt.get("message") or "Input Required",
+            request_id=req_id,
+            rows=b"".join(rows),
+        )
+        self._send_page(body, cache_control=PROMPT_PAGE_CACHE_SECRET if any_hidden else PROMPT_PAGE_CACHE)
+
+    def _submit_json(self):
+        """
+        POST /api/submit, JSON in and out:
+            {"request_id": ..., "value": "..."}               single-value prompt
+            {"request_id": ..., "values": {"key": "...", ...}} form (every field key)
+        Answers {"ok": true, "request_id", "pending"} (prompts still waiting), or
+        {"ok": false, "error", "field_errors": {key: message}} with 400 (malformed),
+        410 (prompt no longer active) or 422 (values don't fit the prompt).
+        Requiring application/json means a cross-site page can't submit without a CORS
+        preflight, which this server never grants.
+        """
+        if self.headers.get("Content-Type", "").split(";")[0].strip().lower() != "application/json":
+            self._send_json(415, {"ok": False, "error": "Content-Type must be application/json"})
+            return
+        try:
+            payload = json.loads(self.body.decode("utf-8"))
+        except (UnicodeDecodeError, ValueError):
+            self._send_json(400, {"ok": False, "error": "Body is not valid JSON"})
+            return
+        if not isinstance(payload, dict) or not isinstance(payload.get("request_id"), str):
+            self._send_json(400, {"ok": False, "error": "Missing request_id"})
+            return
+
+        manager = self.server.manager
+        req_id = payload["request_id"]
+        prompt = manager.get_prompt(req_id)
+        if prompt is None:
+            self._send_json(410, {"ok": False, "error": "This prompt is no longer active"})
+            return
+        value, field_errors = validate_submission(prompt, payload)
+        if field_errors:
+            self._send_json(422, {"ok": False, "error": "Please correct the highlighted fields", "field_errors": field_errors})
+            return
+        if not manager.submit_result(req_id, value):
+            self._send_json(410, {"ok": False, "error": "This prompt is no longer active"})
+            return
+        self._send_json(200, {"ok": True, "request_id": req_id, "pending": manager.pending_count()})
+
+    def _serve_events(self):
+        """
+        Server-Sent Events stream for the dashboard. The connection is handed to the
+        server loop, which pushes the active prompt whenever the manager's prompt_version
+        changes and heartbeats otherwise, until the tab closes or the server stops.
+        """
+        if self.server.event_stream_count() >= MAX_EVENT_STREAMS:
+            self.send_error(503, "Too many dashboard connections")
+            return
         self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.server.open_event_stream(self.conn)
+
+    # --- response primitives (the subset of http.server's API the routes use) ---
+
+    def send_response(self, code: int):
+        self.response += f"HTTP/1.1 {code} {_reason(code)}\r\n".encode("latin-1")
+
+    def send_header(self, name: str, value: str):
+        self.response += f"{name}: {value}\r\n".encode("latin-1")
+
+    def end_headers(self):
+        if not self.conn.keep_alive:
+            self.response += b"Connection: close\r\n"
+        self.response += b"\r\n"
+
+    def send_error(self, code: int, message: str | None = None):
+        body = html_lib.escape(message or _reason(code)).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.response += body
+
+    def _send_response(self, content, content_type="text/html"):
+        self._send_bytes(content.encode("utf-8"), content_type, cache_control="no-store")
+
+    def _send_page(self, body: bytes, cache_control: str, etag: str | None = None, gzipped: bytes | None = None):
+        """
+        HTML with an ETag (a matching If-None-Match gets 304, no body) and gzip when the
+        client accepts it. Static pages pass their precomputed etag and gzipped bytes.
+        """
+        etag = etag or page_etag(body)
+        known = _parse_etags(self.headers.get("If-None-Match", ""))
+        if etag in known or "*" in known:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", cache_control)
+            self.end_headers()
+            return
+        encoding = None
+        if len(body) >= GZIP_MIN_BYTES and _accepts_gzip(self.headers.get("Accept-Encoding", "")):
+            body = gzipped if gzipped is not None else gzip_bytes(body)
+            encoding = "gzip"
+        self._send_bytes(body, "text/html", cache_control, etag=etag, encoding=encoding)
+
+    def _send_bytes(self, body: bytes, content_type: str, cache_control: str, etag: str | None = None, encoding: str | None = None, status: int = 200):
+        self.send_response(status)
         self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", cache_control)
+        if etag:
+            self.send_header("ETag", etag)
+        if content_type == "text/html":
+            self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
         self.end_headers()
-        self.wfile.write(content.encode("utf-8"))
+        self.response += body
 
     def _serve_json(self, data):
         self._send_response(json.dumps(data or {"show": False}), "application/json")
 
+    def _send_json(self, status: int, data: dict):
+        self._send_bytes(json.dumps(data).encode("utf-8"), "application/json", "no-store", status=status)
+
+
+def _reason(code: int) -> str:
+    try:
+        return HTTPStatus(code).phrase
+    except ValueError:
+        return ""
+
+
+def _parse_request(head: bytes):
+    """(method, path, version, headers) from the request line and header block, or None if malformed."""
+    lines = head.decode("latin-1").split("\r\n")
+    parts = lines[0].split()
+    if len(parts) != 3 or not parts[2].startswith("HTTP/1."):
+        return None
+    headers = _Headers()
+    for line in lines[1:]:
+        name, sep, value = line.partition(":")
+        if not sep:
+            return None
+        headers[name.strip().lower()] = value.strip()
+    return parts[0], parts[1], parts[2], headers
+
+
 # Global reference to the running server so we can shut it down cleanly
-_current_server: ThreadedServer | None = None
+_current_server: PromptServer | None = None
+_current_thread: threading.Thread | None = None
+# Web prompts between acquire_prompt_server() and release_prompt_server()
+_server_users = 0
+_server_lock = threading.Lock()
+
+
+class PromptServer:
+    """
+    HTTP/1.1 server on a single selector loop: keep-alive connections, dashboard event
+    streams and the listener are all multiplexed on one thread, so the thread count
+    stays constant however many tabs or clients connect. Request handlers only touch
+    the PromptManager (non-blocking), so running them inline on the loop is safe.
+
+    At most MAX_CONNECTIONS sockets are open; past that the oldest idle keep-alive
+    connection is closed, or, if none is idle, new connections wait in the listen backlog.
+    """
+
+    def __init__(self, address: tuple, handler_class=PromptHandler):
+        self.handler_class = handler_class
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.socket.bind(address)
+            # A short backlog resets connections when many prompts are answered at once
+            self.socket.listen(socket.SOMAXCONN)
+            self.socket.setblocking(False)
+        except OSError:
+            self.socket.close()
+            raise
+        self.server_address = self.socket.getsockname()[:2]
+        self.stopping = threading.Event()
+        # Self-pipe: writing to it wakes the loop's select() immediately
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_w.setblocking(False)
+        self._connections: dict = {}
+        self._accepting = True
+        self._prompts_changed = False
+        self._manager = None
+        self._selector = None
+
+    # The server follows manager hot-swaps (run_prompt_server_in_thread re-points it)
+    @property
+    def manager(self):
+        return self._manager
+
+    @manager.setter
+    def manager(self, manager):
+        if self._manager is not None:
+            self._manager.remove_change_listener(self._on_prompts_changed)
+        self._manager = manager
+        manager.add_change_listener(self._on_prompts_changed)
+        self._on_prompts_changed()
 
-class ThreadedServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
-    allow_reuse_address = True
-    daemon_threads = True
+    def _on_prompts_changed(self):
+        # Any thread: flag it and wake the loop, which pushes to the open streams
+        self._prompts_changed = True
+        self._wake()
+
+    def _wake(self):
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            pass  # Buffer full: a wake-up is already pending
+
+    def serve_until_stopped(self):
+        """
+        Runs the loop until request_stop(). select() blocks until the next keep-alive
+        expiry or heartbeat is due, never on a fixed polling tick.
+        """
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self.socket, selectors.EVENT_READ)
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
+        try:
+            while not self.stopping.is_set():
+                for key, events in self._selector.select(self._next_timeout()):
+                    if key.fileobj is self.socket:
+                        self._accept()
+                    elif key.fileobj is self._wake_r:
+                        try:
+                            self._wake_r.recv(4096)
+                        except OSError:
+                            pass
+                    else:
+                        conn = key.data
+                        if events & selectors.EVENT_WRITE:
+                            self._flush(conn)
+                            if not conn.closed and not conn.outbuf and conn.inbuf:
+                                self._process(conn)  # Pipelined request waiting behind that response
+                        if events & selectors.EVENT_READ and not conn.closed:
+                            self._read(conn)
+                if self._prompts_changed:
+                    self._prompts_changed = False
+                    self._push_prompts()
+                self._expire()
+        finally:
+            for conn in list(self._connections.values()):
+                self._close(conn)
+            self._selector.close()
+
+    def request_stop(self):
+        self.stopping.set()
+        self._wake()
+
+    def server_close(self):
+        if self._manager is not None:
+            self._manager.remove_change_listener(self._on_prompts_changed)
+        self.socket.close()
+        self._wake_r.close()
+        self._wake_w.close()
+
+    # --- connections ---
+
+    def _accept(self):
+        while True:
+            if len(self._connections) >= MAX_CONNECTIONS and not self._evict_idle():
+                # Leave the rest in the listen backlog until a connection closes
+                self._selector.unregister(self.socket)
+                self._accepting = False
+                return
+            try:
+                sock, _ = self.socket.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            sock.setblocking(False)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            conn = _Connection(sock)
+            self._connections[sock.fileno()] = conn
+            self._selector.register(sock, selectors.EVENT_READ, conn)
 
-def run_prompt_server_in_thread(manager,port=8083):
-    global _current_server
-    
+    def _evict_idle(self) -> bool:
+        """Closes the longest-idle keep-alive connection between requests; False if none."""
+        idle = [
+            c for c in self._connections.values()
+            if c.served and c.stream_manager is None and not c.inbuf and not c.outbuf
+        ]
+        if not idle:
+            return False
+        self._close(min(idle, key=lambda c: c.last_active))
+        return True
+
+    def _close(self, conn: _Connection):
+        if conn.closed:
+            return
+        conn.closed = True
+        if conn.stream_manager is not None:
+            conn.stream_manager.detach_dashboard()
+            conn.stream_manager = None
+        try:
+            self._selector.unregister(conn.sock)
+        except (KeyError, ValueError):
+            pass
+        self._connections.pop(conn.sock.fileno(), None)
+        conn.sock.close()
+        if not self._accepting and not self.stopping.is_set():
+            self._selector.register(self.socket, selectors.EVENT_READ)
+            self._accepting = True
+
+    def _read(self, conn: _Connection):
+        try:
+            data = conn.sock.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._close(conn)
+            return
+        conn.last_active = time.monotonic()
+        if conn.stream_manager is not None:
+            return  # Nothing is expected from an event stream; EOF above is what matters
+        conn.inbuf += data
+        self._process(conn)
+
+    def _process(self, conn: _Connection):
+        """Handles every complete request buffered on conn, one response at a time."""
+        while not conn.closed and not conn.outbuf and conn.stream_manager is None:
+            head_end = conn.inbuf.find(b"\r\n\r\n")
+            if head_end < 0:
+                if len(conn.inbuf) > MAX_HEADER_BYTES:
+                    self._reject(conn, 431)
+                return
+            request = _parse_request(bytes(conn.inbuf[:head_end]))
+            if request is None:
+                self._reject(conn, 400)
+                return
+            method, path, version, headers = request
+            if headers.get("Transfer-Encoding"):
+                self._reject(conn, 411)
+                return
+            try:
+                length = int(headers.get("Content-Length", 0))
+            except ValueError:
+                self._reject(conn, 400)
+                return
+            if length < 0 or length > MAX_BODY_BYTES:
+                self._reject(conn, 413)
+                return
+            body_start = head_end + 4
+            if len(conn.inbuf) < body_start + length:
+                if headers.get("Expect", "").lower() == "100-continue" and not conn.continued:
+                    conn.continued = True
+                    self._send(conn, b"HTTP/1.1 100 Continue\r\n\r\n")
+                return
+            body = bytes(conn.inbuf[body_start:body_start + length])
+            del conn.inbuf[:body_start + length]
+            conn.continued = False
+
+            connection = headers.get("Connection", "").lower()
+            if version == "HTTP/1.0":
+                conn.keep_alive = connection == "keep-alive"
+            else:
+                conn.keep_alive = connection != "close"
+
+            handler = self.handler_class(self, conn, method, path, headers, body)
+            try:
+                handler.handle()
+            except Exception as e:
+                logger.debug(f"[DIAGNOSTIC] Prompt server handler failed for {method} {path}: {e!r}")
+                conn.keep_alive = False
+                handler.response.clear()
+                handler.send_error(500)
+            conn.served = True
+            self._send(conn, handler.response)
+            if conn.stream_manager is not None:
+                self._push_stream(conn)
+
+    def _reject(self, conn: _Connection, code: int):
+        conn.keep_alive = False
+        handler = self.handler_class(self, conn, "", "", _Headers(), b"")
+        handler.send_error(code)
+        self._send(conn, handler.response)
+
+    def _send(self, conn: _Connection, data: bytes):
+        conn.outbuf += data
+        self._flush(conn)
+
+    def _flush(self, conn: _Connection):
+        if conn.outbuf:
+            try:
+                sent = conn.sock.send(conn.outbuf)
+                del conn.outbuf[:sent]
+            except (BlockingIOError, InterruptedError):
+                pass
+            except OSError:
+                self._close(conn)
+                return
+        if conn.outbuf:
+            if len(conn.outbuf) > MAX_BUFFERED_OUTPUT:
+                self._close(conn)  # Client stopped reading
+                return
+            self._watch(conn, selectors.EVENT_READ | selectors.EVENT_WRITE)
+            return
+        self._watch(conn, selectors.EVENT_READ)
+        if not conn.keep_alive and conn.stream_manager is None:
+            self._close(conn)
+
+    def _watch(self, conn: _Connection, events: int):
+        if conn.events != events and not conn.closed:
+            conn.events = events
+            self._selector.modify(conn.sock, events, conn)
+
+    # --- dashboard event streams ---
+
+    def event_stream_count(self) -> int:
+        return sum(1 for c in self._connections.values() if c.stream_manager is not None)
+
+    def open_event_stream(self, conn: _Connection):
+        conn.stream_manager = self._manager
+        conn.sent_version = None
+        conn.keep_alive = True
+        self._manager.attach_dashboard()
+
+    def _push_prompts(self):
+        payloads = {}
+        for conn in [c for c in self._connections.values() if c.stream_manager is not None]:
+            self._push_stream(conn, payloads)
+
+    def _push_stream(self, conn: _Connection, payloads: dict | None = None):
+        """Sends the active prompt to one stream if it hasn't seen the current version."""
+        if conn.stream_manager is not self._manager:
+            # Manager was hot-swapped; follow it
+            conn.stream_manager.detach_dashboard()
+            conn.stream_manager = self._manager
+            self._manager.attach_dashboard()
+            conn.sent_version = None
+        manager = conn.stream_manager
+        version = manager.prompt_version
+        if version == conn.sent_version:
+            return
+        payload = payloads.get(version) if payloads is not None else None
+        if payload is None:
+            active = manager.get_active_prompt()
+            payload = json.dumps(
+                dict(active, queued=manager.pending_count() - 1) if active else {"show": False}
+            )
+            if payloads is not None:
+                payloads[version] = payload
+        conn.sent_version = version
+        conn.last_active = time.monotonic()
+        self._send(conn, f"data: {payload}\n\n".encode("utf-8"))
+
+    # --- timers ---
+
+    def _deadline(self, conn: _Connection) -> float:
+        if conn.stream_manager is not None:
+            return conn.last_active + SSE_HEARTBEAT_SECONDS
+        return conn.last_active + KEEPALIVE_TIMEOUT
+
+    def _next_timeout(self) -> float | None:
+        if not self._connections:
+            return None
+        soonest = min(self._deadline(c) for c in self._connections.values())
+        return max(0.0, soonest - time.monotonic())
+
+    def _expire(self):
+        """Heartbeats streams that went quiet and closes keep-alive connections idle too long."""
+        now = time.monotonic()
+        for conn in list(self._connections.values()):
+            if conn.closed or self._deadline(conn) > now:
+                continue
+            if conn.stream_manager is not None:
+                conn.last_active = now
+                self._send(conn, b": ping\n\n")
+            else:
+                self._close(conn)
+
+
+def run_prompt_server_in_thread(manager, port: int = 0):
+    """
+    Starts the prompt server on 127.0.0.1 and points manager at it.
+    port=0 lets the OS assign a free port; an explicit port that is busy raises OSError.
+    The listening socket accepts connections as soon as this returns.
+    """
+    with _server_lock:
+        return _start_locked(manager, port)
+
+def acquire_prompt_server(manager):
+    """
+    run_prompt_server_in_thread() for one web prompt. The server is held until the
+    matching release_prompt_server(), so another prompt finishing can't stop it first.
+    """
+    global _server_users
+    with _server_lock:
+        thread = _start_locked(manager, 0)
+        _server_users += 1
+        return thread
+
+def _start_locked(manager, port: int):
+    global _current_server, _current_thread
     # Don't spin up multiple servers if one is already active
     if _current_server is not None:
         #logger.debug(f"[DIAGNOSTIC] Server already active. Hot-swapping manager: {id(manager)}")
@@ -166,23 +1094,59 @@ def run_prompt_server_in_thread(manager,port=8083):
         host, actual_port = _current_server.server_address
         manager.set_server_host_port(f"{host}:{actual_port}")
         return None
-    
 
-    port = find_open_port(port)
-    _current_server = ThreadedServer(("127.0.0.1", port), PromptHandler)
-    _current_server.manager = manager
-    manager.set_server_host_port(f"127.0.0.1:{port}")
+    server = PromptServer(("127.0.0.1", port))
+    server.manager = manager
+    host, actual_port = server.server_address
+    manager.set_server_host_port(f"{host}:{actual_port}")
 
-    thread = threading.Thread(target=_current_server.serve_forever, daemon=True)
+    thread = threading.Thread(target=server.serve_until_stopped, daemon=True, name="dworshak-prompt-server")
     thread.start()
+    _current_server, _current_thread = server, thread
     return thread
 
+def prompt_server_running() -> bool:
+    """In-process check; no HTTP round trip."""
+    with _server_lock:
+        return _current_server is not None and _current_thread is not None and _current_thread.is_alive()
+
 def stop_prompt_server():
     """Tells the server to stop the loop and release the socket."""
-    global _current_server
-    if _current_server:
-        # shutdown() stops the serve_forever() loop
-        _current_server.shutdown()
-        # server_close() releases the socket port
-        _current_server.server_close()
-        _current_server = None
\ No newline at end of file
+    with _server_lock:
+        server, thread = _detach_locked()
+    _shutdown(server, thread)
+
+def _detach_locked():
+    global _current_server, _current_thread
+    server, thread = _current_server, _current_thread
+    _current_server, _current_thread = None, None
+    return server, thread
+
+def _shutdown(server: PromptServer | None, thread: threading.Thread | None):
+    if server is None:
+        return
+
+    # The loop closes open connections, dashboard streams included, on its way out
+    server.request_stop()
+    if thread is not None and thread is not threading.current_thread():
+        thread.join()
+    # server_close() releases the socket port
+    server.server_close()
+
+def release_prompt_server():
+    """
+    Called when a web prompt that acquired the server finishes. The server stops only
+    when no other prompt holds it, no dashboard tab is connected (so the next prompt is
+    pushed to that tab instead of a new one) and nothing is pending. The check and the
+    detach happen under one lock, so a prompt acquiring the server meanwhile keeps it.
+    """
+    global _server_users
+    with _server_lock:
+        _server_users = max(0, _server_users - 1)
+        server = _current_server
+        if server is None or _server_users > 0:
+            return
+        if server.manager.dashboard_connected() or server.manager.pending_count() > 0:
+            return
+        server, thread = _detach_locked()
+    _shutdown(server, thread)
@@ -0,0 +1,215 @@
+# src/dworshak_prompt/store_cache.py
+"""
+Process-wide cache of DworshakConfig / DworshakEnv instances, keyed by resolved path.
+get_config_store()/get_env_store() find an already cached store by the path argument
+they were given, without constructing or resolving anything.
+
+Each cached store keeps the parsed file in memory and revalidates it with a single
+os.stat() per lookup: a changed (mtime_ns, size, inode) means the file was edited
+outside this process and is re-read. Writes made through the store (set(), remove(),
+DworshakObtain.*_many) update the cached copy in place, so the next lookup is a
+dictionary hit rather than a re-read. atomic_save() is the durable write used by
+DworshakObtain.session(): temp file, fsync, rename, fsync of the directory.
+"""
+from __future__ import annotations
+import copy
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+import logging
+
+from dworshak_config import DworshakConfig
+from dworshak_env import DworshakEnv
+
+logger = logging.getLogger("dworshak_prompt")
+
+_Signature = Tuple[int, int, int]
+
+
+def _signature(path: Path) -> _Signature | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _fsync_dir(directory: Path):
+    # Makes the rename itself durable; not possible on every platform (e.g. Windows)
+    try:
+        fd = os.open(directory, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _config_text(data: dict) -> str:
+    # Same layout as DworshakConfig._save()
+    return json.dumps(data, indent=4)
+
+
+def _env_text(data: dict) -> str:
+    # Same layout as DworshakEnv._save()
+    return "".join(f"{k}={v}\n" for k, v in data.items())
+
+
+class _CachedFileMixin:
+    """
+    Shared revalidation logic. Subclasses combine it with the store class whose
+    load()/_save() it wraps and set `_serialize` to the file format's writer;
+    `_cached_data()` is the read-only parsed file.
+    """
+
+    _serialize: Callable[[dict], str]
+
+    def _init_cache(self):
+        self._cache_lock = threading.RLock()
+        self._cache_sig: _Signature | None = None
+        self._cache_data: dict | None = None
+
+    def _cached_data(self) -> dict:
+        sig = _signature(self.path)
+        with self._cache_lock:
+            if self._cache_data is None or sig != self._cache_sig:
+                if self._cache_data is not None:
+                    logger.debug(f"[DIAGNOSTIC] {self.path} changed on disk; reloading.")
+                self._cache_data = super().load()
+                self._cache_sig = sig
+            return self._cache_data
+
+    def load(self) -> dict:
+        # Callers (set/remove) mutate what load() returns; keep the cached copy pristine
+        return copy.deepcopy(self._cached_data())
+
+    def _save(self, data: dict):
+        with self._cache_lock:
+            before = _signature(self.path)
+            super()._save(data)
+            after = _signature(self.path)
+            if after is not None and after != before:
+                self._cache_data = copy.deepcopy(data)
+                self._cache_sig = after
+            else:
+                # The store logs and swallows write errors; don't trust memory over disk
+                self.invalidate()
+
+    def atomic_save(self, data: dict):
+        """
+        Durable alternative to _save(): write a temp file in the same directory, fsync it,
+        rename it over the original and fsync the directory. Readers see either the old
+        or the new file, never a partial one. Raises OSError on failure.
+        """
+        import tempfile
+        with self._cache_lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(self._serialize(data))
+                    f.flush()
+                    os.fsync(f.fileno())
+                if self.path.exists():
+                    os.chmod(temp_name, self.path.stat().st_mode & 0o777)
+                os.replace(temp_name, self.path)
+            except BaseException:
+                try:
+                    os.unlink(temp_name)
+                except OSError:
+                    pass
+                raise
+            _fsync_dir(self.path.parent)
+            self._cache_data = copy.deepcopy(data)
+            self._cache_sig = _signature(self.path)
+
+    def invalidate(self):
+        """Forces the next lookup to re-read the file."""
+        with self._cache_lock:
+            self._cache_data = None
+            self._cache_sig = None
+
+
+class CachedConfig(_CachedFileMixin, DworshakConfig):
+    """DworshakConfig whose get() is served from memory while the file is unchanged."""
+
+    _serialize = staticmethod(_config_text)
+
+    def __init__(self, path: str | Path | None = None):
+        DworshakConfig.__init__(self, path=path)
+        self._init_cache()
+
+    def get(self, service: str, item: str) -> str | None:
+        return self._cached_data().get(service, {}).get(item)
+
+
+class CachedEnv(_CachedFileMixin, DworshakEnv):
+    """DworshakEnv whose .env file reads are served from memory while the file is unchanged."""
+
+    _serialize = staticmethod(_env_text)
+
+    def __init__(self, path: str | Path | None = None):
+        DworshakEnv.__init__(self, path=path)
+        self._init_cache()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        # Same priority as DworshakEnv.get(): os.environ, .env file, defaults, argument
+        val = os.getenv(key)
+        if val is not None:
+            return val
+        file_values = self._cached_data()
+        if key in file_values:
+            return file_values[key]
+        return self.defaults.get(key, default)
+
+
+_stores: Dict[Tuple[str, Path], _CachedFileMixin] = {}
+# Fast path: the same store by the caller's own path argument, so a repeated lookup is one
+# dict hit with no construction or Path.resolve(). Filled only under _stores_lock.
+_stores_by_argument: Dict[tuple, _CachedFileMixin] = {}
+_stores_lock = threading.Lock()
+
+
+def _argument_key(kind: str, path: str | Path | None) -> tuple:
+    # Relative paths and the defaults (e.g. ./.env) depend on the working directory
+    if path is not None and os.path.isabs(path):
+        return (kind, path)
+    return (kind, path, os.getcwd())
+
+
+def _shared(kind: str, path: str | Path | None, factory: Callable[..., _CachedFileMixin]):
+    key = _argument_key(kind, path)
+    store = _stores_by_argument.get(key)
+    if store is not None:
+        return store
+    # Constructing applies the store's own default-path rules
+    store = factory(path=path)
+    resolved = store.path.expanduser().resolve()
+    # Pin the absolute path so a later chdir can't point a cached ".env" elsewhere
+    store.path = resolved
+    with _stores_lock:
+        store = _stores.setdefault((kind, resolved), store)
+        _stores_by_argument[key] = store
+        return store
+
+
+def get_config_store(path: str | Path | None = None) -> CachedConfig:
+    """Returns the process-wide CachedConfig for path (default config path if None)."""
+    return _shared("config", path, CachedConfig)
+
+
+def get_env_store(path: str | Path | None = None) -> CachedEnv:
+    """Returns the process-wide CachedEnv for path (./.env if None)."""
+    return _shared("env", path, CachedEnv)
+
+
+def clear_store_cache() -> None:
+    """Drops every cached store instance."""
+    with _stores_lock:
+        _stores.clear()
+        _stores_by_argument.clear()
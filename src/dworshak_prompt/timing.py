@@ -0,0 +1,198 @@
+# src/dworshak_prompt/timing.py
+"""
+Per-phase timing spans for DworshakPrompt.ask()/ask_many() and DworshakObtain.*.
+
+    add_timing_hook(fn)       fn(span) is called as each Span ends
+    remove_timing_hook(fn)
+    log_timing_spans()        structured-log sink: one JSON object per span on the
+                              "dworshak_prompt.timing" logger (INFO)
+
+Setting DWORSHAK_PROMPT_TIMING_LOG=1 installs the log sink when this module is first imported.
+
+Span names:
+    ask / ask_many            total, with the mode that answered and the outcome
+    capabilities              capability snapshot + mode planning
+    mode                      one backend attempt: mode, outcome, and reason on fall-through
+    web.broker                prompt routed through a `dworshak-prompt broker`
+    web.server                start (or hot-swap) of the prompt server
+    web.present               dashboard reuse or browser launch
+    web.browser_launch        the launcher itself
+    web.page_seen             prompt shown -> dashboard acknowledged it
+    web.user_input            dashboard acknowledged -> answer submitted (think time)
+    gui.start                 Tk root creation on the GUI thread (first GUI prompt of the process)
+    obtain.<method>           total of a DworshakObtain call
+    agent.lookup              value requested from a running `dworshak-prompt agent`
+    store.lookup / store.persist / session.flush
+
+With no hook installed, span() returns a shared no-op object: no clock reads and no allocation.
+"""
+from __future__ import annotations
+import contextvars
+import itertools
+import os
+import sys
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, Optional
+import functools
+import inspect
+import logging
+
+logger = logging.getLogger("dworshak_prompt")
+
+
+@dataclass
+class Span:
+    name: str
+    start: float          # time.perf_counter() at entry
+    duration_ms: float
+    attrs: Dict[str, Any] = field(default_factory=dict)
+    span_id: int = 0
+    parent_id: Optional[int] = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+_hooks: tuple = ()
+_ids = itertools.count(1)
+_current: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar("dworshak_span", default=None)
+
+
+def add_timing_hook(hook: Callable[[Span], None]) -> None:
+    global _hooks
+    if hook not in _hooks:
+        _hooks = _hooks + (hook,)
+
+
+def remove_timing_hook(hook: Callable[[Span], None]) -> None:
+    global _hooks
+    _hooks = tuple(h for h in _hooks if h != hook)
+
+
+def timing_enabled() -> bool:
+    return bool(_hooks)
+
+
+def _emit(span: Span):
+    for hook in _hooks:
+        try:
+            hook(span)
+        except Exception as e:
+            # A broken hook must never break a prompt
+            logger.debug(f"[DIAGNOSTIC] Timing hook {hook!r} failed: {e!r}")
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _ActiveSpan:
+    __slots__ = ("name", "attrs", "span_id", "parent_id", "start", "_token")
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        self.span_id = next(_ids)
+        self.parent_id = _current.get()
+        self._token = _current.set(self.span_id)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        _current.reset(self._token)
+        if exc_type is not None:
+            self.attrs.setdefault("error", exc_type.__name__)
+        _emit(Span(self.name, self.start, (end - self.start) * 1000, self.attrs, self.span_id, self.parent_id))
+        return False
+
+
+def span(name: str, **attrs):
+    """Context manager timing one phase; `.set(**attrs)` adds attributes before it ends."""
+    if not _hooks:
+        return _NOOP
+    return _ActiveSpan(name, attrs)
+
+
+def record(name: str, start: float, end: float, **attrs) -> None:
+    """Emits a span after the fact, for phases observed by another thread (e.g. the server)."""
+    if not _hooks:
+        return
+    _emit(Span(name, start, (end - start) * 1000, attrs, next(_ids), _current.get()))
+
+
+def timed(name: str, *arg_names: str):
+    """
+    Decorator: wraps a function or coroutine function in span(name), recording the
+    named arguments as attributes. Only a truthiness check when no hook is installed.
+    """
+    def decorate(fn):
+        signature = inspect.signature(fn)
+
+        def attrs_for(args, kwargs):
+            if not arg_names:
+                return {}
+            bound = signature.bind_partial(*args, **kwargs).arguments
+            return {k: bound[k] for k in arg_names if k in bound}
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if not _hooks:
+                    return await fn(*args, **kwargs)
+                with _ActiveSpan(name, attrs_for(args, kwargs)):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _hooks:
+                return fn(*args, **kwargs)
+            with _ActiveSpan(name, attrs_for(args, kwargs)):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _log_sink(span: Span):
+    import json
+    logging.getLogger("dworshak_prompt.timing").info(json.dumps(span.to_dict(), default=str))
+
+
+def log_timing_spans() -> Callable[[Span], None]:
+    """
+    Installs the structured-log sink and returns it (pass it to remove_timing_hook to stop).
+    Without handlers of its own, the "dworshak_prompt.timing" logger writes to stderr so
+    spans never interleave with prompts on stdout.
+    """
+    timing_logger = logging.getLogger("dworshak_prompt.timing")
+    timing_logger.setLevel(logging.INFO)
+    if not timing_logger.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        timing_logger.addHandler(handler)
+        timing_logger.propagate = False
+    add_timing_hook(_log_sink)
+    return _log_sink
+
+
+if os.environ.get("DWORSHAK_PROMPT_TIMING_LOG", "").lower() in ("1", "true", "yes"):
+    log_timing_spans()
@@ -1,41 +1,144 @@
 # src/dworshak_prompt/web_prompt.py
-from __future__ import annotations 
+from __future__ import annotations
 import threading
-import urllib.parse 
 import time
-from typing import Any
+from typing import Any, Dict, List
 
 from .prompt_manager import PromptManager # for type hinting
-from .browser_utils import launch_browser, is_server_running
+from .prompt_field import PromptField
+from .browser_utils import launch_browser
+from .server import acquire_prompt_server, release_prompt_server
+from .timing import span, record, timing_enabled
+
+# How long a connected dashboard tab gets to acknowledge a pushed prompt before a new tab is launched
+DASHBOARD_ACK_TIMEOUT = 1.5
+
+def _ensure_server(manager: PromptManager) -> str:
+    # Starts the server, or re-points the running one at manager, and holds it until the
+    # caller's release_prompt_server(); state is tracked in-process
+    with span("web.server"):
+        acquire_prompt_server(manager)
+    return manager.get_server_url()
+
+def _present(manager: PromptManager, url: str, req_id: str):
+    """
+    Shows the prompt: reuse a connected dashboard tab if it acknowledges the push,
+    otherwise launch the browser on the dashboard page (which then stays open).
+    """
+    with span("web.present") as present:
+        if manager.dashboard_connected() and manager.wait_until_seen(req_id, DASHBOARD_ACK_TIMEOUT):
+            present.set(dashboard="reused")
+            return
+        present.set(dashboard="launched")
+        with span("web.browser_launch"):
+            launch_browser(f"{url}/dashboard")
+
+def _wait(manager: PromptManager, req_id: str, stop_event: threading.Event | None):
+    """wait_for_result, split into page_seen / user_input spans when timing hooks are installed."""
+    if not timing_enabled():
+        return manager.wait_for_result(req_id, stop_event=stop_event)
+    shown = time.perf_counter()
+    result = manager.wait_for_result(req_id, stop_event=stop_event)
+    _record_seen(manager, req_id, shown, answered=result is not None)
+    return result
+
+def _record_seen(manager: PromptManager, req_id: str, shown: float, answered: bool):
+    done = time.perf_counter()
+    seen = manager.seen_time(req_id)
+    if seen is None:
+        record("web.user_input", shown, done, answered=answered, acknowledged=False)
+        return
+    record("web.page_seen", shown, max(shown, seen))
+    record("web.user_input", max(shown, seen), done, answered=answered)
+
+def _via_broker(request: dict, stop_event: threading.Event | None):
+    """
+    Routes the prompt through a running `dworshak-prompt broker` (one web UI for every
+    local process). Returns (handled, value); (False, None) means serve it locally.
+    """
+    from . import broker
+    if not broker.broker_enabled():
+        return False, None
+    with span("web.broker") as routed:
+        handled, value = broker.ask_broker(request, stop_event)
+        routed.set(handled=handled)
+    return handled, value
 
 def browser_get_input(message: str, suggestion: str | None = None, hide: bool = False, manager: PromptManager = None, stop_event: threading.Event | None = None) -> str | None:
-    
-    url = manager.get_server_url()
-    # Launch logic remains the same
-    if not is_server_running(url):
-        from .server import run_prompt_server_in_thread
-        run_prompt_server_in_thread(manager)
-        url = manager.get_server_url()
-    req_id = manager.register_prompt("input_key", message, hide, suggestion=suggestion)
-    
-    encoded_msg = urllib.parse.quote_plus(message)
-    encoded_sug = urllib.parse.quote_plus(suggestion or "")
-    full_url = f"{url}/config_modal?request_id={req_id}&message={encoded_msg}&hide_input={hide}&suggestion={encoded_sug}"
-    launch_browser(full_url)
-
-    # The Polling Loop
-    while True:
-        # 1. Check if the external shutdown event was triggered
-        if stop_event and stop_event.is_set(): return None
-        
-        # 2. Check if the user submitted data
-        val = manager.get_and_clear_result(req_id)
-        if val is not None: return val
-
-        # 3. Responsive Sleep: wait for the event OR the timeout
-        # This makes Ctrl+C feel instant
-        if stop_event:
-            if stop_event.wait(timeout=0.5):
-                return None
-        else:
-            time.sleep(0.5)
\ No newline at end of file
+
+    handled, value = _via_broker(
+        {"op": "prompt", "message": message, "hide": hide, "suggestion": suggestion}, stop_event,
+    )
+    if handled:
+        return value
+
+    url = _ensure_server(manager)
+    try:
+        req_id = manager.register_prompt("input_key", message, hide, suggestion=suggestion)
+        try:
+            _present(manager, url, req_id)
+            return _wait(manager, req_id, stop_event)
+        finally:
+            # Withdraw from the dashboard if we stopped waiting without an answer
+            manager.cancel(req_id)
+    finally:
+        # Stays up while a dashboard tab is connected or another prompt holds it
+        release_prompt_server()
+
+def browser_get_many_input(fields: List[PromptField], message: str | None = None, manager: PromptManager = None, stop_event: threading.Event | None = None) -> Dict[str, str] | None:
+    """One server, one browser tab, one form for every field."""
+    handled, values = _via_broker(
+        {"op": "form", "message": message, "fields": [f.to_dict() for f in fields]}, stop_event,
+    )
+    if handled:
+        return values
+
+    url = _ensure_server(manager)
+    try:
+        req_id = manager.register_form([f.to_dict() for f in fields], message=message)
+        try:
+            _present(manager, url, req_id)
+            return _wait(manager, req_id, stop_event)
+        finally:
+            manager.cancel(req_id)
+    finally:
+        release_prompt_server()
+
+async def browser_get_input_async(message: str, suggestion: str | None = None, hide: bool = False, manager: PromptManager = None) -> str | None:
+    """
+    Async browser_get_input: awaits a future completed by the server thread instead of
+    blocking. Cancelling the awaiting task withdraws the prompt.
+    """
+    import asyncio
+    from . import broker
+    if broker.broker_enabled():
+        with span("web.broker") as routed:
+            handled, value = await broker.ask_broker_async(
+                {"op": "prompt", "message": message, "hide": hide, "suggestion": suggestion},
+            )
+            routed.set(handled=handled)
+        if handled:
+            return value
+
+    loop = asyncio.get_running_loop()
+    acquiring = loop.run_in_executor(None, _ensure_server, manager)
+    try:
+        url = await asyncio.shield(acquiring)
+    except asyncio.CancelledError:
+        # The executor still acquires the server: hand it back once it has
+        acquiring.add_done_callback(lambda f: f.cancelled() or f.exception() or release_prompt_server())
+        raise
+    try:
+        req_id = manager.register_prompt("input_key", message, hide, suggestion=suggestion)
+        try:
+            # _present may wait briefly for a dashboard acknowledgement
+            await loop.run_in_executor(None, _present, manager, url, req_id)
+            shown = time.perf_counter()
+            result = await manager.wait_for_result_async(req_id)
+            if timing_enabled():
+                _record_seen(manager, req_id, shown, answered=result is not None)
+            return result
+        finally:
+            manager.cancel(req_id)
+    finally:
+        release_prompt_server()
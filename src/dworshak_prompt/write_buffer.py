@@ -0,0 +1,99 @@
+# src/dworshak_prompt/write_buffer.py
+"""
+Write-behind buffer behind DworshakObtain.session().
+
+New values are held in memory while the session is open; reads through the same
+session see them first. flush() writes each touched config/.env file once via
+atomic_save() (temp file + fsync + rename), then stores buffered secrets.
+"""
+from __future__ import annotations
+import os
+import threading
+from typing import Any, Callable, Dict, Tuple
+import logging
+
+from .store_cache import CachedConfig, CachedEnv
+
+logger = logging.getLogger("dworshak_prompt")
+
+ON_ERROR_POLICIES = ("discard", "keep")
+
+
+class WriteBuffer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # store -> {(service, item): (value, overwrite)}
+        self.config: Dict[CachedConfig, Dict[Tuple[str, str], Tuple[Any, bool]]] = {}
+        # store -> {key: (value, overwrite)}
+        self.env: Dict[CachedEnv, Dict[str, Tuple[str, bool]]] = {}
+        # (service, item) -> (store_secret, value, overwrite)
+        self.secrets: Dict[Tuple[str, str], Tuple[Callable, str, bool]] = {}
+
+    def __len__(self):
+        return sum(len(v) for v in self.config.values()) + sum(len(v) for v in self.env.values()) + len(self.secrets)
+
+    # --- reads: buffered values shadow the stores ---
+
+    def config_get(self, store: CachedConfig, service: str, item: str) -> Any | None:
+        entry = self.config.get(store, {}).get((service, item))
+        return entry[0] if entry else None
+
+    def env_get(self, store: CachedEnv, key: str) -> str | None:
+        entry = self.env.get(store, {}).get(key)
+        return entry[0] if entry else None
+
+    def secret_get(self, service: str, item: str) -> str | None:
+        entry = self.secrets.get((service, item))
+        return entry[1] if entry else None
+
+    # --- writes ---
+
+    def config_set(self, store: CachedConfig, service: str, item: str, value: Any, overwrite: bool):
+        with self._lock:
+            self.config.setdefault(store, {})[(service, item)] = (value, overwrite)
+
+    def env_set(self, store: CachedEnv, key: str, value: str, overwrite: bool):
+        with self._lock:
+            self.env.setdefault(store, {})[key] = (str(value), overwrite)
+
+    def secret_set(self, store_secret: Callable, service: str, item: str, value: str, overwrite: bool):
+        with self._lock:
+            self.secrets[(service, item)] = (store_secret, value, overwrite)
+
+    def clear(self):
+        with self._lock:
+            self.config.clear()
+            self.env.clear()
+            self.secrets.clear()
+
+    def flush(self, write_secret: Callable):
+        """
+        One atomic write per touched file, then the buffered secrets (the vault
+        commits each record on its own). overwrite=False entries never replace
+        a value that appeared on disk in the meantime.
+        """
+        with self._lock:
+            config, env, secrets = self.config, self.env, self.secrets
+            self.config, self.env, self.secrets = {}, {}, {}
+
+        for store, entries in config.items():
+            data = store.load()
+            for (service, item), (value, overwrite) in entries.items():
+                if overwrite or item not in data.get(service, {}):
+                    data.setdefault(service, {})[item] = value
+            store.atomic_save(data)
+            logger.debug(f"[DIAGNOSTIC] Session flushed {len(entries)} config value(s) to {store.path}")
+
+        for store, entries in env.items():
+            data = store.load()
+            applied = {}
+            for key, (value, overwrite) in entries.items():
+                if overwrite or (os.getenv(key) is None and key not in data):
+                    data[key] = applied[key] = value
+            store.atomic_save(data)
+            # Same process-environment sync as DworshakEnv.set()
+            os.environ.update(applied)
+            logger.debug(f"[DIAGNOSTIC] Session flushed {len(entries)} env value(s) to {store.path}")
+
+        for (service, item), (store_secret, value, overwrite) in secrets.items():
+            write_secret(store_secret, service, item, value, overwrite=overwrite)
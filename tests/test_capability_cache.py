@@ -0,0 +1,68 @@
+import json
+import time
+
+import pytest
+
+from dworshak_prompt import capability_cache
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("DWORSHAK_PROMPT_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("DWORSHAK_PROMPT_NO_CAPABILITY_CACHE", raising=False)
+    monkeypatch.delenv("DWORSHAK_PROMPT_CAPABILITY_TTL", raising=False)
+    return tmp_path
+
+
+def test_round_trip(cache_dir):
+    fingerprint = capability_cache.environment_fingerprint()
+    capability_cache.store_cached(fingerprint, {"tkinter": True, "browser": False})
+
+    assert capability_cache.load_cached(fingerprint) == {"tkinter": True, "browser": False}
+    assert capability_cache.cache_path() == cache_dir / capability_cache.CACHE_FILENAME
+
+    capability_cache.discard_cached(fingerprint)
+    assert capability_cache.load_cached(fingerprint) is None
+
+
+def test_fingerprint_follows_environment(monkeypatch):
+    monkeypatch.setenv("DISPLAY", ":0")
+    before = capability_cache.environment_fingerprint()
+    monkeypatch.setenv("DISPLAY", ":1")
+
+    assert capability_cache.environment_fingerprint() != before
+    monkeypatch.setenv("DISPLAY", ":0")
+    assert capability_cache.environment_fingerprint() == before
+
+
+def test_expired_entry_is_a_miss(monkeypatch):
+    capability_cache.store_cached("fp", {"tkinter": True})
+    monkeypatch.setenv("DWORSHAK_PROMPT_CAPABILITY_TTL", "0.01")
+    time.sleep(0.05)
+
+    assert capability_cache.load_cached("fp") is None
+
+
+def test_disabled_cache_neither_reads_nor_writes(cache_dir, monkeypatch):
+    capability_cache.store_cached("fp", {"tkinter": True})
+    monkeypatch.setenv("DWORSHAK_PROMPT_NO_CAPABILITY_CACHE", "1")
+
+    assert capability_cache.load_cached("fp") is None
+    capability_cache.store_cached("other", {"tkinter": False})
+    assert set(json.loads(capability_cache.cache_path().read_text())) == {"fp"}
+
+
+def test_corrupt_file_is_a_miss(cache_dir):
+    capability_cache.cache_path().write_text("{not json")
+
+    assert capability_cache.load_cached("fp") is None
+    capability_cache.store_cached("fp", {"tkinter": True})
+    assert capability_cache.load_cached("fp") == {"tkinter": True}
+
+
+def test_entries_are_bounded():
+    for i in range(capability_cache.MAX_ENTRIES + 4):
+        capability_cache.store_cached(f"fp{i}", {"n": i})
+
+    entries = json.loads(capability_cache.cache_path().read_text())
+    assert len(entries) == capability_cache.MAX_ENTRIES
@@ -0,0 +1,67 @@
+import threading
+import time
+
+from dworshak_prompt.deadlines import DeadlineScheduler
+
+
+def test_deadlines_fire_in_order():
+    scheduler = DeadlineScheduler()
+    fired = []
+    done = threading.Event()
+
+    scheduler.schedule(0.10, lambda: (fired.append("late"), done.set()))
+    scheduler.schedule(0.02, lambda: fired.append("early"))
+
+    assert done.wait(5)
+    assert fired == ["early", "late"]
+    assert scheduler.pending() == 0
+
+
+def test_cancelled_deadline_never_fires():
+    scheduler = DeadlineScheduler()
+    fired = []
+    done = threading.Event()
+
+    cancelled = scheduler.schedule(0.02, lambda: fired.append("cancelled"))
+    scheduler.schedule(0.05, done.set)
+
+    assert cancelled.cancel() is True
+    assert cancelled.cancel() is False
+    assert done.wait(5)
+    assert fired == []
+
+
+def test_cancel_after_firing_returns_false():
+    scheduler = DeadlineScheduler()
+    done = threading.Event()
+    deadline = scheduler.schedule(0.01, done.set)
+
+    assert done.wait(5)
+    # The flag is set under the scheduler lock just before the callback runs
+    assert deadline.expired
+    assert deadline.cancel() is False
+    assert deadline.remaining() == 0.0
+
+
+def test_failing_callback_does_not_stop_the_scheduler():
+    scheduler = DeadlineScheduler()
+    done = threading.Event()
+
+    scheduler.schedule(0.01, lambda: 1 / 0)
+    scheduler.schedule(0.02, done.set)
+
+    assert done.wait(5)
+
+
+def test_earlier_deadline_wakes_sleeping_thread():
+    scheduler = DeadlineScheduler()
+    done = threading.Event()
+
+    scheduler.schedule(60, lambda: None)
+    time.sleep(0.02)  # Let the thread settle into its 60 s wait
+    started = time.monotonic()
+    scheduler.schedule(0.02, done.set)
+
+    assert done.wait(5)
+    assert time.monotonic() - started < 1
+    assert scheduler.pending() == 1
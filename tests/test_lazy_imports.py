@@ -0,0 +1,31 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+# Imported on first use only; see benchmarks/check_import_time.py for the time budget
+DEFERRED = ("rich", "typer", "tkinter", "pyhabitat", "asyncio", "concurrent.futures", "tempfile")
+
+
+def _loaded_after(code: str) -> set:
+    probe = f"import json, sys\n{code}\nprint(json.dumps(sorted(sys.modules)))"
+    proc = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+    return set(json.loads(proc.stdout.splitlines()[-1]))
+
+
+@pytest.mark.parametrize("module", ["dworshak_prompt", "dworshak_prompt.multiplexer"])
+def test_import_defers_backends(module):
+    loaded = _loaded_after(f"import {module}")
+    assert module in loaded
+    assert not loaded & set(DEFERRED)
+
+
+def test_version_does_not_load_cli_stack():
+    loaded = _loaded_after(
+        "import contextlib, io, runpy, sys\n"
+        "sys.argv = ['dworshak-prompt', '--version']\n"
+        "with contextlib.redirect_stdout(io.StringIO()), contextlib.suppress(SystemExit):\n"
+        "    runpy.run_module('dworshak_prompt', run_name='__main__')"
+    )
+    assert not loaded & {"rich", "typer"}
@@ -0,0 +1,75 @@
+import threading
+import time
+
+from dworshak_prompt.prompt_manager import PromptManager
+
+
+def test_queue_orders_by_priority_then_fifo():
+    manager = PromptManager()
+    low = manager.register_prompt("low", "Low", False)
+    first = manager.register_prompt("first", "First", False, priority=5)
+    second = manager.register_prompt("second", "Second", False, priority=5)
+
+    assert [p["request_id"] for p in manager.list_active_prompts()] == [first, second, low]
+    assert manager.get_active_prompt()["request_id"] == first
+
+    assert manager.submit_result(first, "a")
+    assert manager.get_active_prompt()["request_id"] == second
+    assert manager.submit_result(second, "b")
+    assert manager.get_active_prompt()["request_id"] == low
+    assert manager.pending_count() == 1
+
+
+def test_submit_wakes_waiter():
+    manager = PromptManager()
+    request_id = manager.register_prompt("key", "Message", False)
+    threading.Timer(0.05, manager.submit_result, (request_id, "answer")).start()
+
+    started = time.monotonic()
+    assert manager.wait_for_result(request_id, timeout=5) == "answer"
+    assert time.monotonic() - started < 1
+    assert manager.pending_count() == 0
+
+
+def test_cancel_wakes_waiter_with_none():
+    manager = PromptManager()
+    request_id = manager.register_prompt("key", "Message", False)
+    threading.Timer(0.05, manager.cancel, (request_id,)).start()
+
+    started = time.monotonic()
+    assert manager.wait_for_result(request_id, timeout=5) is None
+    assert time.monotonic() - started < 1
+    assert manager.get_prompt(request_id) is None
+
+
+def test_late_submit_is_rejected():
+    manager = PromptManager()
+    request_id = manager.register_prompt("key", "Message", False)
+    manager.cancel(request_id)
+
+    assert manager.submit_result(request_id, "too late") is False
+    assert manager.get_and_clear_result(request_id) is None
+    assert manager.submit_result("no-such-request", "value") is False
+
+
+def test_expired_prompts_and_results_are_evicted():
+    manager = PromptManager(prompt_ttl=0.01, result_ttl=0.01)
+    expired = manager.register_prompt("key", "Message", False)
+    answered = manager.register_form([{"key": "a"}], message="Form")
+    assert manager.submit_result(answered, {"a": "1"})
+
+    time.sleep(0.05)
+    manager._evict_expired(force=True)
+
+    assert manager.pending_count() == 0
+    assert manager.submit_result(expired, "late") is False
+    assert manager.get_and_clear_result(answered) is None
+
+
+def test_form_result_is_returned_once():
+    manager = PromptManager()
+    request_id = manager.register_form([{"key": "user"}, {"key": "host"}])
+    assert manager.submit_result(request_id, {"user": "u", "host": "h"})
+
+    assert manager.wait_for_result(request_id, timeout=1) == {"user": "u", "host": "h"}
+    assert manager.get_and_clear_result(request_id) is None
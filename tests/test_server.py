@@ -0,0 +1,138 @@
+import gzip
+import http.client
+import json
+
+import pytest
+
+from dworshak_prompt.prompt_manager import PromptManager
+from dworshak_prompt.server import run_prompt_server_in_thread, stop_prompt_server, validate_submission
+
+
+# --- validate_submission ---
+
+def test_single_value_submission():
+    prompt = {"key": "token", "message": "Token"}
+    assert validate_submission(prompt, {"value": "abc"}) == ("abc", {})
+    assert validate_submission(prompt, {"value": ""}) == ("", {})
+    assert validate_submission(prompt, {}) == (None, {"token": "A text value is required"})
+    assert validate_submission(prompt, {"value": 3}) == (None, {"token": "A text value is required"})
+
+
+def test_form_submission():
+    prompt = {"fields": [{"key": "user"}, {"key": "host"}]}
+    assert validate_submission(prompt, {"values": {"user": "u", "host": "h"}}) == ({"user": "u", "host": "h"}, {})
+    assert validate_submission(prompt, {"values": "u"}) == (None, {"values": "An object of field values is required"})
+
+    value, errors = validate_submission(prompt, {"values": {"user": 1, "port": "22"}})
+    assert value is None
+    assert errors == {"user": "A text value is required", "host": "Missing value", "port": "Unknown field"}
+
+
+# --- routes ---
+
+@pytest.fixture
+def served():
+    stop_prompt_server()
+    manager = PromptManager()
+    run_prompt_server_in_thread(manager)
+    host, port = manager.server_host_port.split(":")
+    yield manager, host, int(port)
+    stop_prompt_server()
+
+
+def _request(address, method, path, body=None, headers=None):
+    _, host, port = address
+    conn = http.client.HTTPConnection(host, port, timeout=5)
+    try:
+        conn.request(method, path, body=body, headers=headers or {})
+        response = conn.getresponse()
+        return response, response.read()
+    finally:
+        conn.close()
+
+
+def _submit(address, payload, content_type="application/json"):
+    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+    response, data = _request(address, "POST", "/api/submit", body=body, headers={"Content-Type": content_type})
+    return response.status, json.loads(data)
+
+
+def test_dashboard_revalidates_with_etag(served):
+    response, body = _request(served, "GET", "/dashboard")
+    etag = response.getheader("ETag")
+    assert response.status == 200
+    assert etag and b"<html>" in body
+
+    response, body = _request(served, "GET", "/dashboard", headers={"If-None-Match": etag})
+    assert response.status == 304
+    assert body == b""
+    assert response.getheader("ETag") == etag
+
+
+def test_dashboard_is_gzipped_when_accepted(served):
+    _, plain = _request(served, "GET", "/dashboard")
+    response, body = _request(served, "GET", "/dashboard", headers={"Accept-Encoding": "gzip"})
+
+    assert response.getheader("Content-Encoding") == "gzip"
+    assert response.getheader("Vary") == "Accept-Encoding"
+    assert gzip.decompress(body) == plain
+
+
+def test_submit_answers_prompt(served):
+    manager = served[0]
+    request_id = manager.register_prompt("token", "Token", False)
+    other = manager.register_prompt("other", "Other", False)
+
+    status, data = _submit(served, {"request_id": request_id, "value": "abc"})
+
+    assert status == 200
+    assert data == {"ok": True, "request_id": request_id, "pending": 1}
+    assert manager.wait_for_result(request_id, timeout=1) == "abc"
+    assert manager.get_prompt(other) is not None
+
+
+def test_submit_requires_json_content_type(served):
+    manager = served[0]
+    request_id = manager.register_prompt("token", "Token", False)
+
+    status, data = _submit(served, {"request_id": request_id, "value": "abc"}, content_type="text/plain")
+
+    assert status == 415
+    assert data["ok"] is False
+    assert manager.get_prompt(request_id) is not None
+
+
+def test_submit_rejects_malformed_body(served):
+    assert _submit(served, b"{not json")[0] == 400
+    assert _submit(served, {"value": "abc"})[0] == 400
+
+
+def test_submit_to_finished_prompt_is_gone(served):
+    manager = served[0]
+    request_id = manager.register_prompt("token", "Token", False)
+    manager.cancel(request_id)
+
+    status, data = _submit(served, {"request_id": request_id, "value": "abc"})
+
+    assert status == 410
+    assert data["ok"] is False
+
+
+def test_submit_reports_field_errors(served):
+    manager = served[0]
+    request_id = manager.register_form([{"key": "user"}, {"key": "host"}])
+
+    status, data = _submit(served, {"request_id": request_id, "values": {"user": "u"}})
+
+    assert status == 422
+    assert data["field_errors"] == {"host": "Missing value"}
+    # The prompt stays open so the corrected form can be resubmitted
+    assert manager.get_prompt(request_id) is not None
+    status, _ = _submit(served, {"request_id": request_id, "values": {"user": "u", "host": "h"}})
+    assert status == 200
+    assert manager.wait_for_result(request_id, timeout=1) == {"user": "u", "host": "h"}
+
+
+def test_prompt_page_for_unknown_request_is_not_found(served):
+    response, _ = _request(served, "GET", "/config_modal?request_id=missing")
+    assert response.status == 404
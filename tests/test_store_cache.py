@@ -0,0 +1,80 @@
+import json
+import os
+
+import pytest
+
+from dworshak_prompt.store_cache import clear_store_cache, get_config_store, get_env_store
+
+
+@pytest.fixture(autouse=True)
+def fresh_stores():
+    clear_store_cache()
+    yield
+    clear_store_cache()
+
+
+def _touch_later(path):
+    # Guarantees a different mtime even on coarse-grained filesystems
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_same_path_returns_same_store(tmp_path):
+    path = tmp_path / "config.json"
+    assert get_config_store(path) is get_config_store(path)
+    assert get_config_store(str(path)) is get_config_store(path)
+    assert get_env_store(tmp_path / ".env") is not get_config_store(path)
+
+
+def test_config_edited_outside_process_is_reread(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"svc": {"item": "old"}}))
+    store = get_config_store(path)
+    assert store.get("svc", "item") == "old"
+
+    path.write_text(json.dumps({"svc": {"item": "newer"}}))
+    _touch_later(path)
+
+    assert store.get("svc", "item") == "newer"
+
+
+def test_writes_through_store_update_cache(tmp_path):
+    path = tmp_path / "config.json"
+    store = get_config_store(path)
+    store.set("svc", "item", "value")
+
+    assert store.get("svc", "item") == "value"
+    assert json.loads(path.read_text()) == {"svc": {"item": "value"}}
+
+
+def test_load_returns_a_copy(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"svc": {"item": "value"}}))
+    store = get_config_store(path)
+
+    store.load()["svc"]["item"] = "mutated"
+
+    assert store.get("svc", "item") == "value"
+
+
+def test_atomic_save_replaces_file(tmp_path):
+    path = tmp_path / "config.json"
+    store = get_config_store(path)
+    store.atomic_save({"svc": {"a": "1"}})
+
+    assert json.loads(path.read_text()) == {"svc": {"a": "1"}}
+    assert store.get("svc", "a") == "1"
+    assert [p.name for p in tmp_path.iterdir()] == ["config.json"]
+
+
+def test_env_file_edited_outside_process_is_reread(tmp_path, monkeypatch):
+    monkeypatch.delenv("DWORSHAK_TEST_KEY", raising=False)
+    path = tmp_path / ".env"
+    path.write_text("DWORSHAK_TEST_KEY=old\n")
+    store = get_env_store(path)
+    assert store.get("DWORSHAK_TEST_KEY") == "old"
+
+    path.write_text("DWORSHAK_TEST_KEY=new\n")
+    _touch_later(path)
+
+    assert store.get("DWORSHAK_TEST_KEY") == "new"
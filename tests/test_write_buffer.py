@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+import dworshak_prompt.obtain as obtain_module
+from dworshak_prompt.obtain import DworshakObtain
+from dworshak_prompt.store_cache import clear_store_cache, get_config_store
+from dworshak_prompt.write_buffer import WriteBuffer
+
+
+class _Answers:
+    """Stands in for DworshakPrompt: returns queued answers instead of asking."""
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+
+    def __call__(self, *args, **kwargs):
+        return self
+
+    def ask(self, *args, **kwargs):
+        return self.answers.pop(0)
+
+
+@pytest.fixture(autouse=True)
+def fresh_stores():
+    clear_store_cache()
+    yield
+    clear_store_cache()
+
+
+def _read(path):
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def test_buffered_values_shadow_store_until_flush(tmp_path):
+    path = tmp_path / "config.json"
+    store = get_config_store(path)
+    buffer = WriteBuffer()
+
+    buffer.config_set(store, "svc", "item", "value", overwrite=False)
+
+    assert buffer.config_get(store, "svc", "item") == "value"
+    assert store.get("svc", "item") is None
+    buffer.flush(write_secret=None)
+    assert _read(path) == {"svc": {"item": "value"}}
+    assert len(buffer) == 0
+
+
+def test_flush_keeps_value_written_meanwhile_without_overwrite(tmp_path):
+    path = tmp_path / "config.json"
+    store = get_config_store(path)
+    buffer = WriteBuffer()
+    buffer.config_set(store, "svc", "kept", "buffered", overwrite=False)
+    buffer.config_set(store, "svc", "replaced", "buffered", overwrite=True)
+
+    path.write_text(json.dumps({"svc": {"kept": "on disk", "replaced": "on disk"}}))
+    buffer.flush(write_secret=None)
+
+    assert _read(path) == {"svc": {"kept": "on disk", "replaced": "buffered"}}
+
+
+def test_session_writes_once_on_success(tmp_path, monkeypatch):
+    path = tmp_path / "config.json"
+    monkeypatch.setattr(obtain_module, "DworshakPrompt", _Answers("one", "two"))
+
+    with DworshakObtain.session(config_path=path) as session:
+        assert session.config("svc", "a") == "one"
+        assert session.config("svc", "b") == "two"
+        # Reads inside the session see the buffered value; nothing is on disk yet
+        assert session.config("svc", "a") == "one"
+        assert not path.exists()
+
+    assert _read(path) == {"svc": {"a": "one", "b": "two"}}
+
+
+def test_session_discards_on_error_by_default(tmp_path, monkeypatch):
+    path = tmp_path / "config.json"
+    monkeypatch.setattr(obtain_module, "DworshakPrompt", _Answers("one"))
+
+    with pytest.raises(RuntimeError):
+        with DworshakObtain.session(config_path=path) as session:
+            session.config("svc", "a")
+            raise RuntimeError("boom")
+
+    assert _read(path) == {}
+
+
+def test_session_keeps_on_error_when_asked(tmp_path, monkeypatch):
+    path = tmp_path / "config.json"
+    monkeypatch.setattr(obtain_module, "DworshakPrompt", _Answers("one"))
+
+    with pytest.raises(RuntimeError):
+        with DworshakObtain.session(config_path=path, on_error="keep") as session:
+            session.config("svc", "a")
+            raise RuntimeError("boom")
+
+    assert _read(path) == {"svc": {"a": "one"}}
+
+
+def test_session_rejects_unknown_policy(tmp_path):
+    with pytest.raises(ValueError):
+        with DworshakObtain.session(config_path=tmp_path / "config.json", on_error="ignore"):
+            pass